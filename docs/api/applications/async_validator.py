@@ -0,0 +1,329 @@
+"""
+Async Validation Service for Gemini Research Prompt v4.8.1
+
+Asyncio front end for the validators, for orchestrators that await Gemini API
+responses on an event loop. Scoring is CPU-bound, so instead of running it
+inline the service:
+
+- queues requests on a bounded queue (callers await when it is full - backpressure)
+- micro-batches concurrent requests (up to max_batch_size, or whatever arrives
+  within max_batch_delay of the first one)
+- dispatches each batch to a worker pool, with at most one batch in flight per
+  worker so the queue, not the pool, absorbs bursts
+- enforces optional per-request timeouts
+
+Results are the same dicts as the synchronous validators return.
+
+Usage:
+    from async_validator import AsyncValidationService
+
+    async with AsyncValidationService(workers=4) as service:
+        traceability = await service.validate_traceability(gemini_output)
+        quality = await service.validate_research_quality(gemini_output, total_dimensions=10, timeout=2.0)
+
+    # Or the module-level helpers, backed by a shared default service
+    import async_validator
+    quality = await async_validator.validate_research_quality(gemini_output, total_dimensions=10)
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
+
+from quality_validator import validate_research_quality as _validate_research_quality
+from traceability_validator import validate_traceability as _validate_traceability
+
+
+# (kind, gemini_output, total_dimensions, freshness_applicable)
+ValidationRequest = Tuple[str, Dict[str, Any], Optional[int], bool]
+
+
+class AsyncValidationService:
+    """
+    Micro-batching validation service with a bounded request queue.
+
+    Args:
+        workers: Worker processes (None = os.cpu_count()); ignored if executor is given
+        max_batch_size: Most requests dispatched to a worker at once
+        max_batch_delay: Seconds to wait for more requests after the first one
+        max_queue: Queue capacity; submitting blocks when it is full
+        executor: Existing concurrent.futures executor to use instead of a
+                  private ProcessPoolExecutor (not shut down on close)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_batch_size: int = 32,
+        max_batch_delay: float = 0.002,
+        max_queue: int = 1024,
+        executor: Optional[Executor] = None
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_queue = max_queue
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._batches: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self) -> 'AsyncValidationService':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Starts the dispatcher (called automatically on first request)."""
+        if self._dispatcher is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._in_flight = asyncio.Semaphore(self.workers)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self) -> None:
+        """Waits for in-flight batches, fails requests still queued and shuts the pool down."""
+        if self._dispatcher is None:
+            return
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        self._dispatcher = None
+
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+        # Fail anything still queued
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("AsyncValidationService closed"))
+
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _abandon(self) -> None:
+        """
+        Shuts an owned pool down without waiting.
+
+        For services whose event loop is gone, so close() can no longer be
+        awaited; queued work is cancelled and the worker processes exit.
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def validate_traceability(
+        self,
+        gemini_output: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Async validate_traceability. Raises asyncio.TimeoutError after timeout seconds."""
+        return await self._submit(('traceability', gemini_output, None, True), timeout)
+
+    async def validate_research_quality(
+        self,
+        gemini_output: Dict[str, Any],
+        total_dimensions: int,
+        freshness_applicable: bool = True,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Async validate_research_quality. Raises asyncio.TimeoutError after timeout seconds."""
+        return await self._submit(('quality', gemini_output, total_dimensions, freshness_applicable), timeout)
+
+    async def validate_all(
+        self,
+        gemini_output: Dict[str, Any],
+        total_dimensions: int,
+        freshness_applicable: bool = True,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Async traceability + quality (as combined_validator.validate_all). Raises asyncio.TimeoutError after timeout seconds."""
+        return await self._submit(('all', gemini_output, total_dimensions, freshness_applicable), timeout)
+
+    def queue_depth(self) -> int:
+        """Number of requests waiting to be batched."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _submit(self, request: ValidationRequest, timeout: Optional[float]) -> Dict[str, Any]:
+        """Queues one request (waiting for space if the queue is full) and awaits its result."""
+        await self.start()
+        future = self._loop.create_future()
+        # The timeout covers time spent waiting for queue space too
+        return await asyncio.wait_for(self._enqueue_and_wait(request, future), timeout)
+
+    async def _enqueue_and_wait(self, request: ValidationRequest, future: asyncio.Future) -> Dict[str, Any]:
+        await self._queue.put((request, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        """Collects requests into batches and hands each batch to the pool."""
+        while True:
+            await self._in_flight.acquire()
+            batch: List[Tuple[ValidationRequest, asyncio.Future]] = []
+            try:
+                batch.append(await self._queue.get())
+                if self._queue.qsize() < self.max_batch_size - 1 and self.max_batch_delay > 0:
+                    await asyncio.sleep(self.max_batch_delay)
+                while len(batch) < self.max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+            except BaseException:
+                # Closing - fail requests already taken off the queue
+                self._in_flight.release()
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("AsyncValidationService closed"))
+                raise
+
+            # Requests that timed out while queued are dropped before dispatch
+            batch = [(request, future) for request, future in batch if not future.done()]
+            if not batch:
+                self._in_flight.release()
+                continue
+
+            task = asyncio.create_task(self._run(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: List[Tuple[ValidationRequest, asyncio.Future]]) -> None:
+        """Runs one batch in the pool and resolves its futures."""
+        try:
+            outcomes = await self._loop.run_in_executor(
+                self._executor, _run_batch, [request for request, _ in batch]
+            )
+        except Exception as e:  # Pool failure - fail the whole batch
+            outcomes = [(False, e)] * len(batch)
+        finally:
+            self._in_flight.release()
+
+        for (_, future), (ok, value) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+def _run_batch(requests: List[ValidationRequest]) -> List[Tuple[bool, Any]]:
+    """Worker entry point - validates a batch, capturing per-request exceptions."""
+    outcomes = []
+    for kind, gemini_output, total_dimensions, freshness_applicable in requests:
+        try:
+            if kind == 'traceability':
+                result = _validate_traceability(gemini_output)
+            elif kind == 'quality':
+                result = _validate_research_quality(gemini_output, total_dimensions, freshness_applicable)
+            else:
+                result = {
+                    "traceability": _validate_traceability(gemini_output),
+                    "quality": _validate_research_quality(gemini_output, total_dimensions, freshness_applicable)
+                }
+            outcomes.append((True, result))
+        except Exception as e:
+            outcomes.append((False, e))
+    return outcomes
+
+
+_DEFAULT_SERVICE: Optional[AsyncValidationService] = None
+
+
+def _default_service() -> AsyncValidationService:
+    """Shared service for the module-level helpers, recreated per event loop."""
+    global _DEFAULT_SERVICE
+    loop = asyncio.get_running_loop()
+    if _DEFAULT_SERVICE is None or _DEFAULT_SERVICE._loop not in (None, loop):
+        if _DEFAULT_SERVICE is not None:
+            # The previous loop can no longer run close(); release its workers
+            _DEFAULT_SERVICE._abandon()
+        _DEFAULT_SERVICE = AsyncValidationService()
+    return _DEFAULT_SERVICE
+
+
+async def validate_traceability(
+    gemini_output: Dict[str, Any],
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """Async validate_traceability on the shared default service."""
+    return await _default_service().validate_traceability(gemini_output, timeout)
+
+
+async def validate_research_quality(
+    gemini_output: Dict[str, Any],
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """Async validate_research_quality on the shared default service."""
+    return await _default_service().validate_research_quality(
+        gemini_output, total_dimensions, freshness_applicable, timeout
+    )
+
+
+async def shutdown_default_service() -> None:
+    """Closes the shared default service (call before the event loop exits)."""
+    global _DEFAULT_SERVICE
+    if _DEFAULT_SERVICE is not None:
+        await _DEFAULT_SERVICE.close()
+        _DEFAULT_SERVICE = None
+
+
+# Example usage
+if __name__ == "__main__":
+    import statistics
+    import time
+
+    example_output = {
+        "executive_summary": ["1. Desktop and Code use separate memory systems [1]"],
+        "key_findings": [
+            {"id": i, "text": f"Topic {i % 8} finding {i}", "source_ids": ["1"], "confidence": "HML"[i % 3]}
+            for i in range(1, 201)
+        ],
+        "sources": {"1": {"date": "2025-01-15", "publisher": "Anthropic"}},
+        "meta": {
+            "traceability_data": {"answer_claim": "Desktop and Code use separate memory systems", "supporting_finding_ids": [1]},
+            "run_metadata": {"prompt_version": "4.8.1"}
+        }
+    }
+
+    async def main() -> None:
+        lags: List[float] = []
+
+        async def probe() -> None:
+            # Measures how late the event loop wakes up while validation runs
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - start - 0.001)
+
+        probe_task = asyncio.create_task(probe())
+        async with AsyncValidationService(workers=4, max_queue=128) as service:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(
+                service.validate_all(example_output, total_dimensions=8, timeout=30)
+                for _ in range(500)
+            ))
+            elapsed = time.perf_counter() - start
+        probe_task.cancel()
+
+        lags.sort()
+        print("Async Validation Service:")
+        print(f"Validated {len(results)} outputs in {elapsed:.2f}s")
+        print(f"Event loop lag p50: {statistics.median(lags) * 1e3:.2f} ms, "
+              f"p99: {lags[int(len(lags) * 0.99)] * 1e3:.2f} ms")
+        print(f"Thresholds: {sorted({r['quality']['threshold'] for r in results})}")
+
+    asyncio.run(main())
@@ -0,0 +1,214 @@
+"""
+Batch Validator for Gemini Research Prompt v4.8.1
+
+Runs validate_traceability and validate_research_quality over a corpus of
+Gemini outputs, fanning the work out across a process pool. Each document
+produces exactly the same result dicts as calling the two validators directly.
+
+Operates as external orchestrator component - intended for nightly re-scoring
+of archived research outputs rather than single interactive validations.
+
+Usage:
+    from batch_validator import validate_batch
+
+    paths = glob.glob('archive/**/*.json', recursive=True)
+    for item in validate_batch(paths, total_dimensions=10, workers=8):
+        print(item['input'], item['quality']['threshold'], item['traceability']['status'])
+"""
+
+import os
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, Optional, Any, Tuple, Union
+
+from fast_decode import decode_file
+from freshness import DEFAULT_POLICY, FreshnessPolicy
+from quality_validator import _create_error_result as _create_quality_error_result, validate_research_quality
+from records import ResearchOutput
+from traceability_validator import _create_error_result as _create_traceability_error_result, validate_traceability
+
+
+BatchInput = Union[Dict[str, Any], ResearchOutput, str, os.PathLike]
+
+
+def validate_batch(
+    outputs: Iterable[BatchInput],
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    ordered: bool = True,
+    freshness_policy: Optional[FreshnessPolicy] = None,
+    quality_policy: Optional[Any] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validates many Gemini outputs in parallel and streams back the results.
+
+    Args:
+        outputs: Iterable of Gemini outputs (dicts or records.ResearchOutput)
+                 and/or paths to JSON files. Paths are read inside the worker
+                 processes, so only the path string crosses the process boundary.
+        total_dimensions: Passed through to validate_research_quality
+        freshness_applicable: Passed through to validate_research_quality
+        workers: Number of worker processes (None = os.cpu_count()).
+                 0 or 1 validates inline in the calling process.
+        chunksize: Number of documents handed to a worker per dispatch.
+                   Larger chunks amortise IPC overhead for small outputs.
+        ordered: True yields results in input order; False yields each
+                 result as soon as its chunk completes.
+        freshness_policy: freshness.FreshnessPolicy; its reference time is
+                          frozen when the batch starts, so every document
+                          is scored against the same cutoff
+        quality_policy: quality_policy.CompiledPolicy passed to both
+                        validators as policy (default: built-in rules)
+
+    Yields:
+        Dictionary per document containing:
+        - index: Position of the document in the input iterable
+        - input: File path the document was read from (None for dicts)
+        - traceability: Result of validate_traceability
+        - quality: Result of validate_research_quality
+        - error: Only for documents a validator raised on; both results are
+                 then error results carrying the same message
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+
+    policy = (freshness_policy or DEFAULT_POLICY).frozen()
+    tasks = (
+        (index, item, total_dimensions, freshness_applicable, policy, quality_policy)
+        for index, item in enumerate(outputs)
+    )
+
+    if workers is not None and workers <= 1:
+        for task in tasks:
+            yield _validate_task(task)
+        return
+
+    with Pool(processes=workers) as pool:
+        if ordered:
+            results = pool.imap(_validate_task, tasks, chunksize)
+        else:
+            results = pool.imap_unordered(_validate_task, tasks, chunksize)
+        for result in results:
+            yield result
+
+
+def validate_document(
+    gemini_output: Dict[str, Any],
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    freshness_policy: Optional[FreshnessPolicy] = None,
+    quality_policy: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Runs both validators over a single Gemini output.
+
+    Calls the two validators directly: combined_validator.validate_all's
+    shared pass measures no faster than two separate calls.
+
+    Returns:
+        Dictionary containing:
+        - traceability: Result of validate_traceability
+        - quality: Result of validate_research_quality
+    """
+    return {
+        "traceability": validate_traceability(gemini_output, policy=quality_policy),
+        "quality": validate_research_quality(
+            gemini_output, total_dimensions, freshness_applicable,
+            freshness_policy=freshness_policy, policy=quality_policy
+        )
+    }
+
+
+def _validate_task(task: Tuple[int, BatchInput, int, bool, Optional[FreshnessPolicy], Optional[Any]]) -> Dict[str, Any]:
+    """Worker entry point - loads the document if needed and validates it."""
+    index, item, total_dimensions, freshness_applicable, freshness_policy, quality_policy = task
+
+    if not isinstance(item, (str, bytes, os.PathLike)):
+        source_path = None
+        gemini_output = item
+    else:
+        source_path = os.fsdecode(item)
+        try:
+            gemini_output = _load_output(source_path)
+        except (OSError, ValueError) as e:
+            return {
+                "index": index,
+                "input": source_path,
+                **_create_error_results(f"Could not load {source_path}: {e}")
+            }
+
+    if not isinstance(gemini_output, (dict, ResearchOutput)):
+        return {
+            "index": index,
+            "input": source_path,
+            **_create_error_results("Gemini output is not a JSON object")
+        }
+
+    try:
+        results = validate_document(gemini_output, total_dimensions, freshness_applicable, freshness_policy, quality_policy)
+    except Exception as e:
+        # One malformed document must not take the rest of the batch down with it
+        error = f"Validation failed: {type(e).__name__}: {e}"
+        return {
+            "index": index,
+            "input": source_path,
+            "error": error,
+            **_create_error_results(error)
+        }
+
+    return {
+        "index": index,
+        "input": source_path,
+        **results
+    }
+
+
+def _load_output(path: str) -> Any:
+    """Reads one Gemini output JSON file, keeping only the fields the validators read."""
+    return decode_file(path)
+
+
+def _create_error_results(error_message: str) -> Dict[str, Any]:
+    """Creates the error result pair when a document cannot be validated."""
+    return {
+        "traceability": _create_traceability_error_result(error_message),
+        "quality": _create_quality_error_result(error_message)
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+
+    # Validate the files given on the command line, or a small synthetic corpus
+    if len(sys.argv) > 1:
+        corpus = sys.argv[1:]
+    else:
+        corpus = [
+            {
+                "executive_summary": [f"1. Answer number {i} [1]"],
+                "key_findings": [
+                    {"id": 1, "text": f"Topic A finding {i}", "source_ids": ["1"], "confidence": "H"},
+                    {"id": 2, "text": f"Topic B finding {i}", "source_ids": ["1"], "confidence": "L"}
+                ],
+                "sources": {"1": {"date": "2025-01-15", "publisher": "Anthropic"}},
+                "meta": {
+                    "traceability_data": {"answer_claim": f"Answer number {i}", "supporting_finding_ids": [1]},
+                    "run_metadata": {"prompt_version": "4.8.1"}
+                }
+            }
+            for i in range(100)
+        ]
+
+    thresholds: Dict[str, int] = {}
+    statuses: Dict[str, int] = {}
+    for item in validate_batch(corpus, total_dimensions=2, workers=4, ordered=False):
+        threshold = item['quality']['threshold']
+        status = item['traceability']['status']
+        thresholds[threshold] = thresholds.get(threshold, 0) + 1
+        statuses[status] = statuses.get(status, 0) + 1
+
+    print("Batch Validation Results:")
+    print(f"Thresholds: {thresholds}")
+    print(f"Traceability: {statuses}")
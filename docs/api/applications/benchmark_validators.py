@@ -0,0 +1,273 @@
+"""
+Validator Benchmark Suite for Gemini Research Prompt v4.8.1
+
+Times validate_traceability, validate_research_quality, validate_all and the
+batch paths over synthetic outputs at every preset's scale (see
+synthetic_outputs.py), and reports throughput, latency percentiles and peak
+memory. Results are written as JSON so runs can be compared across validator
+versions.
+
+Usage:
+    python benchmark_validators.py --output bench_1.0.0.json
+    python benchmark_validators.py --presets tier1_deep_dive pathological --count 50
+    python benchmark_validators.py --compare bench_1.0.0.json --output bench_new.json
+
+    from benchmark_validators import run_benchmarks
+    report = run_benchmarks(presets=['tier2_standard_report'], count=200)
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any
+
+from batch_validator import validate_batch
+from columnar_quality import QualityColumns, np
+from combined_validator import validate_all
+from output_archive import OutputArchive, build_archive
+from output_archive import validate_research_quality_batch as validate_archive_quality
+from quality_validator import VALIDATOR_VERSION, validate_research_quality
+from synthetic_outputs import PRESETS, generate_corpus, _TOPICS
+from traceability_validator import validate_traceability
+
+
+TOTAL_DIMENSIONS = len(_TOPICS)
+
+# Fewer documents for presets where one output is already large
+DEFAULT_COUNTS = {"pathological": 5}
+
+
+def run_benchmarks(
+    presets: Optional[List[str]] = None,
+    count: int = 200,
+    seed: int = 0,
+    workers: int = 4,
+    repeat: int = 3
+) -> Dict[str, Any]:
+    """
+    Benchmarks every validation path over every preset.
+
+    Args:
+        presets: Presets to run (default: all in synthetic_outputs.PRESETS)
+        count: Documents per preset (pathological uses DEFAULT_COUNTS)
+        seed: Corpus seed - identical seeds give identical corpora
+        workers: Worker processes for the batch path
+        repeat: Timed passes per case (latencies pooled across passes)
+
+    Returns:
+        Machine-readable report: environment plus one entry per (preset, case)
+    """
+    presets = presets or list(PRESETS)
+    now = datetime.now()
+    cases = []
+
+    for preset in presets:
+        corpus_size = min(count, DEFAULT_COUNTS.get(preset, count))
+        corpus = generate_corpus(preset, corpus_size, seed=seed, now=now)
+
+        per_document: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "validate_traceability": validate_traceability,
+            "validate_research_quality": lambda o: validate_research_quality(o, TOTAL_DIMENSIONS),
+            "validate_all": lambda o: validate_all(o, TOTAL_DIMENSIONS),
+        }
+        for name, function in per_document.items():
+            cases.append(_bench_per_document(preset, name, function, corpus, repeat))
+
+        batch_cases: Dict[str, Callable[[], Any]] = {
+            f"validate_batch[workers={workers}]":
+                lambda: list(validate_batch(corpus, TOTAL_DIMENSIONS, workers=workers, chunksize=8)),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            archive = None
+            if np is not None:  # Columnar paths need NumPy
+                batch_cases["QualityColumns"] = \
+                    lambda: QualityColumns.from_outputs(corpus, TOTAL_DIMENSIONS).to_results()
+                # The archive is built once, outside the timing, as it would be for repeated runs
+                archive_path = os.path.join(directory, 'corpus.gemarc')
+                build_archive(corpus, archive_path)
+                archive = OutputArchive(archive_path)
+                batch_cases["OutputArchive quality"] = \
+                    lambda: validate_archive_quality(archive, TOTAL_DIMENSIONS)
+            for name, function in batch_cases.items():
+                cases.append(_bench_batch(preset, name, function, len(corpus), repeat))
+            if archive is not None:
+                archive.close()
+
+    return {
+        "benchmark_version": 1,
+        "validator_version": VALIDATOR_VERSION,
+        "run_at": now.isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "numpy": getattr(np, '__version__', None),
+        },
+        "parameters": {"count": count, "seed": seed, "workers": workers, "repeat": repeat},
+        "cases": cases,
+    }
+
+
+def _bench_per_document(
+    preset: str,
+    name: str,
+    function: Callable[[Dict[str, Any]], Any],
+    corpus: List[Dict[str, Any]],
+    repeat: int
+) -> Dict[str, Any]:
+    """Times one call per document; memory measured in a separate traced pass."""
+    function(corpus[0])  # Warm-up
+
+    latencies: List[float] = []
+    total_time = 0.0
+    for _ in range(repeat):
+        pass_start = time.perf_counter()
+        for output in corpus:
+            start = time.perf_counter()
+            function(output)
+            latencies.append(time.perf_counter() - start)
+        total_time += time.perf_counter() - pass_start
+
+    tracemalloc.start()
+    for output in corpus:
+        function(output)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return _case(preset, name, len(corpus) * repeat, total_time, latencies, peak)
+
+
+def _bench_batch(
+    preset: str,
+    name: str,
+    function: Callable[[], Any],
+    documents: int,
+    repeat: int
+) -> Dict[str, Any]:
+    """Times a whole-corpus call; latency percentiles are per pass, not per document."""
+    latencies: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+
+    # Peak memory of the calling process only (worker processes are not traced)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return _case(preset, name, documents * repeat, sum(latencies), latencies, peak, per_document=False)
+
+
+def _case(
+    preset: str,
+    name: str,
+    documents: int,
+    total_time: float,
+    latencies: List[float],
+    peak_bytes: int,
+    per_document: bool = True
+) -> Dict[str, Any]:
+    """Builds one report entry."""
+    latencies = sorted(latencies)
+    return {
+        "preset": preset,
+        "case": name,
+        "documents": documents,
+        "seconds": round(total_time, 6),
+        "throughput_per_second": round(documents / total_time, 2) if total_time > 0 else None,
+        "latency_unit": "document" if per_document else "pass",
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1e3, 4),
+            "p95": round(_percentile(latencies, 95) * 1e3, 4),
+            "p99": round(_percentile(latencies, 99) * 1e3, 4),
+            "max": round(latencies[-1] * 1e3, 4),
+            "mean": round(statistics.fmean(latencies) * 1e3, 4),
+        },
+        "peak_memory_bytes": peak_bytes,
+    }
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compares two reports case by case.
+
+    Returns:
+        One entry per case present in both: throughput ratio (current /
+        baseline, > 1 is faster), p99 ratio (< 1 is better) and memory ratio
+    """
+    baseline_cases = {(c["preset"], c["case"]): c for c in baseline["cases"]}
+    comparison = []
+    for case in current["cases"]:
+        before = baseline_cases.get((case["preset"], case["case"]))
+        if before is None:
+            continue
+        comparison.append({
+            "preset": case["preset"],
+            "case": case["case"],
+            "throughput_ratio": _ratio(case["throughput_per_second"], before["throughput_per_second"]),
+            "p99_ratio": _ratio(case["latency_ms"]["p99"], before["latency_ms"]["p99"]),
+            "memory_ratio": _ratio(case["peak_memory_bytes"], before["peak_memory_bytes"]),
+        })
+    return comparison
+
+
+def _ratio(current: Optional[float], baseline: Optional[float]) -> Optional[float]:
+    """current / baseline to 3 places, or None when either is missing or zero."""
+    if not current or not baseline:
+        return None
+    return round(current / baseline, 3)
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    """Prints the report cases as a fixed-width table."""
+    print(f"{'preset':22s} {'case':28s} {'docs/s':>10s} {'p50 ms':>9s} {'p99 ms':>9s} {'peak MB':>8s}")
+    for case in report["cases"]:
+        print(f"{case['preset']:22s} {case['case']:28s} {case['throughput_per_second'] or 0:10.1f} "
+              f"{case['latency_ms']['p50']:9.3f} {case['latency_ms']['p99']:9.3f} "
+              f"{case['peak_memory_bytes'] / 1e6:8.2f}")
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Gemini output validators")
+    parser.add_argument("--presets", nargs="+", choices=sorted(PRESETS), help="Presets to run (default: all)")
+    parser.add_argument("--count", type=int, default=200, help="Documents per preset")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes for the batch path")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per case")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.presets, args.count, args.seed, args.workers, args.repeat)
+    _print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} (validator {baseline['validator_version']}):")
+        for row in compare_reports(baseline, report):
+            print(f"  {row['preset']:22s} {row['case']:28s} throughput x{row['throughput_ratio']} "
+                  f"p99 x{row['p99_ratio']} memory x{row['memory_ratio']}")
@@ -0,0 +1,394 @@
+"""
+Claim Matching Engine for Gemini Research Prompt v4.8.1
+
+Scores how closely a claim (e.g. traceability_data.answer_claim) matches other
+texts - executive_summary entries, finding texts - and ranks the best matches.
+Built for all-pairs matching over large batches:
+
+- Each distinct text is tokenized once; the per-text tokens, shingles and
+  MinHash signatures are cached (bounded by max_cached_texts). Every cached
+  value is a pure function of its text - there is no shared vocabulary - so
+  the caches can be dropped at any time and shared between threads
+- Three scores per pair:
+  - overlap: stop-word-filtered word overlap (the legacy heuristic)
+  - minhash: estimated Jaccard similarity of token shingles
+  - cosine: TF-IDF cosine, with IDF taken from the indexed candidate texts
+- ClaimIndex keeps an inverted index (token -> postings), so a query only
+  touches candidates that share a token; with NumPy the postings are arrays
+  and scores are accumulated with one bincount per query
+
+label() reproduces the exact_match / partial_match / high_overlap / ... labels
+of traceability_validator's claim_match field.
+
+Usage:
+    from claim_matching import ClaimMatcher
+
+    matcher = ClaimMatcher()
+    print(matcher.label(answer_claim, summary_text))   # "high_overlap"
+
+    index = matcher.index(finding['text'] for finding in gemini_output['key_findings'])
+    for match in index.query(answer_claim, top_k=3):
+        print(match['index'], round(match['score'], 3), match['label'])
+
+    # Answer claim against every summary entry and finding of one output
+    from claim_matching import match_answer_claim
+    matches = match_answer_claim(gemini_output, top_k=5)
+"""
+
+import heapq
+import math
+import random
+import zlib
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Any, Sequence, Tuple
+
+from summary_citations import summary_text
+
+try:
+    import numpy as np
+except ImportError:  # Optional - vectorized postings and signatures
+    np = None
+
+
+# Words ignored by the overlap score (same list the legacy heuristic used)
+STOP_WORDS = frozenset({'a', 'an', 'the', 'is', 'are', 'was', 'were', 'to', 'from', 'in', 'on', 'at', 'for'})
+
+METRICS = ('cosine', 'minhash', 'overlap')
+
+# MinHash permutations are (a * x + b) mod a Mersenne prime; 31 bits keeps
+# a * x inside uint64 for the NumPy path
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+class ClaimMatcher:
+    """
+    Tokenizer, caches and pairwise scores shared by every ClaimIndex built from it.
+
+    Args:
+        num_perm: MinHash signature length (more = better Jaccard estimates)
+        shingle_size: Consecutive tokens per MinHash shingle
+        seed: Seed for the MinHash permutations
+        max_cached_texts: Distinct texts whose tokens/signatures are kept; the
+                          caches are dropped when they fill
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        shingle_size: int = 2,
+        seed: int = 1,
+        max_cached_texts: int = 65536
+    ):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_cached_texts = max_cached_texts
+
+        rng = random.Random(seed)
+        self._perm_a = [rng.randrange(1, _MERSENNE_PRIME) for _ in range(num_perm)]
+        self._perm_b = [rng.randrange(0, _MERSENNE_PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self._np_a = np.array(self._perm_a, dtype=np.uint64)[:, None]
+            self._np_b = np.array(self._perm_b, dtype=np.uint64)[:, None]
+
+        self._tokens: Dict[str, Tuple[str, ...]] = {}
+        self._shingles: Dict[str, FrozenSet[int]] = {}
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+
+    def tokens(self, text: str) -> Tuple[str, ...]:
+        """Tokens of text (lowercased, whitespace-split, stop words removed)."""
+        tokens = self._tokens.get(text)
+        if tokens is None:
+            if len(self._tokens) >= self.max_cached_texts:
+                self._tokens.clear()
+                self._shingles.clear()
+                self._signatures.clear()
+            tokens = tuple(word for word in text.lower().split() if word not in STOP_WORDS)
+            self._tokens[text] = tokens
+        return tokens
+
+    def shingles(self, text: str) -> FrozenSet[int]:
+        """Hashes of the shingle_size-token windows of text (the tokens themselves if shorter)."""
+        shingles = self._shingles.get(text)
+        if shingles is None:
+            tokens = self.tokens(text)
+            size = self.shingle_size
+            if len(tokens) <= size:
+                windows = [tokens] if tokens else []
+            else:
+                windows = [tokens[i:i + size] for i in range(len(tokens) - size + 1)]
+            # crc32, unlike hash() of strings, is the same in every process
+            shingles = frozenset(
+                zlib.crc32(' '.join(window).encode('utf-8')) & _MERSENNE_PRIME for window in windows
+            )
+            self._shingles[text] = shingles
+        return shingles
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature of text's shingles (empty text -> all-max signature)."""
+        signature = self._signatures.get(text)
+        if signature is None:
+            shingles = self.shingles(text)
+            if not shingles:
+                signature = (_MERSENNE_PRIME,) * self.num_perm
+            elif np is not None:
+                values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))[None, :]
+                hashed = (self._np_a * values + self._np_b) % _MERSENNE_PRIME
+                signature = tuple(hashed.min(axis=1).tolist())
+            else:
+                signature = tuple(
+                    min((a * x + b) % _MERSENNE_PRIME for x in shingles)
+                    for a, b in zip(self._perm_a, self._perm_b)
+                )
+            self._signatures[text] = signature
+        return signature
+
+    def overlap(self, first: str, second: str) -> float:
+        """Shared distinct tokens / distinct tokens of the longer text (0.0 if either is empty)."""
+        first_tokens = set(self.tokens(first))
+        second_tokens = set(self.tokens(second))
+        if not first_tokens or not second_tokens:
+            return 0.0
+        return len(first_tokens & second_tokens) / max(len(first_tokens), len(second_tokens))
+
+    def minhash(self, first: str, second: str) -> float:
+        """Estimated Jaccard similarity of the two texts' shingles."""
+        if not self.shingles(first) or not self.shingles(second):
+            return 0.0
+        first_signature = self.signature(first)
+        second_signature = self.signature(second)
+        equal = sum(1 for a, b in zip(first_signature, second_signature) if a == b)
+        return equal / self.num_perm
+
+    def cosine(self, first: str, second: str) -> float:
+        """Term-frequency cosine of the two texts (no IDF - use a ClaimIndex for TF-IDF)."""
+        first_counts = Counter(self.tokens(first))
+        second_counts = Counter(self.tokens(second))
+        if not first_counts or not second_counts:
+            return 0.0
+        dot = sum(count * second_counts[token] for token, count in first_counts.items())
+        norm = math.sqrt(sum(c * c for c in first_counts.values()) * sum(c * c for c in second_counts.values()))
+        return dot / norm
+
+    def label(self, claim: str, expected: str) -> str:
+        """
+        Legacy claim_match label for a pair of texts.
+
+        Returns: "exact_match" | "partial_match" | "high_overlap" |
+                 "moderate_overlap" | "low_overlap" | "insufficient_data"
+        """
+        claim_lower = claim.lower().strip()
+        expected_lower = expected.lower().strip()
+
+        if claim_lower == expected_lower:
+            return "exact_match"
+
+        if claim_lower in expected_lower or expected_lower in claim_lower:
+            return "partial_match"
+
+        if not self.tokens(claim) or not self.tokens(expected):
+            return "insufficient_data"
+
+        return _overlap_label(self.overlap(claim, expected))
+
+    def index(self, texts: Iterable[str]) -> 'ClaimIndex':
+        """Builds a ClaimIndex over candidate texts (positions are match indexes)."""
+        return ClaimIndex(self, list(texts))
+
+
+class ClaimIndex:
+    """
+    Inverted index over candidate texts for ranked matching.
+
+    Built by ClaimMatcher.index(); IDF weights come from the indexed texts.
+    """
+
+    def __init__(self, matcher: ClaimMatcher, texts: List[str]):
+        self.matcher = matcher
+        self.texts = texts
+
+        token_counts = [Counter(matcher.tokens(text)) for text in texts]
+        document_frequency: Counter = Counter()
+        for counts in token_counts:
+            document_frequency.update(counts.keys())
+
+        # Smoothed IDF; tokens never seen get the maximum weight
+        size = len(texts)
+        self._idf = {token: math.log((1 + size) / (1 + df)) + 1 for token, df in document_frequency.items()}
+        self._unseen_idf = math.log(1 + size) + 1
+
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        self._norms = [0.0] * size
+        for position, counts in enumerate(token_counts):
+            squared = 0.0
+            for token, count in counts.items():
+                weight = count * self._idf[token]
+                postings.setdefault(token, []).append((position, weight))
+                squared += weight * weight
+            self._norms[position] = math.sqrt(squared)
+
+        if np is not None:
+            self._postings = {
+                token: (np.array([p for p, _ in entries], dtype=np.intp), np.array([w for _, w in entries]))
+                for token, entries in postings.items()
+            }
+            self._np_norms = np.array(self._norms)
+        else:
+            self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def cosine_scores(self, query: str) -> Dict[int, float]:
+        """TF-IDF cosine of query against every candidate sharing a token with it."""
+        query_counts = Counter(self.matcher.tokens(query))
+        if not query_counts:
+            return {}
+
+        query_weights = {}
+        squared = 0.0
+        for token, count in query_counts.items():
+            weight = count * self._idf.get(token, self._unseen_idf)
+            query_weights[token] = weight
+            squared += weight * weight
+        query_norm = math.sqrt(squared)
+
+        if np is not None:
+            matched = [(self._postings[t], w) for t, w in query_weights.items() if t in self._postings]
+            if not matched:
+                return {}
+            positions = np.concatenate([postings[0] for postings, _ in matched])
+            weights = np.concatenate([postings[1] * w for postings, w in matched])
+            dots = np.bincount(positions, weights=weights, minlength=len(self.texts))
+            candidates = np.flatnonzero(dots)
+            scores = dots[candidates] / (self._np_norms[candidates] * query_norm)
+            return dict(zip(candidates.tolist(), scores.tolist()))
+
+        dots: Dict[int, float] = {}
+        for token, query_weight in query_weights.items():
+            for position, weight in self._postings.get(token, ()):
+                dots[position] = dots.get(position, 0.0) + weight * query_weight
+        norms = self._norms
+        return {position: dot / (norms[position] * query_norm) for position, dot in dots.items()}
+
+    def query(self, text: str, top_k: Optional[int] = 5, metric: str = 'cosine') -> List[Dict[str, Any]]:
+        """
+        Ranks candidates by similarity to text.
+
+        Args:
+            text: Query text (e.g. an answer_claim)
+            top_k: Matches to return (None = every candidate with a non-zero score)
+            metric: 'cosine' (TF-IDF), 'minhash' or 'overlap' - the ranking score
+
+        Returns:
+            Best first, each a dict with index, text, score, cosine, minhash,
+            overlap and label (legacy claim_match label for the pair)
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric} (expected one of {METRICS})")
+
+        cosine = self.cosine_scores(text)
+        matcher = self.matcher
+        if metric == 'cosine':
+            scores = cosine
+        else:
+            # Only candidates sharing a token can score above zero
+            score = matcher.minhash if metric == 'minhash' else matcher.overlap
+            scores = {position: score(text, self.texts[position]) for position in cosine}
+            scores = {position: value for position, value in scores.items() if value > 0}
+
+        if top_k is None:
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        else:
+            ranked = heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+
+        matches = []
+        for position, score_value in ranked:
+            candidate = self.texts[position]
+            matches.append({
+                "index": position,
+                "text": candidate,
+                "score": score_value,
+                "cosine": cosine.get(position, 0.0),
+                "minhash": matcher.minhash(text, candidate),
+                "overlap": matcher.overlap(text, candidate),
+                "label": matcher.label(text, candidate),
+            })
+        return matches
+
+    def query_batch(
+        self,
+        texts: Sequence[str],
+        top_k: Optional[int] = 5,
+        metric: str = 'cosine'
+    ) -> List[List[Dict[str, Any]]]:
+        """query() for each text; repeated query texts reuse their cached tokens."""
+        return [self.query(text, top_k, metric) for text in texts]
+
+
+def match_answer_claim(
+    gemini_output: Dict[str, Any],
+    top_k: Optional[int] = 5,
+    metric: str = 'cosine',
+    matcher: Optional[ClaimMatcher] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Ranks executive_summary entries and finding texts against the answer claim.
+
+    Summary entries are matched on their text without the "N. " prefix and
+    "[ids]" citations. Finding matches carry the finding's id as finding_id.
+
+    Returns:
+        {"executive_summary": [...], "key_findings": [...]} as from ClaimIndex.query
+    """
+    matcher = matcher or _DEFAULT_MATCHER
+    answer_claim = gemini_output.get('meta', {}).get('traceability_data', {}).get('answer_claim', '')
+
+    summary_texts = [summary_text(item) for item in gemini_output.get('executive_summary', [])]
+    findings = gemini_output.get('key_findings', [])
+
+    finding_matches = matcher.index(f.get('text', '') for f in findings).query(answer_claim, top_k, metric)
+    for match in finding_matches:
+        match["finding_id"] = findings[match["index"]].get('id')
+
+    return {
+        "executive_summary": matcher.index(summary_texts).query(answer_claim, top_k, metric),
+        "key_findings": finding_matches,
+    }
+
+
+def _overlap_label(ratio: float) -> str:
+    if ratio >= 0.7:
+        return "high_overlap"
+    elif ratio >= 0.4:
+        return "moderate_overlap"
+    return "low_overlap"
+
+
+# Shared by traceability_validator and match_answer_claim
+_DEFAULT_MATCHER = ClaimMatcher()
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    from synthetic_outputs import generate_corpus
+
+    corpus = generate_corpus('tier1_deep_dive', count=200, seed=3)
+    matcher = ClaimMatcher()
+
+    start = time.perf_counter()
+    pairs = 0
+    for output in corpus:
+        matches = match_answer_claim(output, top_k=3, matcher=matcher)
+        pairs += len(output['executive_summary']) + len(output['key_findings'])
+    elapsed = time.perf_counter() - start
+
+    example = match_answer_claim(corpus[0], top_k=3, matcher=matcher)
+    print("Claim Matching:")
+    print(f"Answer claim: {corpus[0]['meta']['traceability_data']['answer_claim'][:80]}")
+    for match in example['key_findings']:
+        print(f"  finding {match['finding_id']}: cosine={match['cosine']:.3f} "
+              f"minhash={match['minhash']:.3f} label={match['label']}")
+    print(f"{pairs} claim/text pairs ranked in {elapsed * 1e3:.1f} ms "
+          f"({len(matcher._tokens)} texts cached)")
@@ -0,0 +1,517 @@
+"""
+Columnar Quality Scoring for Gemini Research Prompt v4.8.1
+
+Batch counterpart of validate_research_quality. The findings and sources of
+many outputs are held as NumPy arrays (confidence codes as small ints, source
+dates as datetime64) and coverage, evidence, freshness, contradictions and
+the threshold classification are computed with array operations.
+
+Where the columns come from decides the speed:
+- output_archive.OutputArchive.quality_columns() builds them as views of a
+  pre-built archive with no per-finding Python work; scores() for thousands
+  of outputs then takes about a millisecond, and to_results() is several
+  times faster than per-document validation
+- from_outputs() flattens dicts with a Python loop over every finding and
+  source, which costs about as much as per-document validation; use it for
+  array consumers (scores(), quality_policy) rather than for speed
+
+Results produced by to_results() are identical to calling
+validate_research_quality on each output individually. All outputs in a batch
+share one freshness cutoff, taken when the batch is built.
+
+Requires NumPy.
+
+Usage:
+    from columnar_quality import QualityColumns
+
+    batch = QualityColumns.from_outputs(gemini_outputs, total_dimensions=10)
+
+    scores = batch.scores()          # dict of NumPy arrays, one row per output
+    print(scores['average'].mean())
+
+    for result in batch.to_results():  # same dicts as validate_research_quality
+        print(result['threshold'])
+"""
+
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Union
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the columnar path
+    np = None
+
+from freshness import DEFAULT_POLICY, DEFAULT_WINDOW_DAYS, FreshnessPolicy
+from quality_validator import (
+    _build_result,
+    _contradictions_from_counts,
+    _coverage_from_count,
+    _create_error_result,
+    _determine_threshold,
+    _evidence_from_counts,
+    _freshness_from_counts,
+)
+
+
+# Confidence codes used in the findings columns
+CONFIDENCE_CODES = {'H': 0, 'M': 1, 'L': 2}
+OTHER_CONFIDENCE = 3
+
+# Source date status codes
+DATE_OK = 0
+DATE_MISSING = 1
+DATE_ERROR = 2
+
+# Document status codes (mirror the early returns in validate_research_quality)
+DOC_OK = 0
+DOC_NO_FINDINGS = 1
+DOC_NO_SOURCES = 2
+
+_DOC_ERRORS = {
+    DOC_NO_FINDINGS: "No findings in research output",
+    DOC_NO_SOURCES: "No sources in research output",
+}
+
+# Threshold categories indexed by threshold code (0 = Production, 1 = Marginal,
+# 2 = Insufficient), taken from _determine_threshold at each cutoff
+THRESHOLD_CUTOFFS = (8.0, 7.0)
+_THRESHOLD_TABLE = [_determine_threshold(cutoff) for cutoff in THRESHOLD_CUTOFFS + (float('-inf'),)]
+
+
+class QualityColumns:
+    """
+    Findings, sources and disagreements of a batch of outputs in columnar form.
+
+    Build with QualityColumns.from_outputs(); the constructor takes the
+    already-flattened arrays.
+    """
+
+    def __init__(
+        self,
+        doc_status: 'np.ndarray',
+        total_dimensions: 'np.ndarray',
+        freshness_applicable: bool,
+        finding_doc: 'np.ndarray',
+        finding_confidence: 'np.ndarray',
+        finding_dimension: 'np.ndarray',
+        source_doc: 'np.ndarray',
+        source_date: 'np.ndarray',
+        source_date_status: 'np.ndarray',
+        disagreement_present: 'np.ndarray',
+        disagreement_total: 'np.ndarray',
+        disagreement_unresolved: 'np.ndarray',
+        prompt_versions: List[str],
+        cutoff: datetime,
+        reference_time: datetime,
+        window_days: int = DEFAULT_WINDOW_DAYS
+    ):
+        self.doc_status = doc_status
+        self.total_dimensions = total_dimensions
+        self.freshness_applicable = freshness_applicable
+        self.finding_doc = finding_doc
+        self.finding_confidence = finding_confidence
+        self.finding_dimension = finding_dimension
+        self.source_doc = source_doc
+        self.source_date = source_date
+        self.source_date_status = source_date_status
+        self.disagreement_present = disagreement_present
+        self.disagreement_total = disagreement_total
+        self.disagreement_unresolved = disagreement_unresolved
+        self.prompt_versions = prompt_versions
+        self.cutoff = cutoff
+        self.reference_time = reference_time
+        self.window_days = window_days
+        self._counts = None
+        self._scores = None
+
+    def __len__(self) -> int:
+        return len(self.doc_status)
+
+    @classmethod
+    def from_outputs(
+        cls,
+        outputs: Iterable[Dict[str, Any]],
+        total_dimensions: Union[int, Sequence[int]],
+        freshness_applicable: bool = True,
+        now: Optional[datetime] = None,
+        freshness_policy: Optional[FreshnessPolicy] = None
+    ) -> 'QualityColumns':
+        """
+        Flattens many Gemini outputs into columns.
+
+        Args:
+            outputs: Gemini output dicts
+            total_dimensions: One value for the whole batch, or one per output
+            freshness_applicable: Whether freshness scoring applies to this batch
+            now: Reference time for the freshness cutoff (overrides the
+                 policy's clock; either way it is taken once for the batch)
+            freshness_policy: Window and partial-date handling
+                              (default: freshness.DEFAULT_POLICY)
+
+        Returns:
+            QualityColumns ready for scores() / to_results()
+        """
+        if np is None:
+            raise ImportError("columnar_quality requires NumPy (pip install numpy)")
+
+        policy = freshness_policy or DEFAULT_POLICY
+        if now is not None:
+            policy = FreshnessPolicy(policy.window_days, now, policy.partial_dates)
+        policy = policy.frozen()
+        reference_time = policy.reference_time()
+        cutoff = policy.cutoff()
+
+        doc_status: List[int] = []
+        prompt_versions: List[str] = []
+
+        finding_doc: List[int] = []
+        finding_confidence: List[int] = []
+        finding_dimension: List[int] = []
+        dimension_ids: Dict[str, int] = {}
+
+        source_doc: List[int] = []
+        source_days: List[int] = []
+        source_date_status: List[int] = []
+        parsed_dates: Dict[str, Optional[int]] = {}
+
+        disagreement_present: List[bool] = []
+        disagreement_total: List[int] = []
+        disagreement_unresolved: List[int] = []
+
+        epoch_ordinal = datetime(1970, 1, 1).toordinal()
+
+        for doc_index, gemini_output in enumerate(outputs):
+            findings = gemini_output.get('key_findings', [])
+            sources = gemini_output.get('sources', {})
+            meta = gemini_output.get('meta', {})
+            prompt_versions.append(meta.get('run_metadata', {}).get('prompt_version', 'unknown'))
+
+            if not findings:
+                status = DOC_NO_FINDINGS
+            elif not sources:
+                status = DOC_NO_SOURCES
+            else:
+                status = DOC_OK
+            doc_status.append(status)
+
+            if status != DOC_OK:
+                disagreement_present.append(False)
+                disagreement_total.append(0)
+                disagreement_unresolved.append(0)
+                continue
+
+            for finding in findings:
+                confidence = finding.get('confidence')
+                finding_doc.append(doc_index)
+                finding_confidence.append(
+                    CONFIDENCE_CODES.get(confidence, OTHER_CONFIDENCE)
+                    if isinstance(confidence, str) else OTHER_CONFIDENCE
+                )
+                # Same dimension heuristic as _compute_coverage
+                dimension_key = ' '.join(finding.get('text', '').split()[:3]).lower()
+                finding_dimension.append(dimension_ids.setdefault(dimension_key, len(dimension_ids)))
+
+            if freshness_applicable:
+                for source_data in sources.values():
+                    date_str = source_data.get('date', '')
+                    source_doc.append(doc_index)
+                    if not date_str:
+                        source_days.append(0)
+                        source_date_status.append(DATE_MISSING)
+                        continue
+
+                    if date_str not in parsed_dates:
+                        ordinal = policy.parse(date_str)
+                        parsed_dates[date_str] = ordinal - epoch_ordinal if ordinal > 0 else None
+
+                    days = parsed_dates[date_str]
+                    if days is None:
+                        source_days.append(0)
+                        source_date_status.append(DATE_ERROR)
+                    else:
+                        source_days.append(days)
+                        source_date_status.append(DATE_OK)
+
+            disagreements = meta.get('disagreements', [])
+            disagreement_present.append(bool(disagreements))
+            if disagreements:
+                disagreement_total.append(len(disagreements))
+                disagreement_unresolved.append(
+                    sum(1 for d in disagreements if d.get('final_stance') == 'uncertain')
+                )
+            else:
+                disagreement_total.append(0)
+                disagreement_unresolved.append(0)
+
+        n_docs = len(doc_status)
+        if isinstance(total_dimensions, (int, np.integer)):
+            dimensions_column = np.full(n_docs, total_dimensions, dtype=np.int64)
+        else:
+            dimensions_column = np.asarray(total_dimensions, dtype=np.int64)
+            if dimensions_column.shape != (n_docs,):
+                raise ValueError("total_dimensions must be an int or one value per output")
+
+        return cls(
+            doc_status=np.asarray(doc_status, dtype=np.int8),
+            total_dimensions=dimensions_column,
+            freshness_applicable=freshness_applicable,
+            finding_doc=np.asarray(finding_doc, dtype=np.int64),
+            finding_confidence=np.asarray(finding_confidence, dtype=np.int8),
+            finding_dimension=np.asarray(finding_dimension, dtype=np.int64),
+            source_doc=np.asarray(source_doc, dtype=np.int64),
+            source_date=np.asarray(source_days, dtype=np.int64).astype('datetime64[D]'),
+            source_date_status=np.asarray(source_date_status, dtype=np.int8),
+            disagreement_present=np.asarray(disagreement_present, dtype=bool),
+            disagreement_total=np.asarray(disagreement_total, dtype=np.int64),
+            disagreement_unresolved=np.asarray(disagreement_unresolved, dtype=np.int64),
+            prompt_versions=prompt_versions,
+            cutoff=cutoff,
+            reference_time=reference_time,
+            window_days=policy.window_days
+        )
+
+    def counts(self) -> Dict[str, 'np.ndarray']:
+        """
+        Per-output counts underlying each criterion.
+
+        Returns:
+            Dictionary of integer arrays (one row per output): dimensions,
+            h, m, l, findings, recent_sources, sources, date_parse_errors,
+            unresolved, disagreements
+        """
+        if self._counts is not None:
+            return self._counts
+
+        n_docs = len(self)
+
+        # Coverage: unique (document, dimension key) pairs per document
+        n_keys = int(self.finding_dimension.max()) + 1 if len(self.finding_dimension) else 1
+        pairs = np.unique(self.finding_doc * n_keys + self.finding_dimension)
+        dimensions = np.bincount(pairs // n_keys, minlength=n_docs)
+
+        # Evidence: one bincount over (document, confidence code)
+        confidence = np.bincount(
+            self.finding_doc * 4 + self.finding_confidence, minlength=n_docs * 4
+        ).reshape(n_docs, 4)
+
+        # Freshness: source midnight >= cutoff, as in _compute_freshness
+        cutoff = np.datetime64(self.cutoff, 'us')
+        recent_mask = (self.source_date_status == DATE_OK) & (self.source_date.astype('datetime64[us]') >= cutoff)
+        error_mask = self.source_date_status == DATE_ERROR
+
+        self._counts = {
+            "dimensions": dimensions,
+            "h": confidence[:, 0],
+            "m": confidence[:, 1],
+            "l": confidence[:, 2],
+            "findings": confidence.sum(axis=1),
+            "recent_sources": np.bincount(self.source_doc[recent_mask], minlength=n_docs),
+            "sources": np.bincount(self.source_doc, minlength=n_docs),
+            "date_parse_errors": np.bincount(self.source_doc[error_mask], minlength=n_docs),
+            "unresolved": self.disagreement_unresolved,
+            "disagreements": self.disagreement_total,
+        }
+        return self._counts
+
+    def scores(self) -> Dict[str, 'np.ndarray']:
+        """
+        Unrounded criterion scores, average and threshold code per output.
+
+        Returns:
+            Dictionary of arrays (one row per output): coverage, evidence,
+            freshness, contradictions, average (float64, NaN for outputs that
+            failed validation or when freshness is not applicable) and
+            threshold (int8: 0 Production, 1 Marginal, 2 Insufficient)
+        """
+        if self._scores is not None:
+            return self._scores
+
+        counts = self.counts()
+        ok = self.doc_status == DOC_OK
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dimensions = counts["dimensions"].astype(np.float64)
+            total_dimensions = self.total_dimensions.astype(np.float64)
+            coverage = np.where(
+                self.total_dimensions > 0,
+                np.minimum((dimensions / total_dimensions) * 10, 10.0),
+                0.0
+            )
+
+            hm = (counts["h"] + counts["m"]).astype(np.float64)
+            evidence = (hm / counts["findings"]) * 10
+
+            if self.freshness_applicable:
+                freshness = (counts["recent_sources"] / counts["sources"].astype(np.float64)) * 10
+            else:
+                freshness = np.full(len(self), np.nan)
+
+        contradictions = np.where(
+            self.disagreement_present,
+            np.maximum(10.0 - counts["unresolved"] * 2.0, 0.0),
+            10.0
+        )
+
+        # Same summation order as _average_score
+        total = coverage + evidence + contradictions
+        if self.freshness_applicable:
+            average = (total + freshness) / 4
+        else:
+            average = total / 3
+
+        threshold = np.full(len(self), len(THRESHOLD_CUTOFFS), dtype=np.int8)
+        for code in reversed(range(len(THRESHOLD_CUTOFFS))):
+            threshold[average >= THRESHOLD_CUTOFFS[code]] = code
+        average = np.where(ok, average, np.nan)
+        threshold[~ok] = len(THRESHOLD_CUTOFFS)
+
+        self._scores = {
+            "coverage": np.where(ok, coverage, np.nan),
+            "evidence": np.where(ok, evidence, np.nan),
+            "freshness": np.where(ok, freshness, np.nan),
+            "contradictions": np.where(ok, contradictions, np.nan),
+            "average": average,
+            "threshold": threshold,
+        }
+        return self._scores
+
+    def to_results(self) -> List[Dict[str, Any]]:
+        """
+        Materializes one validate_research_quality result dict per output.
+        """
+        counts = {name: column.tolist() for name, column in self.counts().items()}
+        scores = self.scores()
+        averages = scores["average"].tolist()
+        thresholds = scores["threshold"].tolist()
+        total_dimensions = self.total_dimensions.tolist()
+        doc_status = self.doc_status.tolist()
+        validated_at = self.reference_time.isoformat()
+
+        results = []
+        for i, status in enumerate(doc_status):
+            if status != DOC_OK:
+                results.append(_create_error_result(_DOC_ERRORS[status]))
+                continue
+
+            if total_dimensions[i] <= 0:
+                coverage = (0.0, "Error: total_dimensions must be > 0")
+            else:
+                coverage = _coverage_from_count(counts["dimensions"][i], total_dimensions[i])
+
+            evidence = _evidence_from_counts(
+                counts["h"][i], counts["m"][i], counts["l"][i], counts["findings"][i]
+            )
+
+            if self.freshness_applicable:
+                freshness = _freshness_from_counts(
+                    counts["recent_sources"][i], counts["sources"][i], counts["date_parse_errors"][i],
+                    self.window_days
+                )
+            else:
+                freshness = (None, "N/A - Stable topic, freshness not applicable")
+
+            if self.disagreement_present[i]:
+                contradictions = _contradictions_from_counts(
+                    counts["unresolved"][i], counts["disagreements"][i]
+                )
+            else:
+                contradictions = (10.0, "No contradictions found (0 conflicts)")
+
+            results.append(_build_result(
+                {"meta": {"run_metadata": {"prompt_version": self.prompt_versions[i]}}},
+                coverage,
+                evidence,
+                freshness,
+                contradictions,
+                total_dimensions[i],
+                self.freshness_applicable,
+                average_score=averages[i],
+                threshold_data=_THRESHOLD_TABLE[thresholds[i]],
+                validated_at=validated_at
+            ))
+
+        return results
+
+
+def validate_research_quality_batch(
+    outputs: Iterable[Dict[str, Any]],
+    total_dimensions: Union[int, Sequence[int]],
+    freshness_applicable: bool = True,
+    freshness_policy: Optional[FreshnessPolicy] = None
+) -> List[Dict[str, Any]]:
+    """
+    Columnar equivalent of [validate_research_quality(o, ...) for o in outputs].
+
+    All outputs share one freshness reference time, frozen at the call.
+    """
+    return QualityColumns.from_outputs(
+        outputs, total_dimensions, freshness_applicable, freshness_policy=freshness_policy
+    ).to_results()
+
+
+# Example usage
+if __name__ == "__main__":
+    import random
+    import time
+
+    from quality_validator import validate_research_quality
+
+    rng = random.Random(7)
+    topics = ["Desktop Memory uses", "Code Memory uses", "Integration requires", "Git handoff needs"]
+    corpus = []
+    for _ in range(2000):
+        corpus.append({
+            "key_findings": [
+                {"id": j, "text": f"{rng.choice(topics)} finding {j}", "confidence": rng.choice("HHMML")}
+                for j in range(rng.randint(3, 25))
+            ],
+            "sources": {
+                str(j): {"date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+                for j in range(rng.randint(1, 10))
+            },
+            "meta": {
+                "disagreements": [{"final_stance": rng.choice(["for", "uncertain"])} for _ in range(rng.randint(0, 3))],
+                "run_metadata": {"prompt_version": "4.8.1"}
+            }
+        })
+
+    import os
+    import tempfile
+
+    from output_archive import OutputArchive, build_archive
+
+    start = time.perf_counter()
+    batch = QualityColumns.from_outputs(corpus, total_dimensions=4)
+    columnar = batch.to_results()
+    columnar_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive_path = os.path.join(directory, 'corpus.gemarc')
+        build_archive(corpus, archive_path)
+        archive = OutputArchive(archive_path)
+        start = time.perf_counter()
+        archive_scores = archive.quality_columns(total_dimensions=4).scores()
+        archive_scores_time = time.perf_counter() - start
+        start = time.perf_counter()
+        archive_results = archive.quality_columns(total_dimensions=4).to_results()
+        archive_time = time.perf_counter() - start
+        archive.close()
+
+    start = time.perf_counter()
+    per_document = [validate_research_quality(o, total_dimensions=4) for o in corpus]
+    per_document_time = time.perf_counter() - start
+
+    def mismatching(results: List[Dict[str, Any]]) -> int:
+        return sum(
+            1 for a, b in zip(results, per_document)
+            if {**a, "validation_metadata": None} != {**b, "validation_metadata": None}
+        )
+
+    print("Columnar Quality Scoring:")
+    print(f"Outputs: {len(batch)}")
+    print(f"Per-document:                    {per_document_time:.3f}s")
+    print(f"from_outputs + to_results:       {columnar_time:.3f}s")
+    print(f"archive columns + to_results:    {archive_time:.3f}s")
+    print(f"archive columns + scores only:   {archive_scores_time:.3f}s")
+    print(f"Mismatching results: {mismatching(columnar)} (from_outputs), {mismatching(archive_results)} (archive)")
+    print(f"Mean average score: {np.nanmean(archive_scores['average']):.2f}")
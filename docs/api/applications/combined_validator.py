@@ -0,0 +1,274 @@
+"""
+Combined Validator for Gemini Research Prompt v4.8.1
+
+Runs traceability and quality validation together. Quality is scored from an
+OutputIndex (source id → parsed date, confidence counts, dimension keys,
+disagreement counts) built in one pass over key_findings and sources;
+traceability only looks up its supporting findings and shares nothing with it.
+
+The two validators share almost no work, so validate_all measures about as
+fast as calling them separately, and the batch, stream, async and CLI paths
+call them directly. Results are identical to calling validate_traceability
+and validate_research_quality separately.
+
+Usage:
+    from combined_validator import validate_all
+
+    gemini_output = {...}  # JSON from Gemini Research Prompt
+    results = validate_all(gemini_output, total_dimensions=10)
+
+    if results['traceability']['status'] == 'VERIFIED' and results['quality']['threshold'] == 'Production':
+        print("Research approved for production use")
+"""
+
+from typing import Dict, List, Optional, Any, Set
+
+from quality_validator import (
+    _build_result,
+    _contradictions_from_counts,
+    _coverage_from_count,
+    _create_error_result,
+    _evidence_from_counts,
+    _freshness_from_counts,
+)
+import instrumentation
+from freshness import DEFAULT_POLICY, FreshnessPolicy
+from records import DATE_INVALID
+from traceability_validator import _validate_traceability
+
+
+class OutputIndex:
+    """
+    Derived views of one Gemini output, built once by build_index().
+
+    Attributes:
+        findings: key_findings list (empty if absent)
+        sources: sources map (empty if absent)
+        meta: meta object (empty if absent)
+        dimension_keys: Coverage dimension indicators (first 3 words, lowercased)
+        h_count / m_count / l_count: Findings per confidence level
+        source_ordinals: Source id → date ordinal (records.DATE_MISSING /
+                         DATE_INVALID if missing or unparseable)
+        date_parse_errors: Number of sources with an unparseable date
+        disagreements_present: Whether meta.disagreements is non-empty
+        disagreement_count / unresolved_count: Total and 'uncertain' disagreements
+    """
+
+    __slots__ = (
+        'findings', 'sources', 'meta', 'dimension_keys',
+        'h_count', 'm_count', 'l_count', 'source_ordinals', 'date_parse_errors',
+        'disagreements_present', 'disagreement_count', 'unresolved_count',
+    )
+
+    def __init__(self):
+        self.findings: List[Dict] = []
+        self.sources: Dict[str, Any] = {}
+        self.meta: Dict[str, Any] = {}
+        self.dimension_keys: Set[str] = set()
+        self.h_count = 0
+        self.m_count = 0
+        self.l_count = 0
+        self.source_ordinals: Dict[str, int] = {}
+        self.date_parse_errors = 0
+        self.disagreements_present = False
+        self.disagreement_count = 0
+        self.unresolved_count = 0
+
+
+def build_index(
+    gemini_output: Dict[str, Any],
+    parse_dates: bool = True,
+    freshness_policy: Optional[FreshnessPolicy] = None
+) -> OutputIndex:
+    """
+    Normalizes one Gemini output into an OutputIndex in a single pass.
+
+    Args:
+        gemini_output: JSON output from Gemini Research Prompt v4.8.1
+        parse_dates: Whether to parse source dates (only needed for freshness)
+        freshness_policy: Partial-date handling for parsing (default policy if None)
+
+    Returns:
+        OutputIndex consumed by score_quality
+    """
+    index = OutputIndex()
+    index.findings = gemini_output.get('key_findings', [])
+    index.sources = gemini_output.get('sources', {})
+    index.meta = gemini_output.get('meta', {})
+
+    # One walk over findings: confidence counts, dimension keys
+    dimension_keys = index.dimension_keys
+    h_count = m_count = l_count = 0
+    for finding in index.findings:
+        confidence = finding.get('confidence')
+        if confidence == 'H':
+            h_count += 1
+        elif confidence == 'M':
+            m_count += 1
+        elif confidence == 'L':
+            l_count += 1
+
+        dimension_keys.add(' '.join(finding.get('text', '').split(None, 3)[:3]).lower())
+    index.h_count, index.m_count, index.l_count = h_count, m_count, l_count
+
+    # One walk over sources: parse each date once
+    if parse_dates and index.sources:
+        policy = freshness_policy or DEFAULT_POLICY
+        source_ordinals = index.source_ordinals
+        for source_id, source_data in index.sources.items():
+            ordinal = policy.source_ordinal(source_data)
+            source_ordinals[source_id] = ordinal
+            if ordinal == DATE_INVALID:
+                index.date_parse_errors += 1
+
+    instrumentation.count('findings_processed', len(index.findings))
+    if parse_dates:
+        instrumentation.count('sources_parsed', len(index.sources))
+        instrumentation.count('date_parse_errors', index.date_parse_errors)
+
+    disagreements = index.meta.get('disagreements', [])
+    if disagreements:
+        index.disagreements_present = True
+        index.disagreement_count = len(disagreements)
+        index.unresolved_count = sum(
+            1 for d in disagreements if d.get('final_stance') == 'uncertain'
+        )
+
+    return index
+
+
+def validate_all(
+    gemini_output: Dict[str, Any],
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    coverage_engine: Optional[Any] = None,
+    freshness_policy: Optional[FreshnessPolicy] = None
+) -> Dict[str, Any]:
+    """
+    Runs traceability and quality validation over one output.
+
+    Args:
+        gemini_output: JSON output from Gemini Research Prompt v4.8.1
+        total_dimensions: Passed through to quality scoring
+        freshness_applicable: Passed through to quality scoring
+        coverage_engine: Passed through to quality scoring
+        freshness_policy: Passed through to quality scoring
+
+    Returns:
+        Dictionary containing:
+        - traceability: Same result as validate_traceability
+        - quality: Same result as validate_research_quality
+    """
+    timer = instrumentation.start('combined')
+    index = build_index(gemini_output, freshness_applicable, freshness_policy)
+    timer.lap('index')
+
+    traceability = _validate_traceability(gemini_output)
+    timer.lap('traceability')
+
+    quality = score_quality(
+        gemini_output, index, total_dimensions, freshness_applicable, coverage_engine, freshness_policy
+    )
+    timer.lap('quality')
+
+    return {"traceability": traceability, "quality": quality}
+
+
+def score_quality(
+    gemini_output: Dict[str, Any],
+    index: OutputIndex,
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    coverage_engine: Optional[Any] = None,
+    freshness_policy: Optional[FreshnessPolicy] = None
+) -> Dict[str, Any]:
+    """
+    Quality scoring over a prebuilt OutputIndex.
+
+    coverage_engine (a dimension_coverage.CoverageEngine) replaces the
+    first-3-words dimension keys when given. freshness_policy must be the
+    policy the index was built with.
+
+    Returns:
+        Same result dict as validate_research_quality
+    """
+    if not index.findings:
+        return _create_error_result("No findings in research output")
+
+    if not index.sources:
+        return _create_error_result("No sources in research output")
+
+    timer = instrumentation.start('quality')
+
+    if total_dimensions <= 0:
+        coverage = (0.0, "Error: total_dimensions must be > 0")
+    elif coverage_engine is not None:
+        coverage = coverage_engine.compute_coverage(index.findings, total_dimensions)
+    else:
+        coverage = _coverage_from_count(len(index.dimension_keys), total_dimensions)
+
+    evidence = _evidence_from_counts(
+        index.h_count, index.m_count, index.l_count, len(index.findings)
+    )
+
+    if freshness_applicable:
+        policy = freshness_policy or DEFAULT_POLICY
+        first_recent = policy.first_recent_ordinal()
+        recent_count = sum(1 for ordinal in index.source_ordinals.values() if ordinal >= first_recent)
+        freshness = _freshness_from_counts(
+            recent_count, len(index.sources), index.date_parse_errors, policy.window_days
+        )
+    else:
+        freshness = (None, "N/A - Stable topic, freshness not applicable")
+
+    if index.disagreements_present:
+        contradictions = _contradictions_from_counts(
+            index.unresolved_count, index.disagreement_count
+        )
+    else:
+        contradictions = (10.0, "No contradictions found (0 conflicts)")
+    timer.lap('score')
+
+    result = _build_result(
+        gemini_output,
+        coverage,
+        evidence,
+        freshness,
+        contradictions,
+        total_dimensions,
+        freshness_applicable
+    )
+    timer.lap('result')
+    return timer.attach(result)
+
+
+# Example usage
+if __name__ == "__main__":
+    example_output = {
+        "executive_summary": [
+            "1. Desktop and Code use separate memory systems requiring manual coordination [1, 3]"
+        ],
+        "key_findings": [
+            {"id": 1, "text": "Desktop Memory uses automatic chat synthesis", "source_ids": ["1", "2"], "confidence": "H"},
+            {"id": 2, "text": "Code Memory uses CLAUDE.md file system", "source_ids": ["3"], "confidence": "H"},
+            {"id": 3, "text": "Integration requires manual handoff protocols", "source_ids": ["3"], "confidence": "M"}
+        ],
+        "sources": {
+            "1": {"date": "2025-01-15", "publisher": "Anthropic"},
+            "2": {"date": "2025-01-10", "publisher": "Anthropic Docs"},
+            "3": {"date": "2025-01-20", "publisher": "Claude Code Docs"}
+        },
+        "meta": {
+            "traceability_data": {
+                "answer_claim": "Desktop and Code use separate memory systems requiring manual coordination",
+                "supporting_finding_ids": [1, 2, 3]
+            },
+            "run_metadata": {"prompt_version": "4.8.1"}
+        }
+    }
+
+    results = validate_all(example_output, total_dimensions=3)
+
+    print("Combined Validation Results:")
+    print(f"Traceability: {results['traceability']['status']} - {results['traceability']['notes']}")
+    print(f"Quality: {results['quality']['threshold']} (average {results['quality']['quality_assessment']['average']}/10)")
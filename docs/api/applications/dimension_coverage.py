@@ -0,0 +1,244 @@
+"""
+Dimension Coverage Engine for Gemini Research Prompt v4.8.1
+
+_compute_coverage counts the distinct first three words of finding texts as
+"dimensions" - cheap, but two findings on the same topic phrased differently
+count twice, and unrelated findings sharing an opening count once. This
+engine groups findings into dimensions by content instead, without a model
+server and without comparing every pair of findings:
+
+- lsh (default): findings are clustered by Jaccard similarity of their
+  stop-word-filtered tokens. Each finding joins the most similar cluster
+  leader or starts a new cluster; MinHash signatures are split into bands
+  and only leaders that collide with the finding in some band are compared
+  (locality-sensitive hashing), so the cost does not grow as n².
+- expected: callers list the dimensions the research should address; a
+  dimension counts as addressed when a finding contains enough of its words.
+  Findings are matched through an inverted index over dimension words, so
+  each finding only touches dimensions it shares a word with.
+- fast: the original first-3-words heuristic (identical to _compute_coverage).
+
+Tokens, shingles and signatures come from claim_matching.ClaimMatcher and are
+cached across calls, so batches of outputs that repeat phrasing get cheaper.
+
+Usage:
+    from dimension_coverage import CoverageEngine
+
+    engine = CoverageEngine()                       # lsh clustering
+    score, justification = engine.compute_coverage(gemini_output['key_findings'], total_dimensions=10)
+
+    engine = CoverageEngine(expected_dimensions=['Desktop memory', 'Code memory', 'Git handoff'])
+    quality_results = validate_research_quality(gemini_output, 3, coverage_engine=engine)
+
+    scores = engine.coverage_batch(gemini_outputs, total_dimensions=3)
+"""
+
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Tuple
+
+from claim_matching import ClaimMatcher
+from quality_validator import _coverage_from_count
+
+
+MODES = ('lsh', 'expected', 'fast')
+
+
+class CoverageEngine:
+    """
+    Counts the dimensions addressed by a list of findings.
+
+    Args:
+        mode: 'lsh', 'expected' or 'fast' (default: 'expected' if
+              expected_dimensions is given, else 'lsh')
+        expected_dimensions: Dimension names for 'expected' mode
+        threshold: Minimum token Jaccard similarity for two findings to share
+                   a dimension ('lsh' mode)
+        min_containment: Fraction of a dimension's words a finding must contain
+                         to address it ('expected' mode)
+        num_perm: MinHash signature length ('lsh' mode)
+        bands: LSH bands; num_perm / bands rows per band. More bands catch
+               less similar pairs at the cost of more comparisons
+        matcher: ClaimMatcher to share token caches with (default: a private
+                 unigram matcher)
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        expected_dimensions: Optional[Sequence[str]] = None,
+        threshold: float = 0.3,
+        min_containment: float = 0.5,
+        num_perm: int = 64,
+        bands: int = 32,
+        matcher: Optional[ClaimMatcher] = None
+    ):
+        if mode is None:
+            mode = 'expected' if expected_dimensions is not None else 'lsh'
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode} (expected one of {MODES})")
+        if mode == 'expected' and not expected_dimensions:
+            raise ValueError("expected mode requires expected_dimensions")
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+
+        self.mode = mode
+        self.threshold = threshold
+        self.min_containment = min_containment
+        self.bands = bands
+        self.matcher = matcher or ClaimMatcher(num_perm=num_perm, shingle_size=1)
+        self._rows = self.matcher.num_perm // bands
+
+        self.expected_dimensions = list(expected_dimensions or [])
+        self._dimension_sizes: List[int] = []
+        self._dimensions_by_token: Dict[str, List[int]] = {}
+        for position, dimension in enumerate(self.expected_dimensions):
+            tokens = set(self.matcher.tokens(dimension))
+            self._dimension_sizes.append(len(tokens))
+            for token in tokens:
+                self._dimensions_by_token.setdefault(token, []).append(position)
+
+    def dimensions(self, findings: Sequence[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Groups findings by dimension.
+
+        Returns:
+            One list of finding positions per dimension addressed. In
+            'expected' mode the lists follow expected_dimensions order and
+            unaddressed dimensions are omitted; see match_expected() for names.
+        """
+        texts = [finding.get('text', '') for finding in findings]
+        if self.mode == 'fast':
+            groups: Dict[str, List[int]] = {}
+            for position, text in enumerate(texts):
+                groups.setdefault(' '.join(text.split()[:3]).lower(), []).append(position)
+            return list(groups.values())
+        if self.mode == 'expected':
+            return [positions for positions in self.match_expected(findings).values() if positions]
+        return self._cluster(texts)
+
+    def count(self, findings: Sequence[Dict[str, Any]]) -> int:
+        """Number of dimensions addressed by findings."""
+        if self.mode == 'fast':
+            return len({' '.join(f.get('text', '').split()[:3]).lower() for f in findings})
+        return len(self.dimensions(findings))
+
+    def compute_coverage(self, findings: Sequence[Dict[str, Any]], total_dimensions: int) -> tuple:
+        """Drop-in replacement for quality_validator._compute_coverage."""
+        if total_dimensions <= 0:
+            return 0.0, "Error: total_dimensions must be > 0"
+        return _coverage_from_count(self.count(findings), total_dimensions)
+
+    def coverage_batch(
+        self,
+        outputs: Iterable[Dict[str, Any]],
+        total_dimensions: Optional[int] = None
+    ) -> List[tuple]:
+        """
+        compute_coverage for the key_findings of many outputs.
+
+        total_dimensions defaults to the number of expected dimensions.
+        """
+        if total_dimensions is None:
+            total_dimensions = len(self.expected_dimensions)
+        return [
+            self.compute_coverage(output.get('key_findings', []), total_dimensions)
+            for output in outputs
+        ]
+
+    def match_expected(self, findings: Sequence[Dict[str, Any]]) -> Dict[str, List[int]]:
+        """Expected dimension name → positions of the findings that address it."""
+        matched: Dict[str, List[int]] = {dimension: [] for dimension in self.expected_dimensions}
+        sizes = self._dimension_sizes
+        for position, finding in enumerate(findings):
+            hits: Dict[int, int] = {}
+            for token in set(self.matcher.tokens(finding.get('text', ''))):
+                for dimension in self._dimensions_by_token.get(token, ()):
+                    hits[dimension] = hits.get(dimension, 0) + 1
+            for dimension, count in hits.items():
+                if count >= self.min_containment * sizes[dimension]:
+                    matched[self.expected_dimensions[dimension]].append(position)
+        return matched
+
+    def _cluster(self, texts: List[str]) -> List[List[int]]:
+        """Clusters findings whose token Jaccard similarity reaches threshold."""
+        matcher = self.matcher
+
+        # Findings with identical content words always share a dimension, so
+        # only one representative per distinct shingle set enters the LSH
+        members: Dict[frozenset, List[int]] = {}
+        representatives: List[str] = []
+        for position, text in enumerate(texts):
+            shingles = matcher.shingles(text)
+            if not shingles:
+                continue  # No content words - addresses no dimension
+            group = members.get(shingles)
+            if group is None:
+                group = members[shingles] = []
+                representatives.append(text)
+            group.append(position)
+
+        # Leader clustering: each representative joins the most similar
+        # existing leader among its LSH candidates, or becomes a leader itself.
+        # Only leaders are bucketed, so clusters cannot chain together
+        shingle_sets = list(members)
+        leader_of = [0] * len(representatives)
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        rows = self._rows
+        for position, text in enumerate(representatives):
+            signature = matcher.signature(text)
+            keys = [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+            best, best_similarity = position, self.threshold
+            seen = set()
+            for key in keys:
+                for leader in buckets.get(key, ()):
+                    if leader in seen:
+                        continue
+                    seen.add(leader)
+                    similarity = _jaccard(shingle_sets[position], shingle_sets[leader])
+                    if similarity >= best_similarity and (best == position or similarity > best_similarity):
+                        best, best_similarity = leader, similarity
+
+            leader_of[position] = best
+            if best == position:
+                for key in keys:
+                    buckets.setdefault(key, []).append(position)
+
+        clusters: Dict[int, List[int]] = {}
+        for position, shingles in enumerate(shingle_sets):
+            clusters.setdefault(leader_of[position], []).extend(members[shingles])
+        return [sorted(positions) for positions in clusters.values()]
+
+
+def _jaccard(first: frozenset, second: frozenset) -> float:
+    return len(first & second) / len(first | second)
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    from quality_validator import _compute_coverage
+    from synthetic_outputs import generate_corpus, _TOPICS
+
+    corpus = generate_corpus('tier1_deep_dive', count=200, seed=4)
+    engines = {
+        'fast': CoverageEngine(mode='fast'),
+        'lsh': CoverageEngine(),
+        'expected': CoverageEngine(expected_dimensions=_TOPICS),
+    }
+
+    print("Dimension Coverage Engine:")
+    for name, engine in engines.items():
+        start = time.perf_counter()
+        scores = engine.coverage_batch(corpus, total_dimensions=len(_TOPICS))
+        elapsed = time.perf_counter() - start
+        mean = sum(score for score, _ in scores) / len(scores)
+        print(f"  {name:9s} mean coverage {mean:5.2f}  ({elapsed * 1e3:.1f} ms for {len(corpus)} outputs)")
+
+    legacy = [_compute_coverage(o['key_findings'], len(_TOPICS)) for o in corpus]
+    print(f"fast mode matches _compute_coverage: {legacy == engines['fast'].coverage_batch(corpus, len(_TOPICS))}")
+
+    big = generate_corpus('pathological', count=1, seed=1)[0]['key_findings']
+    start = time.perf_counter()
+    clusters = engines['lsh'].count(big)
+    print(f"lsh over {len(big)} findings: {clusters} dimensions in {(time.perf_counter() - start) * 1e3:.0f} ms")
@@ -0,0 +1,564 @@
+"""
+Fake Gemini Endpoint and Load Driver for Gemini Research Prompt v4.8.1
+
+Offline stand-in for the Gemini API plus a driver that pushes concurrent
+research runs through the whole orchestrator path, so worker counts can be
+sized without a live service.
+
+FakeGeminiServer answers POST /v1beta/models/<model>:generateContent with a
+generateContent-style envelope whose candidate text is a v4.8.1 JSON output.
+Responses come from a pre-serialized pool (synthesized with
+synthetic_outputs, or replayed from recorded outputs) and are shaped by a
+ResponseProfile:
+
+- latency: log-normal with a configurable median and spread
+- size: weighted mix of synthetic_outputs presets
+- errors: FATAL outputs ({"error": ..., "status": "FATAL"}, the prompt's
+  catastrophic-failure shape), HTTP errors (429 / 500 / 503 with a Google
+  API error body) and malformed (truncated) JSON text
+
+run_load drives N concurrent runs of fetch → validate_traceability →
+validate_research_quality and reports sustained throughput, per-stage latency
+percentiles and outcome counts (an output the validators raise on counts as
+validation_error and the run goes on). Validation runs either on an
+AsyncValidationService worker pool (validation='service', both validators
+concurrently) or inline on the event loop (validation='inline', the naive
+orchestrator baseline).
+
+Server and client are plain asyncio streams (HTTP/1.1, keep-alive, one
+connection per concurrent run) so no HTTP library is needed.
+
+Usage:
+    python fake_gemini.py serve --port 8089 --latency-ms 800 --fatal-rate 0.02
+    python fake_gemini.py load --url http://127.0.0.1:8089 --runs 2000 --concurrency 64
+    python fake_gemini.py load --runs 500 --concurrency 32   # in-process server
+
+    from fake_gemini import ResponseProfile, load_test
+
+    profile = ResponseProfile(latency_median=0.5, presets={'tier1_deep_dive': 1.0})
+    report = load_test(profile, runs=1000, concurrency=64, workers=4)
+    print(report['throughput_per_second'], report['latency_ms']['total']['p99'])
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+from urllib.parse import urlsplit
+
+from async_validator import AsyncValidationService
+from benchmark_validators import _percentile
+from fast_decode import decode_output
+from quality_validator import validate_research_quality
+from synthetic_outputs import PRESETS, generate_output, _TOPICS
+from traceability_validator import validate_traceability
+
+
+DEFAULT_MODEL = "gemini-2.5-pro"
+DEFAULT_PRESETS = {"tier2_standard_report": 0.6, "tier3_fast_summary": 0.25, "tier1_deep_dive": 0.15}
+TOTAL_DIMENSIONS = len(_TOPICS)
+
+# HTTP errors drawn for http_error_rate: (status code, reason, API status)
+HTTP_ERRORS = (
+    (429, "Too Many Requests", "RESOURCE_EXHAUSTED"),
+    (500, "Internal Server Error", "INTERNAL"),
+    (503, "Service Unavailable", "UNAVAILABLE"),
+)
+
+# Run outcomes reported by run_load
+OUTCOMES = ("ok", "fatal", "http_error", "malformed", "validation_error", "timeout", "connection_error")
+
+_REASONS = {200: "OK", 404: "Not Found", 405: "Method Not Allowed", **{code: reason for code, reason, _ in HTTP_ERRORS}}
+
+
+class ResponseProfile:
+    """
+    Latency, size and error distributions of the fake endpoint.
+
+    Args:
+        latency_median: Median response delay in seconds (0 = respond immediately)
+        latency_sigma: Log-normal shape; larger values give a heavier tail
+        presets: synthetic_outputs preset → weight (ignored when replaying)
+        fatal_rate: Share of responses that are the FATAL error object
+        http_error_rate: Share of responses that are HTTP 429 / 500 / 503
+        malformed_rate: Share of responses whose JSON text is truncated
+        pool_size: Distinct outputs synthesized per profile
+        replay: Recorded outputs (dicts, or JSON str/bytes) to serve instead
+                of synthesized ones
+        seed: Seed for the pool and the per-request draws
+    """
+
+    def __init__(
+        self,
+        latency_median: float = 0.8,
+        latency_sigma: float = 0.5,
+        presets: Optional[Dict[str, float]] = None,
+        fatal_rate: float = 0.01,
+        http_error_rate: float = 0.02,
+        malformed_rate: float = 0.01,
+        pool_size: int = 64,
+        replay: Optional[Iterable[Any]] = None,
+        seed: int = 0
+    ):
+        presets = presets or DEFAULT_PRESETS
+        unknown = set(presets) - set(PRESETS)
+        if unknown:
+            raise ValueError(f"Unknown presets: {sorted(unknown)} (expected some of {sorted(PRESETS)})")
+        if fatal_rate + http_error_rate + malformed_rate > 1:
+            raise ValueError("fatal_rate + http_error_rate + malformed_rate must not exceed 1")
+
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.presets = dict(presets)
+        self.fatal_rate = fatal_rate
+        self.http_error_rate = http_error_rate
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        if replay is not None:
+            texts = [item if isinstance(item, str) else
+                     item.decode('utf-8') if isinstance(item, (bytes, bytearray)) else
+                     json.dumps(item) for item in replay]
+            if not texts:
+                raise ValueError("replay contains no outputs")
+        else:
+            pool_rng = random.Random(seed)
+            names = list(self.presets)
+            weights = [self.presets[name] for name in names]
+            texts = [json.dumps(generate_output(pool_rng.choices(names, weights)[0], rng=pool_rng))
+                     for _ in range(pool_size)]
+        self.pool = [_envelope(text) for text in texts]
+        self.malformed_pool = [_envelope(text[:len(text) // 2]) for text in texts]
+        self.fatal_body = _envelope(json.dumps({
+            "error": "Grounding tools unavailable and self-correction failed",
+            "status": "FATAL"
+        }))
+
+    def delay(self) -> float:
+        """Draws one response delay in seconds."""
+        if self.latency_median <= 0:
+            return 0.0
+        return self.rng.lognormvariate(math.log(self.latency_median), self.latency_sigma)
+
+    def draw(self) -> Tuple[str, int, bytes]:
+        """Draws one response: (kind, HTTP status, body)."""
+        roll = self.rng.random()
+        if roll < self.fatal_rate:
+            return "fatal", 200, self.fatal_body
+        roll -= self.fatal_rate
+        if roll < self.http_error_rate:
+            code, reason, status = self.rng.choice(HTTP_ERRORS)
+            body = json.dumps({"error": {"code": code, "message": reason, "status": status}})
+            return "http_error", code, body.encode('utf-8')
+        roll -= self.http_error_rate
+        if roll < self.malformed_rate:
+            return "malformed", 200, self.rng.choice(self.malformed_pool)
+        return "ok", 200, self.rng.choice(self.pool)
+
+
+def _envelope(text: str) -> bytes:
+    """generateContent response body carrying text as the model's answer."""
+    return json.dumps({
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": text}]},
+            "finishReason": "STOP",
+            "index": 0
+        }],
+        "modelVersion": DEFAULT_MODEL
+    }).encode('utf-8')
+
+
+def load_replay_dir(path: str) -> List[str]:
+    """Recorded outputs (*.json files in path) for ResponseProfile(replay=...)."""
+    texts = []
+    for name in sorted(glob.glob(os.path.join(path, '*.json'))):
+        with open(name, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    return texts
+
+
+class FakeGeminiServer:
+    """
+    asyncio HTTP server answering generateContent requests from a ResponseProfile.
+
+    Attributes:
+        served: Counter of responses by kind (ok, fatal, http_error, malformed)
+    """
+
+    def __init__(self, profile: Optional[ResponseProfile] = None, host: str = '127.0.0.1', port: int = 0):
+        self.profile = profile or ResponseProfile()
+        self.host = host
+        self.port = port
+        self.served: Counter = Counter()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def __aenter__(self) -> 'FakeGeminiServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stops listening, closes open connections and waits for their handlers."""
+        if self._server is not None:
+            self._server.close()
+            for writer in self._connections.values():
+                writer.close()
+            if self._connections:
+                await asyncio.wait(list(self._connections))
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves requests on one keep-alive connection until the client closes it."""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    method, target, headers = await _read_head(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                await reader.readexactly(int(headers.get('content-length', 0)))
+
+                if not target.split('?')[0].endswith(':generateContent'):
+                    status, body = 404, b'{"error": {"code": 404, "status": "NOT_FOUND"}}'
+                elif method != 'POST':
+                    status, body = 405, b'{"error": {"code": 405, "status": "METHOD_NOT_ALLOWED"}}'
+                else:
+                    kind, status, body = self.profile.draw()
+                    self.served[kind] += 1
+                    await asyncio.sleep(self.profile.delay())
+
+                writer.write(_response_head(status, len(body)) + body)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str]]:
+    """Reads a request or status line plus headers (names lowercased)."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    first, _, rest = lines[0].partition(' ')
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    return first, rest.partition(' ')[0], headers
+
+
+def _response_head(status: int, length: int) -> bytes:
+    return (f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {length}\r\n\r\n").encode('latin-1')
+
+
+class GeminiClient:
+    """
+    Minimal keep-alive HTTP client for one generateContent connection.
+
+    Reconnects transparently after the server closes the connection.
+    """
+
+    def __init__(self, url: str, model: str = DEFAULT_MODEL):
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.path = f"/v1beta/models/{model}:generateContent"
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def generate(self, prompt: str) -> Tuple[int, bytes]:
+        """Sends one generateContent request; returns (HTTP status, body)."""
+        payload = json.dumps({"contents": [{"role": "user", "parts": [{"text": prompt}]}]}).encode('utf-8')
+        request = (f"POST {self.path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                   f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n").encode('latin-1')
+        try:
+            return await self._exchange(request + payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            # Stale keep-alive connection - retry once on a fresh one
+            await self.close()
+        try:
+            return await self._exchange(request + payload)
+        except asyncio.IncompleteReadError:
+            await self.close()
+            raise ConnectionError("connection closed by server")
+
+    async def _exchange(self, request: bytes) -> Tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(request)
+        await self._writer.drain()
+        _, status, headers = await _read_head(self._reader)
+        body = await self._reader.readexactly(int(headers.get('content-length', 0)))
+        return int(status), body
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            writer, self._writer, self._reader = self._writer, None, None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+def extract_output(body: bytes) -> Any:
+    """
+    The v4.8.1 output carried by a generateContent response body.
+
+    Raises:
+        ValueError: Envelope or candidate text is not valid JSON
+    """
+    envelope = json.loads(body)
+    text = envelope["candidates"][0]["content"]["parts"][0]["text"]
+    return decode_output(text)
+
+
+async def run_load(
+    url: str,
+    runs: int = 1000,
+    concurrency: int = 32,
+    validation: str = 'service',
+    workers: Optional[int] = None,
+    timeout: Optional[float] = 30.0,
+    total_dimensions: int = TOTAL_DIMENSIONS
+) -> Dict[str, Any]:
+    """
+    Pushes runs research runs through fetch → traceability → quality.
+
+    Args:
+        url: Base URL of a FakeGeminiServer (or anything speaking generateContent)
+        runs: Total research runs
+        concurrency: Runs in flight at once (one connection each)
+        validation: 'service' (AsyncValidationService worker pool) or 'inline'
+        workers: Worker processes for the service (None = os.cpu_count())
+        timeout: Per-run fetch timeout in seconds (None = no timeout)
+        total_dimensions: total_dimensions passed to validate_research_quality
+
+    Returns:
+        Report dict: runs, concurrency, elapsed_seconds, throughput_per_second
+        (completed runs of any outcome per second), outcomes, latency_ms
+        (fetch / validation / total: p50, p90, p99, max over ok runs, total
+        over all runs), traceability_status and threshold counters
+    """
+    if validation not in ('service', 'inline'):
+        raise ValueError(f"validation must be 'service' or 'inline', got {validation!r}")
+
+    outcomes: Counter = Counter()
+    traceability_status: Counter = Counter()
+    thresholds: Counter = Counter()
+    latencies: Dict[str, List[float]] = {"fetch": [], "validation": [], "total": []}
+    remaining = iter(range(runs))
+
+    service = AsyncValidationService(workers=workers) if validation == 'service' else None
+
+    async def validate(gemini_output: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        if service is None:
+            return (validate_traceability(gemini_output),
+                    validate_research_quality(gemini_output, total_dimensions))
+        return await asyncio.gather(
+            service.validate_traceability(gemini_output),
+            service.validate_research_quality(gemini_output, total_dimensions)
+        )
+
+    async def runner() -> None:
+        client = GeminiClient(url)
+        try:
+            for run in remaining:
+                start = time.perf_counter()
+                try:
+                    status, body = await asyncio.wait_for(client.generate(f"research run {run}"), timeout)
+                except asyncio.TimeoutError:
+                    await client.close()
+                    outcomes["timeout"] += 1
+                    latencies["total"].append(time.perf_counter() - start)
+                    continue
+                except (ConnectionError, OSError):
+                    outcomes["connection_error"] += 1
+                    latencies["total"].append(time.perf_counter() - start)
+                    continue
+                fetched = time.perf_counter()
+
+                try:
+                    gemini_output = extract_output(body) if status == 200 else None
+                except (ValueError, KeyError, IndexError, TypeError):
+                    outcome = "malformed"
+                else:
+                    if status != 200:
+                        outcome = "http_error"
+                    elif isinstance(gemini_output, dict) and gemini_output.get('status') == 'FATAL':
+                        outcome = "fatal"
+                    else:
+                        try:
+                            traceability, quality = await validate(gemini_output)
+                        except Exception:
+                            # An output the validators cannot handle is a finding, not a driver failure
+                            outcome = "validation_error"
+                        else:
+                            traceability_status[traceability['status']] += 1
+                            thresholds[quality['threshold']] += 1
+                            latencies["fetch"].append(fetched - start)
+                            latencies["validation"].append(time.perf_counter() - fetched)
+                            outcome = "ok"
+                outcomes[outcome] += 1
+                latencies["total"].append(time.perf_counter() - start)
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(runner() for _ in range(min(concurrency, runs))))
+    finally:
+        if service is not None:
+            await service.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "runs": runs,
+        "concurrency": concurrency,
+        "validation": validation,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(runs / elapsed, 2) if elapsed else None,
+        "ok_per_second": round(outcomes["ok"] / elapsed, 2) if elapsed else None,
+        "outcomes": {outcome: outcomes[outcome] for outcome in OUTCOMES},
+        "latency_ms": {stage: _latency_summary(values) for stage, values in latencies.items()},
+        "traceability_status": dict(traceability_status),
+        "threshold": dict(thresholds),
+    }
+
+
+def _latency_summary(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "p50": round(_percentile(values, 50) * 1e3, 2),
+        "p90": round(_percentile(values, 90) * 1e3, 2),
+        "p99": round(_percentile(values, 99) * 1e3, 2),
+        "max": round(values[-1] * 1e3, 2) if values else 0.0,
+    }
+
+
+def load_test(profile: Optional[ResponseProfile] = None, **load_options: Any) -> Dict[str, Any]:
+    """
+    Starts a FakeGeminiServer in-process and runs run_load against it.
+
+    The server shares the driver's event loop; use a separate `serve` process
+    when the server's own CPU time would distort the numbers.
+    """
+    async def main() -> Dict[str, Any]:
+        async with FakeGeminiServer(profile) as server:
+            report = await run_load(server.url, **load_options)
+            report["served"] = dict(server.served)
+            return report
+
+    return asyncio.run(main())
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"{report['runs']} runs, concurrency {report['concurrency']}, validation {report['validation']}: "
+          f"{report['elapsed_seconds']}s, {report['throughput_per_second']} runs/s "
+          f"({report['ok_per_second']} ok/s)")
+    print("Outcomes: " + ", ".join(f"{k}={v}" for k, v in report["outcomes"].items() if v))
+    for stage, summary in report["latency_ms"].items():
+        print(f"  {stage:10s} " + "  ".join(f"{k} {v:9.2f} ms" for k, v in summary.items()))
+    print(f"Traceability: {report['traceability_status']}  Threshold: {report['threshold']}")
+
+
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal latency spread")
+    parser.add_argument("--preset", action="append", metavar="NAME=WEIGHT",
+                        help="Response size mix (repeatable; default: tier2/tier3/tier1 mix)")
+    parser.add_argument("--fatal-rate", type=float, default=0.01)
+    parser.add_argument("--http-error-rate", type=float, default=0.02)
+    parser.add_argument("--malformed-rate", type=float, default=0.01)
+    parser.add_argument("--pool-size", type=int, default=64, help="Distinct synthesized outputs")
+    parser.add_argument("--replay", metavar="DIR", help="Serve recorded *.json outputs from DIR")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def _profile_from_args(args: argparse.Namespace) -> ResponseProfile:
+    presets = None
+    if args.preset:
+        presets = {}
+        for item in args.preset:
+            name, _, weight = item.partition('=')
+            presets[name] = float(weight or 1)
+    return ResponseProfile(
+        latency_median=args.latency_ms / 1e3,
+        latency_sigma=args.latency_sigma,
+        presets=presets,
+        fatal_rate=args.fatal_rate,
+        http_error_rate=args.http_error_rate,
+        malformed_rate=args.malformed_rate,
+        pool_size=args.pool_size,
+        replay=load_replay_dir(args.replay) if args.replay else None,
+        seed=args.seed,
+    )
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Gemini endpoint and validation load driver")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the fake endpoint")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8089)
+    _add_profile_arguments(serve)
+
+    load = commands.add_parser("load", help="Drive concurrent research runs")
+    load.add_argument("--url", help="Endpoint to drive (default: start one in-process)")
+    load.add_argument("--runs", type=int, default=500)
+    load.add_argument("--concurrency", type=int, default=32)
+    load.add_argument("--validation", choices=("service", "inline"), default="service")
+    load.add_argument("--workers", type=int, help="Validation worker processes")
+    load.add_argument("--timeout", type=float, default=30.0, help="Per-run fetch timeout in seconds")
+    load.add_argument("--json", action="store_true", help="Print the report as JSON")
+    _add_profile_arguments(load)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        server = FakeGeminiServer(_profile_from_args(args), args.host, args.port)
+        print(f"Serving fake Gemini on {server.url}", file=sys.stderr)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+    else:
+        options = dict(runs=args.runs, concurrency=args.concurrency, validation=args.validation,
+                       workers=args.workers, timeout=args.timeout)
+        if args.url:
+            report = asyncio.run(run_load(args.url, **options))
+        else:
+            report = load_test(_profile_from_args(args), **options)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_report(report)
@@ -0,0 +1,205 @@
+"""
+Fast JSON Decoding for Gemini Research Prompt v4.8.1 Outputs
+
+Turns raw Gemini response bytes into the dicts expected by
+validate_traceability and validate_research_quality, keeping only the fields
+the validators read:
+
+    executive_summary, key_findings, sources,
+    meta.disagreements, meta.traceability_data, meta.run_metadata
+
+Large unused fields (patterns, meta.thinking_summary, calibration_note, ...)
+are dropped. The top-level error/status pair of the prompt's catastrophic
+failure shape is kept so callers can still recognise FATAL responses.
+
+Backends, fastest first: msgspec (skips unused fields without building them),
+orjson, stdlib json. Input may be str, bytes, bytearray, memoryview or mmap;
+the msgspec and orjson backends read buffers without copying them.
+
+Usage:
+    from fast_decode import decode_output, decode_file
+
+    gemini_output = decode_output(response_bytes)
+    gemini_output = decode_file('archive/run_0421.json')  # mmap-backed
+    gemini_output = decode_file('archive/run_0421.json.gz')  # gzip detected from the header
+"""
+
+import gzip
+import json
+import mmap
+import os
+import zlib
+from typing import Dict, Optional, Any, Union
+
+import instrumentation
+
+try:
+    import msgspec
+except ImportError:  # Optional - fastest backend
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # Optional - fallback to stdlib json
+    orjson = None
+
+
+RawInput = Union[str, bytes, bytearray, memoryview, mmap.mmap]
+
+# Fields read by the validators
+OUTPUT_FIELDS = ('executive_summary', 'key_findings', 'sources', 'error', 'status')
+META_FIELDS = ('disagreements', 'traceability_data', 'run_metadata')
+
+BACKENDS = ('msgspec', 'orjson', 'json')
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+if msgspec is not None:
+    class _Meta(msgspec.Struct):
+        """meta object restricted to the fields the validators read."""
+        disagreements: Any = msgspec.UNSET
+        traceability_data: Any = msgspec.UNSET
+        run_metadata: Any = msgspec.UNSET
+
+    class _Output(msgspec.Struct):
+        """Gemini output restricted to the fields the validators read."""
+        executive_summary: Any = msgspec.UNSET
+        key_findings: Any = msgspec.UNSET
+        sources: Any = msgspec.UNSET
+        meta: Union[_Meta, msgspec.UnsetType] = msgspec.UNSET
+        error: Any = msgspec.UNSET
+        status: Any = msgspec.UNSET
+
+    _MSGSPEC_DECODER = msgspec.json.Decoder(_Output)
+
+
+def available_backends() -> list:
+    """Returns the decoding backends importable in this environment."""
+    installed = {'msgspec': msgspec is not None, 'orjson': orjson is not None, 'json': True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def decode_output(data: RawInput, backend: Optional[str] = None) -> Any:
+    """
+    Decodes one Gemini output, keeping only the fields the validators read.
+
+    Args:
+        data: Raw JSON as str, bytes, bytearray, memoryview or mmap
+        backend: 'msgspec' | 'orjson' | 'json' (None = fastest installed)
+
+    Returns:
+        Trimmed output dict (or the decoded value unchanged if the JSON is
+        not an object)
+
+    Raises:
+        ValueError: If data is not valid JSON (any backend)
+    """
+    timer = instrumentation.start('decode')
+    document = _decode(data, backend or available_backends()[0])
+    timer.count('documents_decoded')
+    timer.lap('parse')
+    return document
+
+
+def _decode(data: RawInput, backend: str) -> Any:
+    """Decodes with one backend (see decode_output)."""
+
+    if backend == 'msgspec':
+        if msgspec is None:
+            raise ImportError("msgspec backend requested but msgspec is not installed")
+        try:
+            return msgspec.to_builtins(_MSGSPEC_DECODER.decode(data))
+        except msgspec.ValidationError:
+            # Valid JSON with an unexpected shape (e.g. meta is not an object):
+            # decode generically and let the validators report the problem
+            return _project(msgspec.json.decode(data))
+        except msgspec.DecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}") from e
+
+    if backend == 'orjson':
+        if orjson is None:
+            raise ImportError("orjson backend requested but orjson is not installed")
+        if isinstance(data, mmap.mmap):
+            data = memoryview(data)
+        return _project(orjson.loads(data))
+
+    if backend == 'json':
+        if isinstance(data, (memoryview, mmap.mmap)):
+            data = bytes(data)
+        return _project(json.loads(data))
+
+    raise ValueError(f"Unknown decoding backend: {backend} (expected one of {BACKENDS})")
+
+
+def decode_file(path: str, backend: Optional[str] = None) -> Any:
+    """
+    Decodes a Gemini output file via mmap, without reading it into a buffer first.
+
+    Gzip-compressed files (detected from the header, whatever the suffix) are
+    decompressed into memory first.
+
+    Raises:
+        OSError: If the file cannot be opened
+        ValueError: If the file is not valid JSON (or not valid gzip)
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map empty files; let the decoder report the error
+            return decode_output(b'', backend)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[:2] == GZIP_MAGIC:
+                try:
+                    data = gzip.decompress(mapped)
+                except (EOFError, zlib.error) as e:
+                    raise ValueError(f"Corrupt gzip data: {e}") from e
+                return decode_output(data, backend)
+            view = memoryview(mapped)
+            try:
+                return decode_output(view, backend)
+            finally:
+                view.release()
+
+
+def _project(document: Any) -> Any:
+    """Drops every field the validators do not read from a fully decoded output."""
+    if not isinstance(document, dict):
+        return document
+
+    projected: Dict[str, Any] = {
+        field: document[field] for field in OUTPUT_FIELDS if field in document
+    }
+
+    if 'meta' in document:
+        meta = document['meta']
+        if isinstance(meta, dict):
+            projected['meta'] = {field: meta[field] for field in META_FIELDS if field in meta}
+        else:
+            projected['meta'] = meta
+
+    return projected
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    raw = json.dumps({
+        "executive_summary": ["1. Direct answer [1]"],
+        "key_findings": [{"id": i, "text": f"Finding {i}", "source_ids": ["1"], "confidence": "H"} for i in range(20)],
+        "patterns": [{"structure": "x" * 2000, "steps": ["step"] * 50, "example": "y" * 2000} for _ in range(20)],
+        "sources": {"1": {"publisher": "Anthropic", "date": "2025-01-15"}},
+        "meta": {
+            "thinking_summary": "z" * 200000,
+            "traceability_data": {"answer_claim": "Direct answer", "supporting_finding_ids": [1]},
+            "run_metadata": {"prompt_version": "4.8.1"}
+        }
+    }).encode('utf-8')
+
+    print(f"Decoding {len(raw):,} byte output:")
+    for name in available_backends():
+        start = time.perf_counter()
+        for _ in range(200):
+            decoded = decode_output(raw, backend=name)
+        elapsed = (time.perf_counter() - start) / 200
+        print(f"  {name:8s} {elapsed * 1e6:8.1f} µs/output, fields: {sorted(decoded)}")
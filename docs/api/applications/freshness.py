@@ -0,0 +1,220 @@
+"""
+Freshness Policy for Gemini Research Prompt v4.8.1
+
+Everything freshness scoring depends on besides the sources themselves:
+
+- Reference clock: "now" for the recency cutoff. Validators read it from the
+  policy instead of calling datetime.now() per output, so a batch can freeze
+  one cutoff (a batch that crosses midnight no longer scores inconsistently)
+  and tests can pin the date.
+- Window: sources dated within window_days (default 180) of the reference
+  time count as recent.
+- Partial dates: "YYYY-MM" and "YYYY" count as parse errors by default (as
+  before); partial_dates='start' or 'end' dates them to the first or last day
+  of the month / year instead.
+
+Date strings are parsed by records.parse_date_ordinal (fixed-format fast path,
+memoized); partial forms are memoized here.
+
+Usage:
+    from freshness import FreshnessPolicy, frozen_clock
+
+    policy = FreshnessPolicy(window_days=365, partial_dates='end').frozen()
+    quality_results = validate_research_quality(gemini_output, 10, freshness_policy=policy)
+
+    with frozen_clock(datetime(2025, 6, 1)):   # default policy now reads this clock
+        quality_results = validate_research_quality(gemini_output, 10)
+"""
+
+import calendar
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, time
+from typing import Callable, Dict, Iterator, Optional, Any, Tuple, Union
+
+from records import Source, parse_date_ordinal, DATE_INVALID
+
+
+DEFAULT_WINDOW_DAYS = 180
+
+PARTIAL_DATE_MODES = ('error', 'start', 'end')
+
+Clock = Callable[[], datetime]
+
+_MAX_MEMO = 65536
+
+
+def system_clock() -> datetime:
+    """Wall-clock local time (the default clock)."""
+    return datetime.now()
+
+
+_clock: Clock = system_clock
+
+
+def now() -> datetime:
+    """Current time on the process-wide clock."""
+    return _clock()
+
+
+def set_clock(clock: Clock) -> Clock:
+    """Replaces the process-wide clock; returns the previous one."""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+@contextmanager
+def frozen_clock(at: Optional[datetime] = None) -> Iterator[datetime]:
+    """Pins the process-wide clock to at (default: the current time) for a with block."""
+    at = at or _clock()
+    previous = set_clock(lambda: at)
+    try:
+        yield at
+    finally:
+        set_clock(previous)
+
+
+class FreshnessPolicy:
+    """
+    Reference time, window and date rules for freshness scoring.
+
+    Args:
+        window_days: Sources at most this many days old count as recent
+        now: Reference time - a datetime (fixed), a zero-argument callable,
+             or None to read the process-wide clock on every use
+        partial_dates: 'error' (YYYY-MM / YYYY are parse errors), 'start' or
+                       'end' (dated to the first / last day of the period)
+    """
+
+    __slots__ = ('window_days', 'now', 'partial_dates')
+
+    def __init__(
+        self,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        now: Union[datetime, Clock, None] = None,
+        partial_dates: str = 'error'
+    ):
+        if partial_dates not in PARTIAL_DATE_MODES:
+            raise ValueError(f"Unknown partial_dates mode: {partial_dates} (expected one of {PARTIAL_DATE_MODES})")
+        self.window_days = window_days
+        self.now = now
+        self.partial_dates = partial_dates
+
+    def __getstate__(self) -> Tuple:
+        # Pickled into worker processes; a live clock callable is resolved first
+        return self.window_days, self.reference_time() if callable(self.now) else self.now, self.partial_dates
+
+    def __setstate__(self, state: Tuple) -> None:
+        self.window_days, self.now, self.partial_dates = state
+
+    def __repr__(self) -> str:
+        return f"FreshnessPolicy(window_days={self.window_days}, now={self.now!r}, partial_dates={self.partial_dates!r})"
+
+    def reference_time(self) -> datetime:
+        """The "now" that the cutoff is measured back from."""
+        if self.now is None:
+            return _clock()
+        if isinstance(self.now, datetime):
+            return self.now
+        return self.now()
+
+    def frozen(self) -> 'FreshnessPolicy':
+        """Copy of this policy with the reference time fixed at its current value."""
+        return FreshnessPolicy(self.window_days, self.reference_time(), self.partial_dates)
+
+    def cutoff(self) -> datetime:
+        """Oldest datetime still inside the freshness window."""
+        return self.reference_time() - timedelta(days=self.window_days)
+
+    def first_recent_ordinal(self) -> int:
+        """
+        Earliest date ordinal that counts as recent.
+
+        Sources are dated at midnight and compared against the cutoff, so the
+        set of recent dates only changes when this ordinal changes.
+        """
+        cutoff = self.cutoff()
+        ordinal = cutoff.toordinal()
+        if cutoff.time() != time(0):
+            ordinal += 1
+        return ordinal
+
+    def parse(self, date_str: Any) -> int:
+        """
+        Date ordinal of a source date string.
+
+        Returns:
+            Day ordinal, DATE_MISSING for empty/absent dates, or DATE_INVALID
+        """
+        ordinal = parse_date_ordinal(date_str)
+        if ordinal == DATE_INVALID and self.partial_dates != 'error':
+            return _parse_partial(date_str, self.partial_dates)
+        return ordinal
+
+    def source_ordinal(self, source: Any) -> int:
+        """parse() for one sources entry; records.Source dates are already parsed."""
+        if isinstance(source, Source):
+            if source.date_ordinal == DATE_INVALID and self.partial_dates != 'error':
+                return _parse_partial(source.raw_date, self.partial_dates)
+            return source.date_ordinal
+        return self.parse(source.get('date', ''))
+
+
+_PARTIAL_MEMO: Dict[Tuple[str, str], int] = {}
+
+
+def _parse_partial(date_str: Any, mode: str) -> int:
+    """YYYY-MM or YYYY → first ('start') or last ('end') day ordinal; DATE_INVALID otherwise."""
+    if not isinstance(date_str, str):
+        return DATE_INVALID
+    key = (date_str, mode)
+    ordinal = _PARTIAL_MEMO.get(key)
+    if ordinal is not None:
+        return ordinal
+
+    ordinal = DATE_INVALID
+    year_text, _, month_text = date_str.partition('-')
+    if len(year_text) == 4 and year_text.isdigit() and year_text != '0000':
+        year = int(year_text)
+        if not month_text:
+            ordinal = date(year, 1, 1).toordinal() if mode == 'start' else date(year, 12, 31).toordinal()
+        elif len(month_text) == 2 and month_text.isdigit() and 1 <= int(month_text) <= 12:
+            month = int(month_text)
+            day = 1 if mode == 'start' else calendar.monthrange(year, month)[1]
+            ordinal = date(year, month, day).toordinal()
+
+    if len(_PARTIAL_MEMO) >= _MAX_MEMO:
+        _PARTIAL_MEMO.clear()
+    _PARTIAL_MEMO[key] = ordinal
+    return ordinal
+
+
+# Policy used when a validator is not given one: 180 days, process-wide clock
+DEFAULT_POLICY = FreshnessPolicy()
+
+
+# Example usage
+if __name__ == "__main__":
+    import timeit
+
+    from quality_validator import validate_research_quality
+
+    example_output = {
+        "key_findings": [{"id": 1, "text": "Desktop Memory uses automatic chat synthesis", "confidence": "H"}],
+        "sources": {
+            "1": {"date": "2025-01-15"},
+            "2": {"date": "2025-03"},
+            "3": {"date": "2024"},
+            "4": {"date": "15/01/2025"},
+        },
+    }
+
+    with frozen_clock(datetime(2025, 6, 1)):
+        for mode in PARTIAL_DATE_MODES:
+            policy = FreshnessPolicy(partial_dates=mode)
+            freshness = validate_research_quality(example_output, 1, freshness_policy=policy)
+            print(f"partial_dates={mode:5s}: {freshness['quality_assessment']['freshness']['justification']}")
+
+    strptime_time = timeit.timeit(lambda: datetime.strptime('2025-01-15', '%Y-%m-%d'), number=100000)
+    parse_time = timeit.timeit(lambda: DEFAULT_POLICY.parse('2025-01-15'), number=100000)
+    print(f"strptime: {strptime_time * 10:.2f} µs/date, FreshnessPolicy.parse: {parse_time * 10:.2f} µs/date")
@@ -0,0 +1,457 @@
+"""
+gemini-validate: Batch Validation CLI for Gemini Research Prompt v4.8.1
+
+Runs traceability and quality validation over archived Gemini outputs and
+writes one JSON line per document.
+
+Inputs can be files, directories (searched recursively) or globs:
+- *.json: one Gemini output per file
+- *.jsonl, *.ndjson (optionally .gz): one output per line; '-' reads stdin
+
+Features:
+- --workers N: validate in N processes (0 = inline)
+- --shard i/n: validate only documents whose key hashes to shard i of n, so
+  n machines can split one archive without coordinating
+- --resume: the output file doubles as the checkpoint - documents already in
+  it are skipped, so a crashed run picks up where it stopped
+- --overrides FILE: per-file total_dimensions / freshness_applicable, as a
+  JSON object mapping glob patterns to settings (later patterns win):
+      {"archive/**": {"total_dimensions": 10},
+       "archive/python-syntax/*.jsonl": {"freshness_applicable": false}}
+- --as-of / --window-days / --partial-dates: freshness reference time and
+  rules; the reference time is frozen at start so every document in a run
+  shares one cutoff
+- --policy FILE: quality policy spec (.json / .yaml, see quality_policy) -
+  threshold cutoffs, confidence aggregation and contradictions rule
+- --store DIR: also append every result to a columnar result store
+  (result_store.ResultStore) for dashboard queries; rows are published at
+  every checkpoint and --resume re-adds any the crash lost (resuming removes
+  unpublished files, so resumed shards need their own store directory)
+- --schema reject|repair: check each document against the v4.8.1 output
+  schema (output_schema.check_output) before scoring; rejected documents get
+  error results listing every problem, 'repair' fixes what it safely can
+  first. The problems are recorded under "schema"
+- --analytics FILE: keep streaming per prompt_version / preset_used
+  aggregates (quality_analytics.QualityAnalytics) and save them as a JSON
+  snapshot at every checkpoint; --resume rebuilds them from the output file.
+  Shard snapshots merge with `python quality_analytics.py shard*.json`
+- Throughput is printed to stderr while running
+
+Each output line contains key (path, or path:line for JSONL), input, line,
+run_metadata (prompt_version / correlation_id / preset_used), traceability
+and quality. A document a validator raises on gets error results and an
+"error" field instead of stopping the run, so --resume moves past it too.
+
+Usage:
+    python gemini_validate.py archive/ --total-dimensions 10 --workers 8 -o results.jsonl
+    python gemini_validate.py 'archive/**/*.jsonl.gz' --shard 2/4 -o shard2.jsonl --resume
+    python gemini_validate.py runs.jsonl --overrides dimensions.json -o - | jq .quality.threshold
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from itertools import islice
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple
+
+from batch_validator import _create_error_results, _load_output, _validate_task
+from fast_decode import decode_output
+from freshness import DEFAULT_POLICY, DEFAULT_WINDOW_DAYS, PARTIAL_DATE_MODES, FreshnessPolicy
+from output_schema import check_output, summarize_problems
+from quality_analytics import QualityAnalytics
+from quality_policy import CompiledPolicy, load_policy
+from result_store import ResultStore, ResultStoreWriter, run_metadata_of
+from stream_validator import _open_output, iter_jsonl
+
+
+JSONL_SUFFIXES = ('.jsonl', '.ndjson', '.jsonl.gz', '.ndjson.gz')
+JSON_SUFFIXES = ('.json', '.json.gz')
+
+SCHEMA_MODES = ('off', 'reject', 'repair')
+
+# (key, path, line, payload, total_dimensions, freshness_applicable, policy, schema,
+# quality_policy); payload is the path for .json files and the raw line bytes
+# for JSONL records
+Unit = Tuple[str, str, Optional[int], Any, int, bool, FreshnessPolicy, str, Optional[CompiledPolicy]]
+
+
+def expand_inputs(specs: Iterable[str]) -> Iterator[str]:
+    """Expands directories and glob patterns into input files, each once, in sorted order."""
+    seen: Set[str] = set()
+    for spec in specs:
+        if spec == '-':
+            paths = ['-']
+        elif os.path.isdir(spec):
+            paths = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(spec)
+                for name in names
+                if name.endswith(JSONL_SUFFIXES + JSON_SUFFIXES)
+            )
+        elif glob.has_magic(spec):
+            paths = sorted(path for path in glob.glob(spec, recursive=True) if os.path.isfile(path))
+        else:
+            paths = [spec]
+
+        for path in paths:
+            if path not in seen:
+                seen.add(path)
+                yield path
+
+
+def load_overrides(path: Optional[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Reads the overrides file into (pattern, settings) pairs, validating the setting names."""
+    if path is None:
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{path}: expected a JSON object mapping patterns to settings")
+
+    allowed = {'total_dimensions', 'freshness_applicable'}
+    for pattern, settings in overrides.items():
+        unknown = set(settings) - allowed if isinstance(settings, dict) else None
+        if unknown is None or unknown:
+            raise ValueError(f"{path}: settings for {pattern!r} must only contain {sorted(allowed)}")
+    return list(overrides.items())
+
+
+def settings_for(
+    path: str,
+    overrides: List[Tuple[str, Dict[str, Any]]],
+    total_dimensions: int,
+    freshness_applicable: bool
+) -> Tuple[int, bool]:
+    """total_dimensions / freshness_applicable for one input file."""
+    settings = {"total_dimensions": total_dimensions, "freshness_applicable": freshness_applicable}
+    for pattern, override in overrides:
+        if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern):
+            settings.update(override)
+    return settings["total_dimensions"], settings["freshness_applicable"]
+
+
+def in_shard(key: str, shard: Optional[Tuple[int, int]]) -> bool:
+    """Whether a document key belongs to shard (index, count); stable across machines."""
+    if shard is None:
+        return True
+    index, count = shard
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count == index
+
+
+def iter_units(
+    paths: Iterable[str],
+    overrides: List[Tuple[str, Dict[str, Any]]],
+    total_dimensions: int,
+    freshness_applicable: bool,
+    freshness_policy: FreshnessPolicy,
+    schema: str = 'off',
+    quality_policy: Optional[CompiledPolicy] = None
+) -> Iterator[Unit]:
+    """One unit of work per document; JSONL lines stay undecoded until they reach a worker."""
+    for path in paths:
+        dimensions, freshness = settings_for(path, overrides, total_dimensions, freshness_applicable)
+        if path == '-' or path.endswith(JSONL_SUFFIXES):
+            for line_number, raw_line in iter_jsonl(path, decoder=bytes):
+                yield (f"{path}:{line_number}", path, line_number, raw_line, dimensions, freshness,
+                       freshness_policy, schema, quality_policy)
+        else:
+            yield path, path, None, path, dimensions, freshness, freshness_policy, schema, quality_policy
+
+
+def read_checkpoint(output_path: str, on_record: Optional[Callable[[Dict[str, Any]], None]] = None) -> Set[str]:
+    """
+    Keys already written to an output file, for --resume.
+
+    A partially written last line (from a crash mid-write) is truncated away.
+    on_record, if given, is called with every complete record.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+
+    good_bytes = 0
+    with open(output_path, 'rb') as f:
+        for raw_line in f:
+            if not raw_line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(raw_line)
+                done.add(record['key'])
+            except (ValueError, KeyError, TypeError):
+                break
+            if on_record is not None:
+                on_record(record)
+            good_bytes += len(raw_line)
+
+    if good_bytes != os.path.getsize(output_path):
+        with open(output_path, 'r+b') as f:
+            f.truncate(good_bytes)
+    return done
+
+
+def run(
+    inputs: List[str],
+    output_path: str,
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    workers: Optional[int] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    resume: bool = False,
+    overrides: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
+    chunksize: int = 16,
+    progress_interval: float = 5.0,
+    progress: Any = sys.stderr,
+    freshness_policy: Optional[FreshnessPolicy] = None,
+    store_path: Optional[str] = None,
+    analytics_path: Optional[str] = None,
+    schema: str = 'off',
+    quality_policy: Optional[CompiledPolicy] = None
+) -> Dict[str, Any]:
+    """
+    Validates every document in inputs and writes results as JSON lines.
+
+    schema is one of SCHEMA_MODES: 'reject' gives structurally invalid
+    documents error results without scoring them, 'repair' repairs what it
+    can and rejects the rest. quality_policy (quality_policy.CompiledPolicy)
+    replaces the built-in cutoffs and rules in both validators.
+
+    Returns:
+        Dictionary containing validated, skipped (already checkpointed),
+        seconds, thresholds (count per quality threshold) and statuses
+        (count per traceability status)
+    """
+    # Rows are published to the store at every checkpoint, after the output
+    # lines they belong to are flushed; on --resume, records that reached the
+    # output but not the store (the crash came between checkpoints) are re-added
+    store = ResultStoreWriter(store_path) if store_path is not None else None
+    # The output file is the only exact checkpoint, so on --resume the
+    # analytics are rebuilt from it rather than loaded from the last snapshot
+    analytics = QualityAnalytics() if analytics_path is not None else None
+    done: Set[str] = set()
+    if resume and output_path != '-':
+        stored: Optional[Set[str]] = None
+        if store is not None:
+            existing = ResultStore(store_path)
+            existing.remove_orphans()
+            stored = existing.keys()
+
+        def restore(record: Dict[str, Any]) -> None:
+            if store is not None and record['key'] not in stored:
+                store.append(record)
+            if analytics is not None:
+                analytics.add_record(record)
+
+        done = read_checkpoint(output_path, restore)
+        if store is not None:
+            store.commit()
+    policy = (freshness_policy or DEFAULT_POLICY).frozen()
+    units = (
+        unit for unit in iter_units(
+            expand_inputs(inputs), overrides or [], total_dimensions, freshness_applicable, policy, schema,
+            quality_policy
+        )
+        if in_shard(unit[0], shard)
+    )
+
+    summary: Dict[str, Any] = {"validated": 0, "skipped": 0, "thresholds": {}, "statuses": {}}
+
+    def pending() -> Iterator[Unit]:
+        for unit in units:
+            if unit[0] in done:
+                summary["skipped"] += 1
+            else:
+                yield unit
+
+    start = last_report = time.perf_counter()
+    mode = 'a' if resume else 'w'
+    with _open_output(output_path, mode) as out, store if store is not None else nullcontext():
+        for record in _validate_units(pending(), workers, chunksize):
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if store is not None:
+                store.append(record)
+            if analytics is not None:
+                analytics.add_record(record)
+            summary["validated"] += 1
+            threshold = record['quality']['threshold']
+            status = record['traceability']['status']
+            summary["thresholds"][threshold] = summary["thresholds"].get(threshold, 0) + 1
+            summary["statuses"][status] = summary["statuses"].get(status, 0) + 1
+
+            now = time.perf_counter()
+            if now - last_report >= progress_interval:
+                out.flush()  # Everything reported as done is on disk for --resume
+                if store is not None:
+                    store.commit()
+                if analytics is not None:
+                    analytics.save(analytics_path)
+                last_report = now
+                if progress is not None:
+                    _report(progress, summary, now - start)
+
+    if analytics is not None:
+        analytics.save(analytics_path)
+    summary["seconds"] = time.perf_counter() - start
+    if progress is not None:
+        _report(progress, summary, summary["seconds"])
+    return summary
+
+
+def _validate_units(units: Iterator[Unit], workers: Optional[int], chunksize: int) -> Iterator[Dict[str, Any]]:
+    """Validates units inline or in a pool, keeping a bounded number in flight."""
+    if workers is not None and workers <= 1:
+        for unit in units:
+            yield _validate_unit(unit)
+        return
+
+    with Pool(processes=workers) as pool:
+        # Pool.imap reads its whole input up front; feed it one window at a time
+        window = (workers or os.cpu_count() or 1) * chunksize * 4
+        while True:
+            batch = list(islice(units, window))
+            if not batch:
+                break
+            yield from pool.imap_unordered(_validate_unit, batch, chunksize)
+
+
+def _validate_unit(unit: Unit) -> Dict[str, Any]:
+    """Worker entry point - decodes JSONL lines, validates, tags the result with its key."""
+    key, path, line_number, payload, total_dimensions, freshness_applicable, policy, schema, quality_policy = unit
+
+    document = None
+    report = None
+    error = None
+    try:
+        document = _load_output(payload) if line_number is None else decode_output(payload)
+    except (OSError, ValueError) as e:
+        if line_number is None:
+            results = _create_error_results(f"Could not load {payload}: {e}")
+        else:
+            results = _create_error_results(f"Malformed JSON on line {line_number}: {e}")
+    else:
+        try:
+            if schema != 'off' and isinstance(document, dict):
+                report = check_output(document, repair=schema == 'repair')
+                if report.valid:
+                    document = report.document
+            if not isinstance(document, dict):
+                results = _create_error_results("Gemini output is not a JSON object")
+            elif report is not None and not report.valid:
+                results = _create_error_results(f"Schema validation failed: {summarize_problems(report.problems)}")
+            else:
+                results = _validate_task((0, document, total_dimensions, freshness_applicable, policy, quality_policy))
+                error = results.get("error")
+        except Exception as e:
+            # One malformed document must not abort the run: record it (so
+            # --resume moves past it) with error results instead
+            error = f"Validation failed: {type(e).__name__}: {e}"
+            results = _create_error_results(error)
+
+    record = {
+        "key": key,
+        "input": path,
+        "line": line_number,
+        "run_metadata": run_metadata_of(document),
+        "traceability": results["traceability"],
+        "quality": results["quality"],
+    }
+    if report is not None:
+        record["schema"] = {"valid": report.valid, "problems": [problem._asdict() for problem in report.problems]}
+    if error is not None:
+        record["error"] = error
+    return record
+
+
+def _report(stream: Any, summary: Dict[str, Any], elapsed: float) -> None:
+    """Writes one progress line (counts, docs/s, elapsed) to stream."""
+    rate = summary["validated"] / elapsed if elapsed > 0 else 0.0
+    print(
+        f"[gemini-validate] {summary['validated']} validated, {summary['skipped']} skipped, "
+        f"{rate:.1f} docs/s, {elapsed:.1f}s elapsed",
+        file=stream,
+        flush=True
+    )
+
+
+def _parse_shard(value: str) -> Tuple[int, int]:
+    """argparse type for --shard: 'i/n' to (i, n)."""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/n, got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must satisfy 0 <= i < n, got {value!r}")
+    return index, count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """gemini-validate entry point; returns the process exit code."""
+    parser = argparse.ArgumentParser(
+        prog='gemini-validate',
+        description="Validate Gemini Research Prompt v4.8.1 outputs (traceability + quality)"
+    )
+    parser.add_argument("inputs", nargs="+", help="Files, directories, globs, or - for JSONL on stdin")
+    parser.add_argument("-o", "--output", default="-", help="Results JSONL (default: stdout)")
+    parser.add_argument("--total-dimensions", type=int, default=10, help="Default total_dimensions")
+    parser.add_argument("--no-freshness", action="store_true", help="Default freshness_applicable to False")
+    parser.add_argument("--overrides", help="JSON file of per-file settings keyed by glob pattern")
+    parser.add_argument("--as-of", type=datetime.fromisoformat,
+                        help="Reference time for freshness, ISO format (default: now, frozen at start)")
+    parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS, help="Freshness window in days")
+    parser.add_argument("--partial-dates", choices=PARTIAL_DATE_MODES, default='error',
+                        help="How YYYY-MM / YYYY source dates are treated")
+    parser.add_argument("--policy", help="Quality policy spec (.json, or .yaml with PyYAML) for cutoffs and rules")
+    parser.add_argument("--store", help="Also append results to this columnar result store directory")
+    parser.add_argument("--schema", choices=SCHEMA_MODES, default='off',
+                        help="Check documents against the output schema first: reject, or repair what is fixable")
+    parser.add_argument("--analytics", help="Save streaming quality aggregates to this JSON snapshot")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0 = inline)")
+    parser.add_argument("--chunksize", type=int, default=16, help="Documents per worker dispatch")
+    parser.add_argument("--shard", type=_parse_shard, help="Only validate shard i of n (0-based), e.g. 2/4")
+    parser.add_argument("--resume", action="store_true", help="Skip documents already in --output")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between checkpoints (and progress lines)")
+    parser.add_argument("--quiet", action="store_true", help="No progress output")
+    args = parser.parse_args(argv)
+
+    if args.resume and args.output == '-':
+        parser.error("--resume needs an --output file")
+    if args.output != '-' and args.output.endswith('.gz') and args.resume:
+        parser.error("--resume cannot append to a .gz output")
+
+    try:
+        overrides = load_overrides(args.overrides)
+        quality_policy = load_policy(args.policy) if args.policy is not None else None
+    except (OSError, ValueError, ImportError) as e:
+        parser.error(str(e))
+
+    run(
+        args.inputs,
+        args.output,
+        args.total_dimensions,
+        freshness_applicable=not args.no_freshness,
+        workers=args.workers,
+        shard=args.shard,
+        resume=args.resume,
+        overrides=overrides,
+        chunksize=args.chunksize,
+        progress_interval=args.progress_interval,
+        progress=None if args.quiet else sys.stderr,
+        freshness_policy=FreshnessPolicy(args.window_days, args.as_of, args.partial_dates),
+        store_path=args.store,
+        analytics_path=args.analytics,
+        schema=args.schema,
+        quality_policy=quality_policy
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""
+Incremental Validator for Gemini Research Prompt v4.8.1
+
+Re-scores an output that is amended rather than regenerated - typically by the
+enhancement pass recommended for Marginal results - without re-running the
+full validation. The validator keeps running aggregates (dimension keys, H/M/L
+counts, sorted source dates, unresolved disagreements) and applies
+add/remove/update deltas in time proportional to the delta.
+
+Scores are identical to calling validate_research_quality /
+validate_traceability on the amended output.
+
+Findings are addressed by their id, sources by their source id, and
+disagreements by the handle returned from add_disagreement (disagreements
+present at construction get handles 0..n-1 in order).
+
+Usage:
+    from incremental_validator import IncrementalValidator
+
+    validator = IncrementalValidator(gemini_output, total_dimensions=10)
+    print(validator.validate_research_quality()['threshold'])   # Marginal
+
+    # Enhancement pass added evidence
+    validator.add_source("9", {"publisher": "Anthropic", "date": "2025-10-01"})
+    validator.add_finding({"id": 21, "text": "...", "source_ids": ["9"], "confidence": "H"})
+    print(validator.validate_research_quality()['threshold'])   # Production
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+
+from quality_validator import (
+    _build_result,
+    _contradictions_from_counts,
+    _coverage_from_count,
+    _create_error_result,
+    _evidence_from_counts,
+    _freshness_from_counts,
+)
+from freshness import DEFAULT_POLICY, FreshnessPolicy
+from records import DATE_INVALID
+from traceability_validator import _validate_traceability
+
+
+class IncrementalValidator:
+    """
+    Running-aggregate validator for one Gemini output.
+
+    Args:
+        gemini_output: JSON output from Gemini Research Prompt v4.8.1.
+                       Every finding must have a unique id.
+        total_dimensions: Passed through to quality scoring
+        freshness_applicable: Passed through to quality scoring
+        freshness_policy: freshness.FreshnessPolicy (default: 180 days,
+                          process-wide clock, read at each scoring)
+    """
+
+    def __init__(
+        self,
+        gemini_output: Dict[str, Any],
+        total_dimensions: int,
+        freshness_applicable: bool = True,
+        freshness_policy: Optional[FreshnessPolicy] = None
+    ):
+        self.total_dimensions = total_dimensions
+        self.freshness_applicable = freshness_applicable
+        self.freshness_policy = freshness_policy or DEFAULT_POLICY
+
+        meta = gemini_output.get('meta', {})
+        self._executive_summary = gemini_output.get('executive_summary')
+        self._traceability_data = meta.get('traceability_data')
+        self._run_metadata = meta.get('run_metadata')
+        self._meta_present = 'meta' in gemini_output
+        self._findings_present = 'key_findings' in gemini_output
+        self._sources_present = 'sources' in gemini_output
+
+        # Findings: id → finding, plus dimension / confidence aggregates
+        self._findings: Dict[Any, Dict] = {}
+        self._dimensions: Counter = Counter()
+        self._confidence_counts = {'H': 0, 'M': 0, 'L': 0}
+
+        # Sources: id → source, plus sorted date ordinals for recency counting
+        self._sources: Dict[str, Any] = {}
+        self._source_ordinals: Dict[str, int] = {}
+        self._sorted_ordinals: List[int] = []
+        self._date_parse_errors = 0
+
+        # Disagreements: handle → disagreement
+        self._disagreements: Dict[int, Dict] = {}
+        self._next_handle = 0
+        self._unresolved_count = 0
+
+        for finding in gemini_output.get('key_findings', None) or []:
+            self.add_finding(finding)
+        for source_id, source in (gemini_output.get('sources', None) or {}).items():
+            self.add_source(source_id, source)
+        for disagreement in meta.get('disagreements', None) or []:
+            self.add_disagreement(disagreement)
+
+    # Findings
+
+    def add_finding(self, finding: Dict[str, Any]) -> None:
+        """Adds a finding. Raises ValueError if its id is missing or already present."""
+        if 'id' not in finding:
+            raise ValueError("Incremental validation requires every finding to have an id")
+        finding_id = finding['id']
+        if finding_id in self._findings:
+            raise ValueError(f"Finding id already present: {finding_id}")
+
+        self._findings[finding_id] = finding
+        self._findings_present = True
+        self._apply_finding(finding, +1)
+
+    def remove_finding(self, finding_id: Any) -> Dict[str, Any]:
+        """Removes and returns the finding with this id. Raises KeyError if absent."""
+        finding = self._findings.pop(finding_id)
+        self._apply_finding(finding, -1)
+        return finding
+
+    def update_finding(self, finding: Dict[str, Any]) -> None:
+        """Replaces the finding with the same id. Raises KeyError if absent."""
+        self.remove_finding(finding['id'])
+        self.add_finding(finding)
+
+    def _apply_finding(self, finding: Dict[str, Any], delta: int) -> None:
+        """Adds (+1) or removes (-1) one finding's contribution to the aggregates."""
+        # Same dimension heuristic as _compute_coverage
+        dimension_key = ' '.join(finding.get('text', '').split()[:3]).lower()
+        self._dimensions[dimension_key] += delta
+        if self._dimensions[dimension_key] <= 0:
+            del self._dimensions[dimension_key]
+
+        confidence = finding.get('confidence')
+        if confidence in ('H', 'M', 'L'):
+            self._confidence_counts[confidence] += delta
+
+    # Sources
+
+    def add_source(self, source_id: str, source: Dict[str, Any]) -> None:
+        """Adds a source. Raises ValueError if the id is already present."""
+        if source_id in self._sources:
+            raise ValueError(f"Source id already present: {source_id}")
+
+        ordinal = self.freshness_policy.source_ordinal(source)
+
+        self._sources[source_id] = source
+        self._sources_present = True
+        self._source_ordinals[source_id] = ordinal
+        if ordinal > 0:
+            insort(self._sorted_ordinals, ordinal)
+        elif ordinal == DATE_INVALID:
+            self._date_parse_errors += 1
+
+    def remove_source(self, source_id: str) -> Dict[str, Any]:
+        """Removes and returns the source with this id. Raises KeyError if absent."""
+        source = self._sources.pop(source_id)
+        ordinal = self._source_ordinals.pop(source_id)
+        if ordinal > 0:
+            del self._sorted_ordinals[bisect_left(self._sorted_ordinals, ordinal)]
+        elif ordinal == DATE_INVALID:
+            self._date_parse_errors -= 1
+        return source
+
+    def update_source(self, source_id: str, source: Dict[str, Any]) -> None:
+        """Replaces the source with this id. Raises KeyError if absent."""
+        self.remove_source(source_id)
+        self.add_source(source_id, source)
+
+    # Disagreements
+
+    def add_disagreement(self, disagreement: Dict[str, Any]) -> int:
+        """Adds a disagreement and returns its handle."""
+        handle = self._next_handle
+        self._next_handle += 1
+        self._disagreements[handle] = disagreement
+        if disagreement.get('final_stance') == 'uncertain':
+            self._unresolved_count += 1
+        return handle
+
+    def remove_disagreement(self, handle: int) -> Dict[str, Any]:
+        """Removes and returns a disagreement. Raises KeyError for unknown handles."""
+        disagreement = self._disagreements.pop(handle)
+        if disagreement.get('final_stance') == 'uncertain':
+            self._unresolved_count -= 1
+        return disagreement
+
+    def update_disagreement(self, handle: int, disagreement: Dict[str, Any]) -> None:
+        """Replaces a disagreement, keeping its handle. Raises KeyError for unknown handles."""
+        previous = self._disagreements[handle]
+        if previous.get('final_stance') == 'uncertain':
+            self._unresolved_count -= 1
+        self._disagreements[handle] = disagreement
+        if disagreement.get('final_stance') == 'uncertain':
+            self._unresolved_count += 1
+
+    # Traceability
+
+    def set_traceability_data(self, traceability_data: Dict[str, Any]) -> None:
+        """Replaces meta.traceability_data (answer_claim / supporting_finding_ids)."""
+        self._traceability_data = traceability_data
+        self._meta_present = True
+
+    # Scoring
+
+    def validate_research_quality(self) -> Dict[str, Any]:
+        """Same result as validate_research_quality on the current output."""
+        if not self._findings:
+            return _create_error_result("No findings in research output")
+
+        if not self._sources:
+            return _create_error_result("No sources in research output")
+
+        if self.total_dimensions <= 0:
+            coverage = (0.0, "Error: total_dimensions must be > 0")
+        else:
+            coverage = _coverage_from_count(len(self._dimensions), self.total_dimensions)
+
+        counts = self._confidence_counts
+        evidence = _evidence_from_counts(counts['H'], counts['M'], counts['L'], len(self._findings))
+
+        if self.freshness_applicable:
+            first_recent = self.freshness_policy.first_recent_ordinal()
+            recent_count = len(self._sorted_ordinals) - bisect_left(self._sorted_ordinals, first_recent)
+            freshness = _freshness_from_counts(
+                recent_count, len(self._sources), self._date_parse_errors, self.freshness_policy.window_days
+            )
+        else:
+            freshness = (None, "N/A - Stable topic, freshness not applicable")
+
+        if self._disagreements:
+            contradictions = _contradictions_from_counts(self._unresolved_count, len(self._disagreements))
+        else:
+            contradictions = (10.0, "No contradictions found (0 conflicts)")
+
+        return _build_result(
+            self._metadata_view(),
+            coverage,
+            evidence,
+            freshness,
+            contradictions,
+            self.total_dimensions,
+            self.freshness_applicable
+        )
+
+    def validate_traceability(self) -> Dict[str, Any]:
+        """
+        Same result as validate_traceability on the current output.
+
+        Only the supporting findings and their sources are visited, via the
+        maintained id → finding and id → source maps.
+        """
+        view: Dict[str, Any] = {}
+        if self._executive_summary is not None:
+            view['executive_summary'] = self._executive_summary
+        if self._findings_present:
+            view['key_findings'] = []  # Never walked - findings_by_id is supplied
+        if self._sources_present:
+            view['sources'] = self._sources
+        if self._meta_present:
+            view['meta'] = self._meta_view()
+
+        return _validate_traceability(view, self._findings)
+
+    def validate_all(self) -> Dict[str, Any]:
+        """Both results, as combined_validator.validate_all."""
+        return {
+            "traceability": self.validate_traceability(),
+            "quality": self.validate_research_quality()
+        }
+
+    def to_output(self) -> Dict[str, Any]:
+        """Reconstructs the current Gemini output (fields the validators read)."""
+        output: Dict[str, Any] = {}
+        if self._executive_summary is not None:
+            output['executive_summary'] = self._executive_summary
+        if self._findings_present:
+            output['key_findings'] = list(self._findings.values())
+        if self._sources_present:
+            output['sources'] = dict(self._sources)
+        if self._meta_present:
+            meta = self._meta_view()
+            if self._disagreements:
+                meta['disagreements'] = list(self._disagreements.values())
+            output['meta'] = meta
+        return output
+
+    def _meta_view(self) -> Dict[str, Any]:
+        """meta object without disagreements (traceability never reads them)."""
+        meta: Dict[str, Any] = {}
+        if self._traceability_data is not None:
+            meta['traceability_data'] = self._traceability_data
+        if self._run_metadata is not None:
+            meta['run_metadata'] = self._run_metadata
+        return meta
+
+    def _metadata_view(self) -> Dict[str, Any]:
+        """Minimal output carrying run_metadata for validation_metadata."""
+        if self._run_metadata is None:
+            return {}
+        return {'meta': {'run_metadata': self._run_metadata}}
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    from quality_validator import validate_research_quality
+
+    today = datetime.now()
+    example_output = {
+        "executive_summary": ["1. Desktop and Code use separate memory systems [1]"],
+        "key_findings": [
+            {"id": i, "text": f"Topic {i % 12} finding {i}", "source_ids": [str(i % 40)], "confidence": "HML"[i % 3]}
+            for i in range(1, 5001)
+        ],
+        "sources": {
+            str(i): {"publisher": "Anthropic", "date": (today - timedelta(days=i * 7)).strftime('%Y-%m-%d')}
+            for i in range(40)
+        },
+        "meta": {
+            "traceability_data": {"answer_claim": "Desktop and Code use separate memory systems", "supporting_finding_ids": [1, 2]},
+            "run_metadata": {"prompt_version": "4.8.1"}
+        }
+    }
+
+    validator = IncrementalValidator(example_output, total_dimensions=12)
+    before = validator.validate_research_quality()
+
+    start = time.perf_counter()
+    validator.add_source("new", {"publisher": "Anthropic", "date": today.strftime('%Y-%m-%d')})
+    validator.add_finding({"id": 9999, "text": "Topic 12 new finding", "source_ids": ["new"], "confidence": "H"})
+    after = validator.validate_research_quality()
+    incremental_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full = validate_research_quality(validator.to_output(), total_dimensions=12)
+    full_time = time.perf_counter() - start
+
+    print("Incremental Validation:")
+    print(f"Before: {before['quality_assessment']['average']} ({before['threshold']})")
+    print(f"After:  {after['quality_assessment']['average']} ({after['threshold']})")
+    print(f"Incremental: {incremental_time * 1e3:.2f} ms, full: {full_time * 1e3:.2f} ms")
+    print(f"Identical to full validation: {after['quality_assessment'] == full['quality_assessment']}")
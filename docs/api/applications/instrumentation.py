@@ -0,0 +1,353 @@
+"""
+Validator Instrumentation for Gemini Research Prompt v4.8.1
+
+Opt-in per-stage timers and counters for the validators' hot paths, so a
+slow batch can be attributed to decoding, freshness date handling, claim
+matching or result construction.
+
+Stages (seconds, per call):
+- decode.parse
+- traceability.extract, traceability.similarity, traceability.result
+- quality.coverage, quality.evidence, quality.freshness,
+  quality.contradictions, quality.result (quality.score instead of the
+  per-criterion stages under validate_all, which scores prebuilt counts)
+- combined.index, combined.traceability, combined.quality
+- graph.build, graph.report (traceability_graph.validate_full_traceability)
+
+Counters: documents_decoded, findings_processed, sources_parsed,
+date_parse_errors, cache_hits, cache_misses
+
+Measurements go to pluggable sinks:
+- StatsSink: in-process totals (count / total / max per stage, counters)
+- PrometheusTextSink: Prometheus text exposition file, rewritten on flush()
+  (for node_exporter's textfile collector)
+- OpenTelemetrySink: one span per stage on an OpenTelemetry tracer
+
+Disabled (the default) the validators pay one global lookup per call and a
+no-op method call per stage. Instrumentation is per process - enable it in
+each worker for batch_validator / async_validator pools.
+
+Usage:
+    import instrumentation
+
+    stats = instrumentation.StatsSink()
+    with instrumentation.instrumented(stats, attach_timings=True):
+        results = validate_research_quality(gemini_output, total_dimensions=10)
+
+    print(results['validation_metadata']['timings_ms'])   # {'coverage': 0.02, ...}
+    print(stats.snapshot())
+"""
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Any, Sequence
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # Optional - only needed for OpenTelemetrySink
+    otel_trace = None
+
+
+class Sink:
+    """Receives measurements; subclasses override what they need."""
+
+    def record_stage(self, stage: str, start: float, elapsed: float) -> None:
+        """One stage: perf_counter() start and duration in seconds."""
+
+    def record_count(self, name: str, value: int) -> None:
+        """Counter increment."""
+
+    def flush(self) -> None:
+        """Publishes buffered measurements."""
+
+
+class StatsSink(Sink):
+    """In-process totals, read with snapshot()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+
+    def record_stage(self, stage: str, start: float, elapsed: float) -> None:
+        with self._lock:
+            totals = self._stages.get(stage)
+            if totals is None:
+                self._stages[stage] = [1, elapsed, elapsed]
+            else:
+                totals[0] += 1
+                totals[1] += elapsed
+                if elapsed > totals[2]:
+                    totals[2] = elapsed
+
+    def record_count(self, name: str, value: int) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dictionary containing stages (stage → count, total_seconds,
+            mean_ms, max_ms) and counters (name → value)
+        """
+        with self._lock:
+            return {
+                "stages": {
+                    stage: {
+                        "count": count,
+                        "total_seconds": total,
+                        "mean_ms": total / count * 1e3,
+                        "max_ms": maximum * 1e3,
+                    }
+                    for stage, (count, total, maximum) in sorted(self._stages.items())
+                },
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def reset(self) -> None:
+        """Drops all recorded stage timings and counters."""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+
+class PrometheusTextSink(StatsSink):
+    """
+    Writes totals in the Prometheus text exposition format on flush().
+
+    Args:
+        path: Output file (written atomically, e.g. a *.prom file in the
+              node_exporter textfile directory)
+        prefix: Metric name prefix
+    """
+
+    def __init__(self, path: str, prefix: str = 'gemini_validator'):
+        super().__init__()
+        self.path = path
+        self.prefix = prefix
+
+    def flush(self) -> None:
+        snapshot = self.snapshot()
+        prefix = self.prefix
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent in each validator stage",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, totals in snapshot["stages"].items():
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {totals["total_seconds"]:.9f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {totals["count"]}')
+        for name, value in snapshot["counters"].items():
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temporary, self.path)
+
+
+class OpenTelemetrySink(Sink):
+    """
+    Emits one span per stage (counters become events on a 'counters' span at flush).
+
+    Args:
+        tracer: OpenTelemetry tracer (default: trace.get_tracer(__name__))
+    """
+
+    def __init__(self, tracer: Any = None):
+        if tracer is None:
+            if otel_trace is None:
+                raise ImportError("OpenTelemetrySink requires opentelemetry-api (pip install opentelemetry-api)")
+            tracer = otel_trace.get_tracer(__name__)
+        self.tracer = tracer
+        # perf_counter() → epoch nanoseconds
+        self._offset_ns = time.time_ns() - time.perf_counter_ns()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record_stage(self, stage: str, start: float, elapsed: float) -> None:
+        start_ns = int(start * 1e9) + self._offset_ns
+        span = self.tracer.start_span(stage, start_time=start_ns)
+        span.end(end_time=start_ns + int(elapsed * 1e9))
+
+    def record_count(self, name: str, value: int) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def flush(self) -> None:
+        with self._lock:
+            counters, self._counters = self._counters, {}
+        if counters:
+            span = self.tracer.start_span('counters')
+            span.set_attributes(counters)
+            span.end()
+
+
+class Instrumentation:
+    """
+    Active instrumentation: fans measurements out to sinks.
+
+    Args:
+        sinks: Sinks receiving every measurement
+        attach_timings: Add per-stage timings_ms to each result's validation_metadata
+    """
+
+    def __init__(self, sinks: Sequence[Sink] = (), attach_timings: bool = False):
+        self.sinks = list(sinks)
+        self.attach_timings = attach_timings
+
+    def record_stage(self, stage: str, start: float, elapsed: float) -> None:
+        for sink in self.sinks:
+            sink.record_stage(stage, start, elapsed)
+
+    def record_count(self, name: str, value: int) -> None:
+        for sink in self.sinks:
+            sink.record_count(name, value)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+
+class _Timer:
+    """Lap timer for one validator call; each lap() closes a stage."""
+
+    __slots__ = ('instrumentation', 'prefix', 'mark', 'timings')
+
+    def __init__(self, instrumentation: Instrumentation, prefix: str):
+        self.instrumentation = instrumentation
+        self.prefix = prefix
+        self.timings: Optional[Dict[str, float]] = {} if instrumentation.attach_timings else None
+        self.mark = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Records the time since the previous lap (or start) as stage."""
+        now = time.perf_counter()
+        elapsed = now - self.mark
+        self.instrumentation.record_stage(f"{self.prefix}.{stage}", self.mark, elapsed)
+        if self.timings is not None:
+            self.timings[stage] = round(self.timings.get(stage, 0.0) + elapsed * 1e3, 4)
+        self.mark = now
+
+    def skip(self) -> None:
+        """Restarts the clock without recording (excludes work from the next stage)."""
+        self.mark = time.perf_counter()
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Adds value to the named counter."""
+        self.instrumentation.record_count(name, value)
+
+    def attach(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds timings_ms to result['validation_metadata'] if requested."""
+        if self.timings is not None:
+            result.setdefault('validation_metadata', {})['timings_ms'] = dict(self.timings)
+        return result
+
+
+class _NullTimer:
+    """Timer used while instrumentation is disabled - every method is a no-op."""
+
+    __slots__ = ()
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def skip(self) -> None:
+        pass
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+    def attach(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        return result
+
+
+_NULL_TIMER = _NullTimer()
+
+_ACTIVE: Optional[Instrumentation] = None
+
+
+def start(prefix: str) -> Any:
+    """Timer for one validator call (a shared no-op timer when disabled)."""
+    if _ACTIVE is None:
+        return _NULL_TIMER
+    return _Timer(_ACTIVE, prefix)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Increments a counter (no-op when disabled)."""
+    if _ACTIVE is not None and value:
+        _ACTIVE.record_count(name, value)
+
+
+def enable(sinks: Sequence[Sink] = (), attach_timings: bool = False) -> Instrumentation:
+    """Turns instrumentation on for this process (replacing any active configuration)."""
+    global _ACTIVE
+    _ACTIVE = Instrumentation(sinks, attach_timings)
+    return _ACTIVE
+
+
+def disable() -> None:
+    """Flushes sinks and turns instrumentation off."""
+    global _ACTIVE
+    if _ACTIVE is not None:
+        _ACTIVE.flush()
+    _ACTIVE = None
+
+
+def active() -> Optional[Instrumentation]:
+    """The enabled Instrumentation, or None when instrumentation is off."""
+    return _ACTIVE
+
+
+@contextmanager
+def instrumented(*sinks: Sink, attach_timings: bool = False) -> Iterator[Instrumentation]:
+    """Enables instrumentation for the duration of a with block, then restores the previous state."""
+    global _ACTIVE
+    previous = _ACTIVE
+    instrumentation = enable(sinks, attach_timings)
+    try:
+        yield instrumentation
+    finally:
+        instrumentation.flush()
+        _ACTIVE = previous
+
+
+# Example usage
+if __name__ == "__main__":
+    import json
+
+    # The validators import the module, not this __main__ copy
+    import instrumentation
+    from combined_validator import validate_all
+    from synthetic_outputs import generate_corpus, _TOPICS
+
+    corpus = generate_corpus('tier1_deep_dive', count=500, seed=9)
+
+    start_time = time.perf_counter()
+    for output in corpus:
+        validate_all(output, len(_TOPICS))
+    disabled_time = time.perf_counter() - start_time
+
+    stats = instrumentation.StatsSink()
+    with tempfile.TemporaryDirectory() as tmp:
+        prometheus = instrumentation.PrometheusTextSink(os.path.join(tmp, 'validator.prom'))
+        with instrumentation.instrumented(stats, prometheus, attach_timings=True):
+            start_time = time.perf_counter()
+            for output in corpus:
+                results = validate_all(output, len(_TOPICS))
+            enabled_time = time.perf_counter() - start_time
+        with open(prometheus.path, encoding='utf-8') as f:
+            exposition = f.read()
+
+    print("Validator Instrumentation:")
+    print(f"{len(corpus)} outputs: disabled {disabled_time * 1e3:.1f} ms, enabled {enabled_time * 1e3:.1f} ms")
+    print(f"Last result timings: {json.dumps(results['quality']['validation_metadata']['timings_ms'])}")
+    for stage, totals in stats.snapshot()["stages"].items():
+        print(f"  {stage:28s} mean {totals['mean_ms']:.4f} ms  max {totals['max_ms']:.4f} ms")
+    print(f"Counters: {stats.snapshot()['counters']}")
+    print(exposition.splitlines()[2])
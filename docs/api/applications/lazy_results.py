@@ -0,0 +1,461 @@
+"""
+Lazy Validation Results for Gemini Research Prompt v4.8.1
+
+validate_traceability and validate_research_quality build their complete
+result dicts on every call: finding texts are truncated into support_breakdown,
+justification and notes strings are formatted and validated_at is rendered
+with datetime.now().isoformat(). Bulk jobs usually read only status and
+aggregate_confidence, or threshold and average.
+
+The functions here do the same scoring work eagerly - through the helpers the
+eager validators use (traceability_validator._resolve_support, the
+quality_validator count and score functions) - and return result objects
+whose strings are produced on first access:
+
+- scores, status, threshold, aggregate confidence, finding/source ids: eager
+- notes, justifications, claim_match, expected_answer, support_breakdown: lazy
+- validation_metadata: lazy; the timestamp is taken at validation time
+
+to_dict() (and the read-only dict protocol, result['status'] etc.) returns
+exactly the dict the eager validator would have returned. With
+summary_only=True the objects keep no reference to the output, never format
+strings, and serialize to a trimmed dict with the same key paths but only the
+eager fields:
+
+    traceability: {"status", "traceability": {"support": {finding_ids,
+                   source_ids, aggregate_confidence, meets_policy}}}
+    quality:      {"threshold", "quality_assessment": {<criterion>: {"score"},
+                   "average"}}
+
+Malformed findings (e.g. a supporting finding without 'text') fail when the
+breakdown is first built rather than during validation.
+
+Usage:
+    from lazy_results import validate_traceability_lazy, validate_research_quality_lazy
+
+    trace = validate_traceability_lazy(gemini_output, summary_only=True)
+    quality = validate_research_quality_lazy(gemini_output, total_dimensions=10)
+
+    trace.status, trace.aggregate_confidence, quality.threshold, quality.average
+    quality.to_dict()  # same dict as validate_research_quality
+"""
+
+from typing import Dict, List, Optional, Any, Tuple
+import time
+from datetime import datetime
+
+from freshness import DEFAULT_POLICY, FreshnessPolicy
+from quality_validator import (
+    FRESHNESS_NOT_APPLICABLE,
+    _average_score,
+    _build_result as _build_quality_result,
+    _confidence_counts,
+    _contradictions_from_counts,
+    _contradictions_score,
+    _coverage_from_count,
+    _coverage_score,
+    _create_error_result as _quality_error_result,
+    _determine_threshold,
+    _dimension_count,
+    _evidence_from_counts,
+    _evidence_score,
+    _freshness_counts,
+    _freshness_from_counts,
+    _freshness_score,
+    _unresolved_count,
+)
+from traceability_validator import (
+    VALIDATOR_VERSION as TRACEABILITY_VALIDATOR_VERSION,
+    _build_result as _build_traceability_result,
+    _calculate_similarity,
+    _create_error_result as _traceability_error_result,
+    _expected_text,
+    _resolve_support,
+    _support_breakdown,
+    _support_notes,
+)
+
+
+def _timestamp(validated_at: float) -> str:
+    """validated_at in the isoformat form the eager validators use."""
+    return datetime.fromtimestamp(validated_at).isoformat()
+
+
+def _prompt_version(gemini_output: Any) -> str:
+    return gemini_output.get('meta', {}).get('run_metadata', {}).get('prompt_version', 'unknown')
+
+
+class _LazyResult:
+    """
+    Read-only dict protocol over to_dict(), which is built once and cached.
+
+    Subclasses implement _materialize() (full dict) and _summary() (trimmed
+    dict for summary_only results).
+    """
+
+    __slots__ = ()
+
+    def _require_detail(self, name: str) -> None:
+        if self.summary_only:
+            raise AttributeError(f"{name} is not kept for summary_only results")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The result in dict form (trimmed when summary_only)."""
+        if self._dict is None:
+            self._dict = self._summary() if self.summary_only else self._materialize()
+        return self._dict
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_dict()[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.to_dict().get(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.to_dict()
+
+    def keys(self) -> List[str]:
+        return list(self.to_dict())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return list(self.to_dict().items())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, _LazyResult):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+
+class TraceabilityResult(_LazyResult):
+    """
+    Result of validate_traceability_lazy.
+
+    Attributes:
+        status: VERIFIED | SPECULATIVE | ERROR
+        aggregate_confidence: H | M | L | None
+        meets_policy: Whether the aggregate confidence is H or M
+        finding_ids / source_ids: Supporting findings and their unique sources
+        error: Error message for results that failed before scoring, else None
+        validated_at: Validation time (time.time())
+    """
+
+    __slots__ = (
+        'status', 'aggregate_confidence', 'meets_policy', 'finding_ids', 'source_ids',
+        'error', 'validated_at', 'summary_only', '_output', '_support',
+        '_expected_text', '_claim_match', '_notes', '_dict',
+    )
+
+    def __init__(self, status: str, summary_only: bool):
+        self.status = status
+        self.aggregate_confidence = "None"
+        self.meets_policy = False
+        self.finding_ids: List[Any] = []
+        self.source_ids: List[Any] = []
+        self.error: Optional[str] = None
+        self.validated_at = time.time()
+        self.summary_only = summary_only
+        self._output: Any = None
+        self._support: Optional[Dict[str, Any]] = None
+        self._expected_text: Optional[str] = None
+        self._claim_match: Optional[str] = None
+        self._notes: Optional[str] = None
+        self._dict: Optional[Dict[str, Any]] = None
+
+    @property
+    def expected_answer(self) -> str:
+        """executive_summary[0] without its item number and citations."""
+        self._require_detail('expected_answer')
+        if self._expected_text is None:
+            self._expected_text = _expected_text(self._output['executive_summary'][0]) if self._output is not None else ""
+        return self._expected_text
+
+    @property
+    def claim_match(self) -> str:
+        """Similarity label of answer_claim vs. expected_answer."""
+        self._require_detail('claim_match')
+        if self._claim_match is None:
+            self._claim_match = _calculate_similarity(self._support['answer_claim'], self.expected_answer)
+        return self._claim_match
+
+    @property
+    def notes(self) -> str:
+        """Explanation of the status, as in validate_traceability."""
+        self._require_detail('notes')
+        if self._notes is None:
+            if self.error is not None:
+                self._notes = f"Validation error: {self.error}"
+            else:
+                self._notes = _support_notes(self._support)
+        return self._notes
+
+    @property
+    def support_breakdown(self) -> List[Dict[str, Any]]:
+        """Per supporting finding: id, truncated text, confidence and sources."""
+        self._require_detail('support_breakdown')
+        if self._support is None or self._support['supporting_findings'] is None:
+            return []
+        return _support_breakdown(self._support['supporting_findings'])
+
+    @property
+    def validation_metadata(self) -> Dict[str, str]:
+        self._require_detail('validation_metadata')
+        if self.error is not None:
+            return {
+                "validator_version": TRACEABILITY_VALIDATOR_VERSION,
+                "validated_at": _timestamp(self.validated_at),
+                "error": self.error
+            }
+        return {
+            "validator_version": TRACEABILITY_VALIDATOR_VERSION,
+            "prompt_version": _prompt_version(self._output),
+            "validated_at": _timestamp(self.validated_at)
+        }
+
+    def _summary(self) -> Dict[str, Any]:
+        support = {
+            "finding_ids": self.finding_ids,
+            "source_ids": self.source_ids,
+            "aggregate_confidence": self.aggregate_confidence,
+            "meets_policy": self.meets_policy
+        }
+        return {"traceability": {"support": support}, "status": self.status}
+
+    def _materialize(self) -> Dict[str, Any]:
+        if self.error is not None:
+            result = _traceability_error_result(self.error)
+            result["validation_metadata"]["validated_at"] = _timestamp(self.validated_at)
+            return result
+
+        has_findings = self._support['supporting_findings'] is not None
+        return _build_traceability_result(
+            self._output,
+            self._support,
+            self.expected_answer,
+            self.claim_match if has_findings else None,
+            self.support_breakdown if has_findings else None,
+            notes=self.notes,
+            validation_metadata=self.validation_metadata
+        )
+
+
+def validate_traceability_lazy(
+    gemini_output: Dict[str, Any],
+    findings_by_id: Optional[Dict[Any, Dict]] = None,
+    summary_only: bool = False
+) -> TraceabilityResult:
+    """
+    validate_traceability returning a TraceabilityResult.
+
+    Args:
+        gemini_output: JSON output from Gemini Research Prompt v4.8.1
+        findings_by_id: Finding id → finding, if the caller already built it
+        summary_only: Keep only the eager fields (see module docstring)
+    """
+    support = _resolve_support(gemini_output, findings_by_id)
+    result = TraceabilityResult(support['status'] if support['error'] is None else "ERROR", summary_only)
+    if support['error'] is not None:
+        result.error = support['error']
+        return result
+
+    result.finding_ids = support['finding_ids']
+    result.source_ids = support['source_ids']
+    result.aggregate_confidence = support['aggregate_confidence']
+    result.meets_policy = support['meets_policy']
+    if not summary_only:
+        result._output = gemini_output
+        result._support = support
+    return result
+
+
+class QualityResult(_LazyResult):
+    """
+    Result of validate_research_quality_lazy.
+
+    Attributes:
+        scores: Criterion → unrounded score (freshness None when not applicable)
+        average: Unrounded average score
+        threshold: Production | Marginal | Insufficient
+        error: Error message for results that failed before scoring, else None
+        validated_at: Validation time (time.time())
+    """
+
+    __slots__ = (
+        'scores', 'average', 'threshold', 'error', 'validated_at', 'summary_only',
+        '_counts', '_total_dimensions', '_freshness_applicable', '_window_days',
+        '_prompt_version', '_justifications', '_dict',
+    )
+
+    def __init__(self, summary_only: bool):
+        self.scores: Dict[str, Optional[float]] = {}
+        self.average = 0.0
+        self.threshold = "Insufficient"
+        self.error: Optional[str] = None
+        self.validated_at = time.time()
+        self.summary_only = summary_only
+        self._counts: Dict[str, Any] = {}
+        self._total_dimensions = 0
+        self._freshness_applicable = True
+        self._window_days = DEFAULT_POLICY.window_days
+        self._prompt_version = 'unknown'
+        self._justifications: Optional[Dict[str, tuple]] = None
+        self._dict: Optional[Dict[str, Any]] = None
+
+    def _criteria(self) -> Dict[str, tuple]:
+        """Criterion → (score, justification), exactly as the eager validator computes them."""
+        if self._justifications is None:
+            counts = self._counts
+            if self._freshness_applicable:
+                freshness = _freshness_from_counts(*counts['freshness'], self._window_days)
+            else:
+                freshness = (None, FRESHNESS_NOT_APPLICABLE)
+            self._justifications = {
+                'coverage': _coverage_from_count(counts['dimensions'], self._total_dimensions),
+                'evidence': _evidence_from_counts(*counts['confidence'], counts['findings']),
+                'freshness': freshness,
+                'contradictions': _contradictions_from_counts(counts['unresolved'], counts['disagreements']),
+            }
+        return self._justifications
+
+    @property
+    def justifications(self) -> Dict[str, str]:
+        """Criterion → justification text."""
+        self._require_detail('justifications')
+        return {name: criterion[1] for name, criterion in self._criteria().items()}
+
+    @property
+    def validation_metadata(self) -> Dict[str, Any]:
+        self._require_detail('validation_metadata')
+        return self.to_dict()["validation_metadata"]
+
+    def _summary(self) -> Dict[str, Any]:
+        assessment: Dict[str, Any] = {
+            name: {"score": round(score, 1) if score is not None else None}
+            for name, score in self.scores.items()
+        }
+        assessment["average"] = round(self.average, 1)
+        return {"quality_assessment": assessment, "threshold": self.threshold}
+
+    def _materialize(self) -> Dict[str, Any]:
+        if self.error is not None:
+            result = _quality_error_result(self.error)
+        else:
+            criteria = self._criteria()
+            result = _build_quality_result(
+                {"meta": {"run_metadata": {"prompt_version": self._prompt_version}}},
+                criteria['coverage'],
+                criteria['evidence'],
+                criteria['freshness'],
+                criteria['contradictions'],
+                self._total_dimensions,
+                self._freshness_applicable,
+                average_score=self.average,
+            )
+        result["validation_metadata"]["validated_at"] = _timestamp(self.validated_at)
+        return result
+
+
+def validate_research_quality_lazy(
+    gemini_output: Dict[str, Any],
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    coverage_engine: Optional[Any] = None,
+    freshness_policy: Optional[FreshnessPolicy] = None,
+    summary_only: bool = False
+) -> QualityResult:
+    """
+    validate_research_quality returning a QualityResult.
+
+    Scores come from the same counts as the eager validator (coverage_engine
+    must provide CoverageEngine.count); justifications are formatted from
+    those counts on first access.
+    """
+    result = QualityResult(summary_only)
+    findings = gemini_output.get('key_findings', [])
+    sources = gemini_output.get('sources', {})
+
+    if not findings:
+        result.error = "No findings in research output"
+    elif not sources:
+        result.error = "No sources in research output"
+    if result.error is not None:
+        result.scores = {'coverage': 0, 'evidence': 0, 'freshness': None, 'contradictions': 0}
+        return result
+
+    if total_dimensions <= 0:
+        dimensions = 0
+    else:
+        dimensions = coverage_engine.count(findings) if coverage_engine is not None else _dimension_count(findings)
+    coverage = _coverage_score(dimensions, total_dimensions)
+
+    confidence = _confidence_counts(findings)
+    evidence = _evidence_score(confidence[0], confidence[1], len(findings))
+
+    policy = freshness_policy or DEFAULT_POLICY
+    if freshness_applicable:
+        freshness_counts = _freshness_counts(sources, policy)
+        freshness = _freshness_score(freshness_counts[0], freshness_counts[1])
+    else:
+        freshness_counts = None
+        freshness = None
+
+    disagreements = gemini_output.get('meta', {}).get('disagreements', [])
+    unresolved = _unresolved_count(disagreements) if disagreements else 0
+    contradictions = _contradictions_score(unresolved, len(disagreements) if disagreements else 0)
+
+    result.scores = {
+        'coverage': coverage,
+        'evidence': evidence,
+        'freshness': freshness,
+        'contradictions': contradictions,
+    }
+    result.average = _average_score(coverage, evidence, freshness, contradictions)
+    result.threshold = _determine_threshold(result.average)['threshold']
+
+    if not summary_only:
+        result._counts = {
+            'dimensions': dimensions,
+            'confidence': confidence,
+            'findings': len(findings),
+            'freshness': freshness_counts,
+            'unresolved': unresolved,
+            'disagreements': len(disagreements) if disagreements else 0,
+        }
+        result._total_dimensions = total_dimensions
+        result._freshness_applicable = freshness_applicable
+        result._window_days = policy.window_days
+        result._prompt_version = _prompt_version(gemini_output)
+    return result
+
+
+# Example usage
+if __name__ == "__main__":
+    from synthetic_outputs import generate_corpus
+
+    from quality_validator import validate_research_quality
+    from traceability_validator import validate_traceability
+
+    corpus = generate_corpus('tier1_deep_dive', count=2000, seed=8)
+
+    def strip(result: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in result.items() if key != 'validation_metadata'}
+
+    mismatches = sum(
+        strip(validate_traceability(output)) != strip(validate_traceability_lazy(output).to_dict())
+        or strip(validate_research_quality(output, 10)) != strip(validate_research_quality_lazy(output, 10).to_dict())
+        for output in corpus[:200]
+    )
+    print(f"to_dict() mismatches vs eager validators: {mismatches}/200")
+
+    for label, run in (
+        ("eager", lambda o: (validate_traceability(o)['status'], validate_research_quality(o, 10)['threshold'])),
+        ("lazy", lambda o: (validate_traceability_lazy(o).status, validate_research_quality_lazy(o, 10).threshold)),
+        ("summary_only", lambda o: (validate_traceability_lazy(o, summary_only=True).status,
+                                    validate_research_quality_lazy(o, 10, summary_only=True).threshold)),
+    ):
+        start = time.perf_counter()
+        for output in corpus:
+            run(output)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>13}: {len(corpus)} outputs in {elapsed * 1e3:.1f} ms")
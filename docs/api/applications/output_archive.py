@@ -0,0 +1,814 @@
+"""
+Memory-Mapped Output Archive for Gemini Research Prompt v4.8.1
+
+Every validation run re-parses the same raw JSON archive. build_archive
+converts a corpus of Gemini outputs once into a single binary file that
+later runs memory-map instead of parsing:
+
+- Fixed-width arrays, one row per document / finding / source / edge /
+  disagreement: finding confidences and dimension keys, finding → source
+  edges, source date ordinals (as datetime64[D] days) and date status,
+  is_primary / independent flags, disagreement stances, and CSR offsets
+  locating each document's rows
+- A string heap (UTF-8, deduplicated) for finding texts, ids, answer claims,
+  executive_summary[0] and prompt versions
+
+OutputArchive maps the file read-only; arrays are numpy views of the map, so
+nothing is copied or decoded until a result is materialized, and worker
+processes that open the same file share its pages through the page cache.
+
+validate_research_quality_batch feeds the arrays straight into
+columnar_quality.QualityColumns; validate_traceability_batch walks the edge
+arrays and only decodes the strings that appear in results. Both produce the
+same result dicts as the per-document validators. Documents whose shape the
+arrays cannot represent exactly (missing fields, unexpected types) are kept
+as raw JSON in the heap and validated by the per-document validators.
+
+Requires NumPy.
+
+File layout: 8-byte magic, little-endian uint64 header length, JSON header
+(array name → dtype, offset, length), then each array aligned to 64 bytes.
+
+Usage:
+    from output_archive import build_archive, OutputArchive, validate_archive
+
+    build_archive(gemini_outputs, 'corpus.gemarc')
+
+    archive = OutputArchive('corpus.gemarc')
+    quality = validate_research_quality_batch(archive, total_dimensions=10)
+    traceability = validate_traceability_batch(archive)
+
+    for item in validate_archive('corpus.gemarc', total_dimensions=10, workers=8):
+        print(item['index'], item['quality']['threshold'], item['traceability']['status'])
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from datetime import datetime
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to build and read archives
+    np = None
+
+from columnar_quality import (
+    CONFIDENCE_CODES,
+    DATE_ERROR,
+    DATE_MISSING,
+    DATE_OK,
+    DOC_NO_FINDINGS,
+    DOC_NO_SOURCES,
+    DOC_OK,
+    OTHER_CONFIDENCE,
+    QualityColumns,
+)
+from freshness import DEFAULT_POLICY, FreshnessPolicy
+from quality_validator import validate_research_quality
+from records import DATE_INVALID, parse_date_ordinal
+from traceability_validator import (
+    _build_result,
+    _calculate_similarity,
+    _compute_aggregate_confidence,
+    _create_error_result,
+    _expected_text,
+    _policy_levels,
+    _support_breakdown,
+    validate_traceability,
+)
+
+
+MAGIC = b'GEMARC\x00\x01'
+FORMAT_VERSION = 1
+_ALIGNMENT = 64
+
+# doc_flags bits: the document is validated from its raw JSON instead of the arrays
+IRREGULAR_QUALITY = 1
+IRREGULAR_TRACEABILITY = 2
+
+# disagreement_stance codes
+STANCE_CODES = {'for': 0, 'against': 1, 'uncertain': 2}
+OTHER_STANCE = 3
+
+# source_primary / source_independent values
+FLAG_FALSE = 0
+FLAG_TRUE = 1
+FLAG_MISSING = -1
+
+NO_STRING = -1
+
+_CONFIDENCE_LETTERS = 'HML'
+
+# name → (array typecode, numpy dtype)
+_COLUMNS = {
+    # Per document
+    'doc_flags': ('b', 'i1'),
+    'doc_status': ('b', 'i1'),
+    'doc_prompt_version': ('i', 'i4'),
+    'doc_raw': ('i', 'i4'),
+    'doc_answer_claim': ('i', 'i4'),
+    'doc_summary_first': ('i', 'i4'),
+    'doc_support_ids': ('i', 'i4'),
+    'finding_offsets': ('q', 'i8'),
+    'source_offsets': ('q', 'i8'),
+    'support_offsets': ('q', 'i8'),
+    'disagreement_offsets': ('q', 'i8'),
+    # Per finding
+    'finding_doc': ('q', 'i8'),
+    'finding_confidence': ('b', 'i1'),
+    'finding_dimension': ('q', 'i8'),
+    'finding_id': ('i', 'i4'),
+    'finding_text': ('i', 'i4'),
+    'edge_offsets': ('q', 'i8'),
+    # Per finding → source edge
+    'edge_source': ('q', 'i8'),
+    'edge_source_id': ('i', 'i4'),
+    # Per source
+    'source_doc': ('q', 'i8'),
+    'source_id': ('i', 'i4'),
+    'source_date': ('q', 'i8'),
+    'source_date_status': ('b', 'i1'),
+    'source_raw_date': ('i', 'i4'),
+    'source_primary': ('b', 'i1'),
+    'source_independent': ('b', 'i1'),
+    # Per supporting_finding_ids entry: finding row, or -1 if the id is not a finding
+    'support_finding': ('q', 'i8'),
+    # Per disagreement
+    'disagreement_doc': ('q', 'i8'),
+    'disagreement_stance': ('b', 'i1'),
+    # String heap
+    'string_offsets': ('q', 'i8'),
+}
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("output_archive requires NumPy (pip install numpy)")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class ArchiveBuilder:
+    """Accumulates outputs into archive columns; write() produces the file."""
+
+    def __init__(self):
+        _require_numpy()
+        self.columns = {name: array(typecode) for name, (typecode, _) in _COLUMNS.items()}
+        for name in ('finding_offsets', 'source_offsets', 'support_offsets', 'disagreement_offsets',
+                     'edge_offsets', 'string_offsets'):
+            self.columns[name].append(0)
+        self._strings: Dict[str, int] = {}
+        self._heap = bytearray()
+        self._dimensions: Dict[str, int] = {}
+        self.irregular = 0
+
+    def __len__(self) -> int:
+        return len(self.columns['doc_flags'])
+
+    def string(self, value: str) -> int:
+        """Heap id of a string, adding it on first use."""
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = self._strings[value] = len(self._strings)
+            self._heap += value.encode('utf-8', 'surrogatepass')
+            self.columns['string_offsets'].append(len(self._heap))
+        return string_id
+
+    def add(self, gemini_output: Any) -> None:
+        """Appends one Gemini output (JSON-decoded dict)."""
+        c = self.columns
+        quality_regular = _quality_regular(gemini_output)
+        traceability_regular = _traceability_regular(gemini_output)
+
+        flags = 0 if quality_regular else IRREGULAR_QUALITY
+        if not traceability_regular:
+            flags |= IRREGULAR_TRACEABILITY
+        c['doc_flags'].append(flags)
+        if flags:
+            self.irregular += 1
+            c['doc_raw'].append(self.string(json.dumps(gemini_output, ensure_ascii=False)))
+        else:
+            c['doc_raw'].append(NO_STRING)
+
+        if not (quality_regular or traceability_regular):
+            for name in ('doc_status', 'doc_prompt_version', 'doc_answer_claim',
+                         'doc_summary_first', 'doc_support_ids'):
+                c[name].append(NO_STRING if name != 'doc_status' else DOC_NO_FINDINGS)
+            self._close_document()
+            return
+
+        findings = gemini_output.get('key_findings', [])
+        sources = gemini_output.get('sources', {})
+        meta = gemini_output.get('meta', {})
+        if not findings:
+            c['doc_status'].append(DOC_NO_FINDINGS)
+        elif not sources:
+            c['doc_status'].append(DOC_NO_SOURCES)
+        else:
+            c['doc_status'].append(DOC_OK)
+        c['doc_prompt_version'].append(self.string(_prompt_version(gemini_output)))
+
+        source_rows: Dict[str, int] = {}
+        for source_id, source_data in (sources.items() if isinstance(sources, dict) else ()):
+            source_rows[source_id] = len(c['source_doc'])
+            self._add_source(source_id, source_data)
+
+        finding_rows: Dict[Any, int] = {}
+        for finding in findings:
+            if traceability_regular:
+                finding_rows[finding['id']] = len(c['finding_doc'])
+            self._add_finding(finding, traceability_regular, source_rows)
+
+        if traceability_regular:
+            traceability_data = meta['traceability_data']
+            summary = gemini_output['executive_summary']
+            supporting_ids = traceability_data.get('supporting_finding_ids', [])
+            c['doc_answer_claim'].append(self.string(traceability_data.get('answer_claim', '')))
+            c['doc_summary_first'].append(self.string(summary[0]) if summary else NO_STRING)
+            c['doc_support_ids'].append(self.string(json.dumps(supporting_ids, ensure_ascii=False)))
+            for finding_id in supporting_ids:
+                c['support_finding'].append(finding_rows.get(finding_id, -1))
+        else:
+            c['doc_answer_claim'].append(NO_STRING)
+            c['doc_summary_first'].append(NO_STRING)
+            c['doc_support_ids'].append(NO_STRING)
+
+        disagreements = meta.get('disagreements', []) if isinstance(meta, dict) else []
+        doc = len(self) - 1
+        for disagreement in (disagreements if isinstance(disagreements, list) else ()):
+            stance = disagreement.get('final_stance') if isinstance(disagreement, dict) else None
+            c['disagreement_doc'].append(doc)
+            c['disagreement_stance'].append(
+                STANCE_CODES.get(stance, OTHER_STANCE) if isinstance(stance, str) else OTHER_STANCE
+            )
+
+        self._close_document()
+
+    def _add_source(self, source_id: str, source_data: Any) -> None:
+        c = self.columns
+        source_data = source_data if isinstance(source_data, dict) else {}
+        date_str = source_data.get('date', '')
+        ordinal = parse_date_ordinal(date_str) if not date_str or isinstance(date_str, str) else DATE_INVALID
+
+        c['source_doc'].append(len(self) - 1)
+        c['source_id'].append(self.string(source_id))
+        if ordinal > 0:
+            c['source_date'].append(ordinal - _EPOCH_ORDINAL)
+            c['source_date_status'].append(DATE_OK)
+            c['source_raw_date'].append(NO_STRING)
+        else:
+            c['source_date'].append(0)
+            c['source_date_status'].append(DATE_MISSING if ordinal == 0 else DATE_ERROR)
+            # Unparseable dates keep their text for partial-date policies
+            c['source_raw_date'].append(
+                self.string(date_str) if ordinal == DATE_INVALID and isinstance(date_str, str) else NO_STRING
+            )
+        c['source_primary'].append(_flag(source_data.get('is_primary')))
+        c['source_independent'].append(_flag(source_data.get('independent')))
+
+    def _add_finding(self, finding: Dict[str, Any], traceability_regular: bool, source_rows: Dict[str, int]) -> None:
+        c = self.columns
+        text = finding.get('text', '')
+        text = text if isinstance(text, str) else ''
+        confidence = finding.get('confidence')
+
+        c['finding_doc'].append(len(self) - 1)
+        c['finding_confidence'].append(
+            CONFIDENCE_CODES.get(confidence, OTHER_CONFIDENCE) if isinstance(confidence, str) else OTHER_CONFIDENCE
+        )
+        # Same dimension heuristic as _compute_coverage
+        dimension_key = ' '.join(text.split()[:3]).lower()
+        c['finding_dimension'].append(self._dimensions.setdefault(dimension_key, len(self._dimensions)))
+
+        if traceability_regular:
+            c['finding_id'].append(self.string(json.dumps(finding['id'], ensure_ascii=False)))
+            c['finding_text'].append(self.string(text))
+            for source_id in finding['source_ids']:
+                c['edge_source'].append(source_rows.get(source_id, -1))
+                c['edge_source_id'].append(self.string(source_id))
+        else:
+            c['finding_id'].append(NO_STRING)
+            c['finding_text'].append(NO_STRING)
+        c['edge_offsets'].append(len(c['edge_source']))
+
+    def _close_document(self) -> None:
+        c = self.columns
+        c['finding_offsets'].append(len(c['finding_doc']))
+        c['source_offsets'].append(len(c['source_doc']))
+        c['support_offsets'].append(len(c['support_finding']))
+        c['disagreement_offsets'].append(len(c['disagreement_doc']))
+
+    def write(self, path: str) -> Dict[str, Any]:
+        """
+        Writes the archive (atomically, via a temporary file).
+
+        Returns:
+            Dictionary containing documents, irregular (documents kept as
+            raw JSON), strings, heap_bytes and file_bytes
+        """
+        sections = [(name, np.frombuffer(column, dtype=_COLUMNS[name][1]) if len(column) else
+                     np.zeros(0, dtype=_COLUMNS[name][1])) for name, column in self.columns.items()]
+        sections.append(('string_heap', np.frombuffer(bytes(self._heap), dtype='u1')))
+
+        header_arrays = {}
+        offset = 0
+        for name, values in sections:
+            header_arrays[name] = {"dtype": values.dtype.newbyteorder('<').str, "offset": offset, "length": len(values)}
+            offset = _align(offset + values.nbytes)
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "documents": len(self),
+            "built_at": datetime.now().isoformat(),
+            "arrays": header_arrays,
+        }).encode('utf-8')
+
+        data_start = _align(len(MAGIC) + 8 + len(header))
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(MAGIC + struct.pack('<Q', len(header)) + header)
+            for name, values in sections:
+                f.seek(data_start + header_arrays[name]["offset"])
+                f.write(values.astype(values.dtype.newbyteorder('<'), copy=False).tobytes())
+            f.truncate(data_start + offset)
+        os.replace(temporary, path)
+
+        return {
+            "documents": len(self),
+            "irregular": self.irregular,
+            "strings": len(self._strings),
+            "heap_bytes": len(self._heap),
+            "file_bytes": os.path.getsize(path),
+        }
+
+
+def build_archive(outputs: Iterable[Any], path: str) -> Dict[str, Any]:
+    """Converts Gemini outputs (JSON-decoded dicts) into an archive file; returns ArchiveBuilder.write()'s summary."""
+    builder = ArchiveBuilder()
+    for gemini_output in outputs:
+        builder.add(gemini_output)
+    return builder.write(path)
+
+
+def _flag(value: Any) -> int:
+    if value is True:
+        return FLAG_TRUE
+    if value is False:
+        return FLAG_FALSE
+    return FLAG_MISSING
+
+
+def _is_id(value: Any) -> bool:
+    return isinstance(value, str) or (isinstance(value, int) and not isinstance(value, bool))
+
+
+def _prompt_version(gemini_output: Dict[str, Any]) -> Optional[str]:
+    """run_metadata.prompt_version as the validators read it; None if it is not a string."""
+    meta = gemini_output.get('meta', {})
+    run_metadata = meta.get('run_metadata', {}) if isinstance(meta, dict) else None
+    if not isinstance(run_metadata, dict):
+        return None
+    prompt_version = run_metadata.get('prompt_version', 'unknown')
+    return prompt_version if isinstance(prompt_version, str) else None
+
+
+def _quality_regular(gemini_output: Any) -> bool:
+    """Whether validate_research_quality's result is fully determined by the archive columns."""
+    if not isinstance(gemini_output, dict) or _prompt_version(gemini_output) is None:
+        return False
+    findings = gemini_output.get('key_findings', [])
+    sources = gemini_output.get('sources', {})
+    disagreements = gemini_output.get('meta', {}).get('disagreements', [])
+    return (
+        isinstance(findings, list)
+        and all(isinstance(f, dict) and isinstance(f.get('text', ''), str) for f in findings)
+        and isinstance(sources, dict)
+        and all(
+            isinstance(s, dict) and (not s.get('date', '') or isinstance(s.get('date'), str))
+            for s in sources.values()
+        )
+        and (not disagreements or (
+            isinstance(disagreements, list) and all(isinstance(d, dict) for d in disagreements)
+        ))
+    )
+
+
+def _traceability_regular(gemini_output: Any) -> bool:
+    """Whether validate_traceability's result is fully determined by the archive columns."""
+    try:
+        summary = gemini_output['executive_summary']
+        findings = gemini_output['key_findings']
+        sources = gemini_output['sources']
+        traceability_data = gemini_output['meta']['traceability_data']
+    except (KeyError, TypeError, IndexError):
+        return False
+    if not (isinstance(summary, list) and isinstance(findings, list)
+            and isinstance(sources, dict) and isinstance(traceability_data, dict)):
+        return False
+    if _prompt_version(gemini_output) is None or (summary and not isinstance(summary[0], str)):
+        return False
+
+    supporting_ids = traceability_data.get('supporting_finding_ids', [])
+    if not isinstance(traceability_data.get('answer_claim', ''), str):
+        return False
+    if not isinstance(supporting_ids, list) or not all(_is_id(i) for i in supporting_ids):
+        return False
+    return all(
+        isinstance(f, dict)
+        and _is_id(f.get('id'))
+        and isinstance(f.get('text'), str)
+        and f.get('confidence') in CONFIDENCE_CODES
+        and isinstance(f.get('source_ids'), list)
+        and all(isinstance(s, str) for s in f['source_ids'])
+        for f in findings
+    )
+
+
+class OutputArchive:
+    """
+    Read-only memory map of an archive file.
+
+    Every column in _COLUMNS is an attribute holding a numpy view of the map.
+    Pickling an OutputArchive (e.g. into a worker process) reopens the file
+    there instead of copying it.
+
+    Args:
+        path: Archive written by build_archive
+    """
+
+    def __init__(self, path: str):
+        _require_numpy()
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: not a Gemini output archive")
+        (header_length,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(self._mmap[header_start:header_start + header_length])
+        if self.header["version"] != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported archive version {self.header['version']}")
+
+        data_start = _align(header_start + header_length)
+        for name, spec in self.header["arrays"].items():
+            setattr(self, name, np.frombuffer(
+                self._mmap, dtype=np.dtype(spec["dtype"]), count=spec["length"],
+                offset=data_start + spec["offset"]
+            ))
+        self._string_cache: Dict[int, str] = {}
+        self._id_cache: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return self.header["documents"]
+
+    def __reduce__(self) -> tuple:
+        return OutputArchive, (self.path,)
+
+    def close(self) -> None:
+        """Unmaps the file; views taken from this archive must be released first."""
+        for name in self.header["arrays"]:
+            setattr(self, name, None)
+        self._mmap.close()
+
+    def string(self, string_id: int) -> Optional[str]:
+        """Decodes one heap string (None for NO_STRING)."""
+        if string_id < 0:
+            return None
+        value = self._string_cache.get(string_id)
+        if value is None:
+            start, end = self.string_offsets[string_id], self.string_offsets[string_id + 1]
+            value = self.string_heap[start:end].tobytes().decode('utf-8', 'surrogatepass')
+            if len(self._string_cache) >= 65536:
+                self._string_cache.clear()
+            self._string_cache[string_id] = value
+        return value
+
+    def _finding_id(self, string_id: int) -> Any:
+        """Decoded finding id (ids are JSON scalars, so decoded values can be shared)."""
+        value = self._id_cache.get(string_id)
+        if value is None:
+            value = json.loads(self.string(string_id))
+            if len(self._id_cache) >= 65536:
+                self._id_cache.clear()
+            self._id_cache[string_id] = value
+        return value
+
+    def document(self, index: int) -> Optional[Dict[str, Any]]:
+        """The raw JSON of an irregular document (None for documents stored as columns)."""
+        raw = self.string(int(self.doc_raw[index]))
+        return None if raw is None else json.loads(raw)
+
+    def source_ordinals(self) -> 'np.ndarray':
+        """Source dates as proleptic Gregorian ordinals (records.DATE_MISSING / DATE_INVALID for the rest)."""
+        ordinals = self.source_date + _EPOCH_ORDINAL
+        ordinals[self.source_date_status == DATE_MISSING] = 0
+        ordinals[self.source_date_status == DATE_ERROR] = DATE_INVALID
+        return ordinals
+
+    def quality_columns(
+        self,
+        total_dimensions: Union[int, Sequence[int]],
+        freshness_applicable: bool = True,
+        freshness_policy: Optional[FreshnessPolicy] = None,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> QualityColumns:
+        """
+        QualityColumns over documents [start, stop), built from views of the map.
+
+        Irregular documents appear as "No findings" rows; see
+        validate_research_quality_batch for their actual results.
+        """
+        stop = len(self) if stop is None else stop
+        policy = (freshness_policy or DEFAULT_POLICY).frozen()
+
+        f0, f1 = self.finding_offsets[start], self.finding_offsets[stop]
+        s0, s1 = self.source_offsets[start], self.source_offsets[stop]
+        d0, d1 = self.disagreement_offsets[start], self.disagreement_offsets[stop]
+        finding_doc = self.finding_doc[f0:f1]
+        source_doc = self.source_doc[s0:s1]
+        disagreement_doc = self.disagreement_doc[d0:d1]
+        if start:
+            finding_doc, source_doc, disagreement_doc = finding_doc - start, source_doc - start, disagreement_doc - start
+
+        source_date = self.source_date[s0:s1]
+        source_date_status = self.source_date_status[s0:s1]
+        if policy.partial_dates != 'error':
+            source_date, source_date_status = self._partial_dates(policy, s0, s1)
+
+        n_docs = stop - start
+        disagreement_total = np.diff(self.disagreement_offsets[start:stop + 1])
+        uncertain = self.disagreement_stance[d0:d1] == STANCE_CODES['uncertain']
+        prompt_ids = self.doc_prompt_version[start:stop].tolist()
+
+        if isinstance(total_dimensions, (int, np.integer)):
+            dimensions_column = np.full(n_docs, total_dimensions, dtype=np.int64)
+        else:
+            dimensions_column = np.asarray(total_dimensions, dtype=np.int64)
+            if dimensions_column.shape != (n_docs,):
+                raise ValueError("total_dimensions must be an int or one value per document")
+
+        return QualityColumns(
+            doc_status=self.doc_status[start:stop],
+            total_dimensions=dimensions_column,
+            freshness_applicable=freshness_applicable,
+            finding_doc=finding_doc,
+            finding_confidence=self.finding_confidence[f0:f1],
+            finding_dimension=self.finding_dimension[f0:f1],
+            source_doc=source_doc,
+            source_date=source_date.view('datetime64[D]'),
+            source_date_status=source_date_status,
+            disagreement_present=disagreement_total > 0,
+            disagreement_total=disagreement_total,
+            disagreement_unresolved=np.bincount(disagreement_doc[uncertain], minlength=n_docs),
+            prompt_versions=[self.string(i) for i in prompt_ids],
+            cutoff=policy.cutoff(),
+            reference_time=policy.reference_time(),
+            window_days=policy.window_days
+        )
+
+    def _partial_dates(self, policy: FreshnessPolicy, s0: int, s1: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Date columns with unparseable dates re-read under a partial-date policy (copies)."""
+        source_date = self.source_date[s0:s1].copy()
+        source_date_status = self.source_date_status[s0:s1].copy()
+        for row in np.flatnonzero(self.source_raw_date[s0:s1] >= 0).tolist():
+            ordinal = policy.parse(self.string(int(self.source_raw_date[s0 + row])))
+            if ordinal > 0:
+                source_date[row] = ordinal - _EPOCH_ORDINAL
+                source_date_status[row] = DATE_OK
+        return source_date, source_date_status
+
+    def traceability_result(self, index: int) -> Dict[str, Any]:
+        """validate_traceability's result for one document, from the arrays."""
+        if self.doc_flags[index] & IRREGULAR_TRACEABILITY:
+            return validate_traceability(self.document(index))
+
+        answer_claim = self.string(int(self.doc_answer_claim[index]))
+        if not answer_claim:
+            return _create_error_result("No answer_claim in traceability_data")
+        summary_first = int(self.doc_summary_first[index])
+        if summary_first == NO_STRING:
+            return _create_error_result("No executive_summary in output")
+        expected_text = _expected_text(self.string(summary_first))
+        metadata_source = {"meta": {"run_metadata": {"prompt_version": self.string(int(self.doc_prompt_version[index]))}}}
+
+        rows = self.support_finding[self.support_offsets[index]:self.support_offsets[index + 1]].tolist()
+        if not rows:
+            support = {
+                "answer_claim": answer_claim,
+                "finding_ids": [],
+                "supporting_findings": None,
+                "source_ids": [],
+                "aggregate_confidence": "None",
+                "meets_policy": False,
+                "policy_levels": _policy_levels(None),
+                "missing_sources": [],
+                "status": "SPECULATIVE"
+            }
+            return _build_result(metadata_source, support, expected_text, None, None)
+
+        supporting_finding_ids = json.loads(self.string(int(self.doc_support_ids[index])))
+        if -1 in rows:
+            missing_ids = [finding_id for finding_id, row in zip(supporting_finding_ids, rows) if row < 0]
+            return _create_error_result(f"Referenced finding IDs not found in findings: {missing_ids}")
+
+        string = self.string
+        supporting_findings = []
+        all_source_ids = []
+        missing_source_set = set()
+        for row, code in zip(rows, self.finding_confidence[rows].tolist()):
+            e0, e1 = self.edge_offsets[row], self.edge_offsets[row + 1]
+            source_ids = [string(i) for i in self.edge_source_id[e0:e1].tolist()]
+            for source_id, source_row in zip(source_ids, self.edge_source[e0:e1].tolist()):
+                if source_row < 0:
+                    missing_source_set.add(source_id)
+            supporting_findings.append({
+                "id": self._finding_id(int(self.finding_id[row])),
+                "text": string(int(self.finding_text[row])),
+                "confidence": _CONFIDENCE_LETTERS[code],
+                "source_ids": source_ids
+            })
+            all_source_ids.extend(source_ids)
+
+        unique_source_ids = list(set(all_source_ids))
+        aggregate_confidence = _compute_aggregate_confidence([f['confidence'] for f in supporting_findings])
+        meets_policy = aggregate_confidence in ['H', 'M']
+        missing_sources = [sid for sid in unique_source_ids if sid in missing_source_set]
+        if missing_sources:
+            status = "ERROR"
+        elif meets_policy:
+            status = "VERIFIED"
+        else:
+            status = "SPECULATIVE"
+
+        support = {
+            "answer_claim": answer_claim,
+            "finding_ids": supporting_finding_ids,
+            "supporting_findings": supporting_findings,
+            "source_ids": unique_source_ids,
+            "aggregate_confidence": aggregate_confidence,
+            "meets_policy": meets_policy,
+            "policy_levels": _policy_levels(None),
+            "missing_sources": missing_sources,
+            "status": status
+        }
+        return _build_result(
+            metadata_source,
+            support,
+            expected_text,
+            _calculate_similarity(answer_claim, expected_text),
+            _support_breakdown(supporting_findings)
+        )
+
+
+def validate_research_quality_batch(
+    archive: OutputArchive,
+    total_dimensions: Union[int, Sequence[int]],
+    freshness_applicable: bool = True,
+    freshness_policy: Optional[FreshnessPolicy] = None,
+    start: int = 0,
+    stop: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    validate_research_quality for archive documents [start, stop).
+
+    All documents share one freshness reference time, frozen at the call.
+    """
+    stop = len(archive) if stop is None else stop
+    policy = (freshness_policy or DEFAULT_POLICY).frozen()
+    results = archive.quality_columns(total_dimensions, freshness_applicable, policy, start, stop).to_results()
+
+    irregular = np.flatnonzero(archive.doc_flags[start:stop] & IRREGULAR_QUALITY).tolist()
+    for position in irregular:
+        dimensions = total_dimensions if isinstance(total_dimensions, (int, np.integer)) else total_dimensions[position]
+        results[position] = validate_research_quality(
+            archive.document(start + position), int(dimensions), freshness_applicable, freshness_policy=policy
+        )
+    return results
+
+
+def validate_traceability_batch(
+    archive: OutputArchive,
+    start: int = 0,
+    stop: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """validate_traceability for archive documents [start, stop)."""
+    stop = len(archive) if stop is None else stop
+    return [archive.traceability_result(index) for index in range(start, stop)]
+
+
+def validate_archive(
+    path: str,
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    workers: Optional[int] = None,
+    documents_per_task: int = 512,
+    freshness_policy: Optional[FreshnessPolicy] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validates every document of an archive, in order, across worker processes.
+
+    Workers map the archive themselves (one map per process, shared through
+    the page cache); only document ranges and results cross process
+    boundaries.
+
+    Yields:
+        Dictionary per document containing index, traceability and quality
+    """
+    policy = (freshness_policy or DEFAULT_POLICY).frozen()
+    archive = _open_archive(path)
+    tasks = [
+        (path, start, min(start + documents_per_task, len(archive)), total_dimensions, freshness_applicable, policy)
+        for start in range(0, len(archive), documents_per_task)
+    ]
+
+    if workers is not None and workers <= 1:
+        for task in tasks:
+            yield from _archive_task(task)
+        return
+
+    with Pool(processes=workers) as pool:
+        for results in pool.imap(_archive_task, tasks):
+            yield from results
+
+
+# Archives mapped by this process, by path
+_OPEN_ARCHIVES: Dict[str, OutputArchive] = {}
+
+
+def _open_archive(path: str) -> OutputArchive:
+    archive = _OPEN_ARCHIVES.get(path)
+    if archive is None:
+        archive = _OPEN_ARCHIVES[path] = OutputArchive(path)
+    return archive
+
+
+def _archive_task(task: Tuple[str, int, int, int, bool, FreshnessPolicy]) -> List[Dict[str, Any]]:
+    """Worker entry point - validates one document range of a mapped archive."""
+    path, start, stop, total_dimensions, freshness_applicable, policy = task
+    archive = _open_archive(path)
+    quality = validate_research_quality_batch(archive, total_dimensions, freshness_applicable, policy, start, stop)
+    traceability = validate_traceability_batch(archive, start, stop)
+    return [
+        {"index": start + offset, "traceability": traceability_result, "quality": quality_result}
+        for offset, (traceability_result, quality_result) in enumerate(zip(traceability, quality))
+    ]
+
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from combined_validator import validate_all
+    from synthetic_outputs import generate_corpus
+
+    corpus = (
+        generate_corpus('tier1_deep_dive', count=1000, seed=1)
+        + generate_corpus('tier2_standard_report', count=1000, seed=2)
+        + generate_corpus('tier3_fast_summary', count=1000, seed=3)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'corpus.jsonl')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            for output in corpus:
+                f.write(json.dumps(output) + '\n')
+        archive_path = os.path.join(tmp, 'corpus.gemarc')
+
+        start_time = time.perf_counter()
+        summary = build_archive(corpus, archive_path)
+        build_time = time.perf_counter() - start_time
+
+        policy = DEFAULT_POLICY.frozen()
+        start_time = time.perf_counter()
+        with open(json_path, encoding='utf-8') as f:
+            expected = [validate_all(json.loads(line), 10, freshness_policy=policy) for line in f]
+        json_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        items = list(validate_archive(archive_path, 10, workers=0, freshness_policy=policy))
+        archive_time = time.perf_counter() - start_time
+
+        def strip(result: Dict[str, Any]) -> Dict[str, Any]:
+            return {**result, "validation_metadata": None}
+
+        mismatches = sum(
+            1 for item, reference in zip(items, expected)
+            if strip(item['quality']) != strip(reference['quality'])
+            or strip(item['traceability']) != strip(reference['traceability'])
+        )
+
+        print("Memory-Mapped Output Archive:")
+        print(f"Built {summary['documents']} documents ({summary['irregular']} irregular) in {build_time:.2f}s: "
+              f"{summary['file_bytes'] / 1024:.0f} KiB vs {os.path.getsize(json_path) / 1024:.0f} KiB JSONL")
+        print(f"Parse + validate JSONL: {json_time:.2f}s, validate archive: {archive_time:.2f}s")
+        print(f"Result mismatches: {mismatches}")
+        _OPEN_ARCHIVES.pop(archive_path).close()
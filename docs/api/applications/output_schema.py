@@ -0,0 +1,519 @@
+"""
+Structural Schema Validation for Gemini Research Prompt v4.8.1
+
+The validators assume well-formed input and fail late: a supporting finding
+without 'text' raises KeyError while support_breakdown is built, a source
+that is not an object breaks _compute_freshness, and a non-object meta raises
+TypeError - all after the scoring work has been done. check_output walks a
+document once against the OUTPUT schema of v4.8.1_api_prompt.md and reports
+every problem at once, before any scoring.
+
+OUTPUT_SCHEMA is a small JSON-Schema subset (type, properties, required,
+items, additionalProperties, enum, minItems, minProperties) plus a 'repair'
+keyword. It is compiled twice at import:
+
+- compile_predicate generates straight-line Python for a True/False check
+  that stops at the first problem; valid documents - nearly all of them -
+  only ever take this path
+- compile_schema builds nested closures that collect every problem with its
+  path, and run only when the predicate fails
+
+With repair=True, problems with a safe fix are repaired instead of rejecting
+the document:
+
+- 'drop' on array items / object values: remove the malformed finding,
+  source or disagreement
+- 'drop' on a property: remove it (e.g. a non-string source date, which then
+  counts as missing)
+- 'coerce' on strings: numbers become strings (source_ids: [1, 2] → ["1", "2"])
+- any other value: replace a missing or malformed value with a copy of it
+
+Repairs never modify the input: containers along repaired paths are copied.
+A document is valid when no unrepaired problem remains.
+
+Usage:
+    from output_schema import check_output, filter_outputs
+
+    report = check_output(gemini_output)
+    if not report.valid:
+        for problem in report.problems:
+            print(problem.path, problem.message)
+
+    report = check_output(gemini_output, repair=True)
+    validate_research_quality(report.document, total_dimensions=10)
+
+    rejected = []
+    for output in filter_outputs(stream, repair=True, rejected=rejected):
+        ...  # only structurally valid (possibly repaired) documents get here
+"""
+
+import copy
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+CONFIDENCE_ENUM = ["H", "M", "L"]
+
+FINDING_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "repair": "drop",
+    "required": ["id", "text", "source_ids", "confidence"],
+    "properties": {
+        "id": {"type": ["integer", "string"]},
+        "text": {"type": "string"},
+        "source_ids": {"type": "array", "repair": [], "items": {"type": "string", "repair": "coerce"}},
+        "confidence": {"enum": CONFIDENCE_ENUM},
+    },
+}
+
+SOURCE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "repair": "drop",
+    "properties": {
+        "publisher": {"type": "string", "repair": "drop"},
+        "publisher_type": {"type": "string", "repair": "drop"},
+        "is_primary": {"type": "boolean", "repair": "drop"},
+        "independent": {"type": "boolean", "repair": "drop"},
+        "title": {"type": "string", "repair": "drop"},
+        "date": {"type": "string", "repair": "drop"},
+        "url": {"type": "string", "repair": "drop"},
+        "modality": {"type": "string", "repair": "drop"},
+    },
+}
+
+DISAGREEMENT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "repair": "drop",
+    "required": ["final_stance"],
+    "properties": {
+        "claim": {"type": "string"},
+        "sources_for": {"type": "array", "repair": [], "items": {"type": "string", "repair": "coerce"}},
+        "sources_against": {"type": "array", "repair": [], "items": {"type": "string", "repair": "coerce"}},
+        "final_stance": {"enum": ["for", "against", "uncertain"]},
+        "confidence": {"enum": CONFIDENCE_ENUM, "repair": "drop"},
+    },
+}
+
+OUTPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["executive_summary", "key_findings", "sources", "meta"],
+    "properties": {
+        "executive_summary": {"type": "array", "minItems": 1, "items": {"type": "string"}},
+        "key_findings": {"type": "array", "minItems": 1, "items": FINDING_SCHEMA},
+        "patterns": {"type": "array", "repair": "drop"},
+        "sources": {"type": "object", "minProperties": 1, "additionalProperties": SOURCE_SCHEMA},
+        "meta": {
+            "type": "object",
+            "required": ["traceability_data"],
+            "properties": {
+                "disagreements": {"type": "array", "repair": [], "items": DISAGREEMENT_SCHEMA},
+                "traceability_data": {
+                    "type": "object",
+                    "required": ["answer_claim", "supporting_finding_ids"],
+                    "properties": {
+                        "answer_claim": {"type": "string"},
+                        "supporting_finding_ids": {"type": "array", "items": {"type": ["integer", "string"]}},
+                    },
+                },
+                "run_metadata": {
+                    "type": "object",
+                    "repair": "drop",
+                    "properties": {
+                        "prompt_version": {"type": "string", "repair": "coerce"},
+                        "correlation_id": {"type": "string", "repair": "coerce"},
+                        "preset_used": {"type": "string", "repair": "drop"},
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+class Problem(NamedTuple):
+    """One schema violation: JSON path ('key_findings[3].text'), message, and whether it was repaired."""
+    path: str
+    message: str
+    repaired: bool = False
+
+
+class SchemaReport(NamedTuple):
+    """Result of check_output; document is the (possibly repaired) input."""
+    valid: bool
+    problems: List[Problem]
+    document: Any
+
+
+# Returned by compiled checks for values that failed and were not repaired
+_INVALID = object()
+# Returned for properties repaired by removal
+_DROP = object()
+_MISSING = object()
+
+_TYPE_NAMES = {dict: 'object', list: 'array', str: 'string', int: 'integer', float: 'number', bool: 'boolean'}
+_TYPES = {'object': (dict,), 'array': (list,), 'string': (str,), 'integer': (int,), 'number': (int, float), 'boolean': (bool,)}
+
+# Path of a value: None for the root, else (parent path, key or index)
+Path = Optional[Tuple[Any, Any]]
+Check = Callable[[Any, Path, List[Problem], bool], Any]
+
+
+def render_path(path: Path) -> str:
+    """'key_findings[3].text' form of a linked path."""
+    parts = []
+    while path is not None:
+        path, key = path
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return ''.join(reversed(parts)).lstrip('.') or '$'
+
+
+def _type_name(value: Any) -> str:
+    return 'null' if value is None else _TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def compile_schema(spec: Dict[str, Any]) -> Check:
+    """
+    Compiles a schema node into check(value, path, problems, repair).
+
+    The check returns the value (a repaired copy where needed), _DROP when
+    the value should be removed, or _INVALID after recording the problem.
+    """
+    types: Optional[tuple] = None
+    if "type" in spec:
+        names = spec["type"] if isinstance(spec["type"], list) else [spec["type"]]
+        types = tuple(t for name in names for t in _TYPES[name])
+        expected = ' or '.join(names)
+    exclude_bool = types is not None and bool not in types and int in types
+    enum = frozenset(spec["enum"]) if "enum" in spec else None
+    enum_text = '|'.join(spec.get("enum", ()))
+    repair_action = spec.get("repair")
+    coerce = repair_action == "coerce"
+
+    def fail(value: Any, path: Path, problems: List[Problem], repair: bool, message: str) -> Any:
+        if repair and repair_action is not None:
+            if coerce:
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    problems.append(Problem(render_path(path), message + " (converted to string)", True))
+                    return str(value)
+            elif repair_action == "drop":
+                problems.append(Problem(render_path(path), message + " (removed)", True))
+                return _DROP
+            else:
+                problems.append(Problem(render_path(path), message + f" (replaced with {repair_action!r})", True))
+                return copy.deepcopy(repair_action)
+        problems.append(Problem(render_path(path), message))
+        return _INVALID
+
+    def check_scalar(value: Any, path: Path, problems: List[Problem], repair: bool) -> Any:
+        if types is not None and (not isinstance(value, types) or (exclude_bool and isinstance(value, bool))):
+            return fail(value, path, problems, repair, f"expected {expected}, got {_type_name(value)}")
+        if enum is not None and (not isinstance(value, str) or value not in enum):
+            return fail(value, path, problems, repair, f"expected one of {enum_text}, got {value!r}")
+        return value
+
+    kind = spec.get("type")
+    if kind == "object":
+        return _compile_object(spec, check_scalar)
+    if kind == "array":
+        return _compile_array(spec, check_scalar)
+    # Exact types (and enum) of the common, valid case, so containers can
+    # skip the call; anything else, subclasses included, goes through it
+    check_scalar.exact = frozenset(types) if types is not None else frozenset(map(type, enum or ()))
+    check_scalar.enum = enum
+    return check_scalar
+
+
+def _compile_array(spec: Dict[str, Any], check_type: Check) -> Check:
+    item_check = compile_schema(spec["items"]) if "items" in spec else None
+    item_exact = getattr(item_check, 'exact', None) if getattr(item_check, 'enum', None) is None else None
+    item_drops = spec.get("items", {}).get("repair") == "drop"
+    min_items = spec.get("minItems", 0)
+
+    def check_array(value: Any, path: Path, problems: List[Problem], repair: bool) -> Any:
+        if type(value) is not list:
+            checked = check_type(value, path, problems, repair)
+            if checked is not value:
+                return checked
+        result = value
+        invalid = False
+        if item_exact is not None and item_exact.issuperset(map(type, value)):
+            pass
+        elif item_check is not None:
+            for index, item in enumerate(value):
+                start = len(problems)
+                checked_item = item_check(item, (path, index), problems, repair)
+                if checked_item is item:
+                    if result is not value:
+                        result.append(item)
+                    continue
+                if checked_item is _INVALID and not (repair and item_drops):
+                    invalid = True
+                    continue
+                if result is value:
+                    result = value[:index]
+                if checked_item is _INVALID or checked_item is _DROP:
+                    # The whole item goes; its problems count as repaired
+                    problems[start:] = [p._replace(repaired=True) for p in problems[start:]]
+                    if checked_item is _INVALID:
+                        problems.append(Problem(render_path((path, index)), "malformed item (removed)", True))
+                else:
+                    result.append(checked_item)
+        if len(result) < min_items:
+            problems.append(Problem(render_path(path), f"expected at least {min_items} item(s), got {len(result)}"))
+            return _INVALID
+        return _INVALID if invalid else result
+
+    return check_array
+
+
+def _compile_object(spec: Dict[str, Any], check_type: Check) -> Check:
+    properties = []
+    for name, child in spec.get("properties", {}).items():
+        check = compile_schema(child)
+        properties.append((name, check, getattr(check, 'exact', None), getattr(check, 'enum', None)))
+    known = frozenset(spec.get("properties", {}))
+    required = frozenset(spec.get("required", ()))
+    missing_repairs = {
+        name: child["repair"] for name, child in spec.get("properties", {}).items()
+        if name in required and child.get("repair") not in (None, "drop", "coerce")
+    }
+    additional = compile_schema(spec["additionalProperties"]) if "additionalProperties" in spec else None
+    additional_drops = spec.get("additionalProperties", {}).get("repair") == "drop"
+    min_properties = spec.get("minProperties", 0)
+
+    def check_object(value: Any, path: Path, problems: List[Problem], repair: bool) -> Any:
+        if type(value) is not dict:
+            checked = check_type(value, path, problems, repair)
+            if checked is not value:
+                return checked
+        result = value
+        invalid = False
+
+        for name, check, exact, enum in properties:
+            child = value.get(name, _MISSING)
+            if child is _MISSING:
+                if name not in required:
+                    continue
+                if repair and name in missing_repairs:
+                    problems.append(Problem(render_path((path, name)), "missing required field (added)", True))
+                    if result is value:
+                        result = dict(value)
+                    result[name] = copy.deepcopy(missing_repairs[name])
+                else:
+                    problems.append(Problem(render_path((path, name)), "missing required field"))
+                    invalid = True
+                continue
+            if exact is not None and type(child) in exact and (enum is None or child in enum):
+                continue
+            checked = check(child, (path, name), problems, repair)
+            if checked is child:
+                continue
+            if checked is _INVALID:
+                invalid = True
+                continue
+            if result is value:
+                result = dict(value)
+            if checked is _DROP:
+                del result[name]
+            else:
+                result[name] = checked
+
+        if additional is not None:
+            for key, child in value.items():
+                if key in known:
+                    continue
+                start = len(problems)
+                checked = additional(child, (path, key), problems, repair)
+                if checked is child:
+                    continue
+                if checked is _INVALID and not (repair and additional_drops):
+                    invalid = True
+                    continue
+                if result is value:
+                    result = dict(value)
+                if checked is _INVALID or checked is _DROP:
+                    problems[start:] = [p._replace(repaired=True) for p in problems[start:]]
+                    if checked is _INVALID:
+                        problems.append(Problem(render_path((path, key)), "malformed value (removed)", True))
+                    del result[key]
+                else:
+                    result[key] = checked
+
+        if len(result) < min_properties:
+            problems.append(Problem(render_path(path), f"expected at least {min_properties} entr(y/ies), got {len(result)}"))
+            return _INVALID
+        return _INVALID if invalid else result
+
+    return check_object
+
+
+def compile_predicate(spec: Dict[str, Any]) -> Callable[[Any], bool]:
+    """
+    Generates and compiles a straight-line predicate for a schema: True when
+    the value satisfies it as-is, False at the first problem.
+
+    This is the fast path for the common, valid case. It tests exact types
+    (type(v) in {...}), so it is stricter than the full check - a subclass
+    or a repairable problem only means falling back to the full check.
+    """
+    constants: Dict[str, Any] = {'_MISSING': _MISSING}
+    lines = ["def predicate(v0):"]
+    counter = [0]
+
+    def constant(value: Any) -> str:
+        name = f"K{len(constants)}"
+        constants[name] = value
+        return name
+
+    def emit(node: Dict[str, Any], var: str, indent: str) -> None:
+        types = None
+        if "type" in node:
+            names = node["type"] if isinstance(node["type"], list) else [node["type"]]
+            types = frozenset(t for name in names for t in _TYPES[name])
+        elif "enum" in node:
+            types = frozenset(map(type, node["enum"]))
+        if types is not None:
+            if len(types) == 1:
+                lines.append(f"{indent}if type({var}) is not {constant(next(iter(types)))}: return False")
+            else:
+                lines.append(f"{indent}if type({var}) not in {constant(types)}: return False")
+        if "enum" in node:
+            lines.append(f"{indent}if {var} not in {constant(frozenset(node['enum']))}: return False")
+
+        if node.get("type") == "object":
+            required = set(node.get("required", ()))
+            properties = node.get("properties", {})
+            for name, child in properties.items():
+                counter[0] += 1
+                child_var = f"v{counter[0]}"
+                lines.append(f"{indent}{child_var} = {var}.get({name!r}, _MISSING)")
+                if name in required:
+                    lines.append(f"{indent}if {child_var} is _MISSING: return False")
+                    emit(child, child_var, indent)
+                else:
+                    lines.append(f"{indent}if {child_var} is not _MISSING:")
+                    start = len(lines)
+                    emit(child, child_var, indent + "    ")
+                    if len(lines) == start:
+                        lines.append(f"{indent}    pass")
+            if "minProperties" in node:
+                lines.append(f"{indent}if len({var}) < {int(node['minProperties'])}: return False")
+            if "additionalProperties" in node:
+                counter[0] += 1
+                key_var, child_var = f"k{counter[0]}", f"v{counter[0]}"
+                lines.append(f"{indent}for {key_var}, {child_var} in {var}.items():")
+                if properties:
+                    lines.append(f"{indent}    if {key_var} in {constant(frozenset(properties))}: continue")
+                emit(node["additionalProperties"], child_var, indent + "    ")
+
+        elif node.get("type") == "array":
+            if "minItems" in node:
+                lines.append(f"{indent}if len({var}) < {int(node['minItems'])}: return False")
+            items = node.get("items")
+            if items is None:
+                return
+            scalar = items.get("type") not in ("object", "array") and "enum" not in items and "type" in items
+            if scalar:
+                names = items["type"] if isinstance(items["type"], list) else [items["type"]]
+                item_types = frozenset(t for name in names for t in _TYPES[name])
+                lines.append(f"{indent}if not {constant(item_types)}.issuperset(map(type, {var})): return False")
+            else:
+                counter[0] += 1
+                child_var = f"v{counter[0]}"
+                lines.append(f"{indent}for {child_var} in {var}:")
+                emit(items, child_var, indent + "    ")
+
+    emit(spec, "v0", "    ")
+    lines.append("    return True")
+    namespace = dict(constants)
+    exec(compile('\n'.join(lines), '<output_schema predicate>', 'exec'), namespace)
+    return namespace['predicate']
+
+
+_CHECK_OUTPUT = compile_schema(OUTPUT_SCHEMA)
+_IS_VALID = compile_predicate(OUTPUT_SCHEMA)
+
+
+def check_output(gemini_output: Any, repair: bool = False) -> SchemaReport:
+    """
+    Checks one document against OUTPUT_SCHEMA in a single pass.
+
+    Args:
+        gemini_output: Decoded Gemini output
+        repair: Repair fixable problems instead of rejecting them
+
+    Returns:
+        SchemaReport(valid, problems, document): document is the repaired
+        copy (or the input itself when nothing was repaired)
+    """
+    if _IS_VALID(gemini_output):
+        return SchemaReport(True, [], gemini_output)
+    problems: List[Problem] = []
+    checked = _CHECK_OUTPUT(gemini_output, None, problems, repair)
+    valid = checked is not _INVALID and checked is not _DROP
+    return SchemaReport(valid, problems, checked if valid else gemini_output)
+
+
+def check_outputs(outputs: Iterable[Any], repair: bool = False) -> List[SchemaReport]:
+    """check_output for each output."""
+    return [check_output(gemini_output, repair) for gemini_output in outputs]
+
+
+def filter_outputs(
+    outputs: Iterable[Any],
+    repair: bool = False,
+    rejected: Optional[List[Tuple[int, SchemaReport]]] = None
+) -> Iterator[Any]:
+    """
+    Yields only structurally valid (possibly repaired) documents.
+
+    Rejected documents are appended to rejected as (position, report) when a
+    list is given.
+    """
+    for position, gemini_output in enumerate(outputs):
+        report = check_output(gemini_output, repair)
+        if report.valid:
+            yield report.document
+        elif rejected is not None:
+            rejected.append((position, report))
+
+
+def summarize_problems(problems: Iterable[Problem], limit: int = 5) -> str:
+    """One-line description of the unrepaired problems (first limit of them)."""
+    unrepaired = [p for p in problems if not p.repaired]
+    text = '; '.join(f"{p.path}: {p.message}" for p in unrepaired[:limit])
+    if len(unrepaired) > limit:
+        text += f"; ... {len(unrepaired) - limit} more"
+    return text
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    from synthetic_outputs import generate_corpus
+
+    from combined_validator import validate_all
+
+    broken = generate_corpus('tier2_standard_report', count=1, seed=1)[0]
+    broken['key_findings'][0] = dict(broken['key_findings'][0], confidence='X')
+    del broken['key_findings'][1]['text']
+    broken['key_findings'][2]['source_ids'] = [1, 2]
+    broken['sources']['1'] = "Anthropic docs"
+    broken['meta']['run_metadata'] = None
+
+    for repair in (False, True):
+        report = check_output(broken, repair=repair)
+        print(f"repair={repair}: valid={report.valid}")
+        for problem in report.problems:
+            print(f"  {'repaired' if problem.repaired else 'ERROR   '} {problem.path}: {problem.message}")
+
+    corpus = generate_corpus('tier1_deep_dive', count=500, seed=2)
+    start = time.perf_counter()
+    passed = list(filter_outputs(corpus))
+    checked = time.perf_counter() - start
+    start = time.perf_counter()
+    for gemini_output in passed:
+        validate_all(gemini_output, total_dimensions=10)
+    validated = time.perf_counter() - start
+    print(f"{len(passed)}/{len(corpus)} tier1 outputs valid; schema check {checked * 1e3:.0f} ms, "
+          f"validation {validated * 1e3:.0f} ms")
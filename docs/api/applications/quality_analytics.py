@@ -0,0 +1,457 @@
+"""
+Streaming Quality Analytics for Gemini Research Prompt v4.8.1
+
+Corpus-level distributions of the quality criteria and traceability statuses
+without storing every result. Results are folded into fixed-size summaries as
+they are produced:
+
+- ScoreSummary: count, mean, variance, min, max (Welford) plus a histogram
+  over the 0-10 score range at 0.1 resolution - scores are reported rounded
+  to 0.1, so quantiles from the histogram are exact
+- Aggregate: ScoreSummary per criterion (coverage, evidence, freshness,
+  contradictions, average) and counts per threshold, traceability status and
+  aggregate confidence; results whose quality validation errored are
+  counted but not scored (result_row leaves their scores null), while
+  traceability-only errors keep their quality scores
+- QualityAnalytics: one running Aggregate per group (prompt_version,
+  preset_used by default) plus a sliding window of per-bucket Aggregates
+  (e.g. 60 one-minute buckets) keyed by the result's validated_at
+
+Every summary merges exactly (merge(), or to_dict() / from_dict() for JSON
+snapshots), so worker processes and shards can aggregate independently and a
+dashboard merges their snapshots. Memory is fixed per group: the histograms
+and at most window_buckets buckets.
+
+Usage:
+    from quality_analytics import QualityAnalytics
+
+    analytics = QualityAnalytics(bucket_seconds=60, window_buckets=60)
+    for record in validate_records(outputs, total_dimensions=10):
+        analytics.add_record(record)          # {"traceability", "quality", "run_metadata"}
+
+    analytics.summary()                      # per group: counts, means, p50/p90/p99, rates
+    analytics.summary(window_seconds=900)    # last 15 minutes only
+
+    fleet = QualityAnalytics.merged(QualityAnalytics.load(path) for path in snapshot_paths)
+
+    python quality_analytics.py shard0.json shard1.json   # merge and print snapshots
+"""
+
+import json
+import math
+import os
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+
+from result_store import SCORE_COLUMNS, result_row
+
+
+DEFAULT_GROUP_BY = ('prompt_version', 'preset_used')
+QUANTILES = (50, 90, 99)
+
+SNAPSHOT_VERSION = 1
+
+
+class ScoreSummary:
+    """
+    Running moments and a fixed-resolution histogram of one score.
+
+    Args:
+        low / high: Score range; values outside are clamped into the end bins
+        resolution: Bin width (0.1 matches the rounding of reported scores)
+    """
+
+    __slots__ = ('low', 'high', 'resolution', 'count', 'mean', 'm2', 'minimum', 'maximum', 'bins')
+
+    def __init__(self, low: float = 0.0, high: float = 10.0, resolution: float = 0.1):
+        self.low = low
+        self.high = high
+        self.resolution = resolution
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.bins = [0] * (int(round((high - low) / resolution)) + 1)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        index = int(round((value - self.low) / self.resolution))
+        self.bins[min(max(index, 0), len(self.bins) - 1)] += 1
+
+    def merge(self, other: 'ScoreSummary') -> 'ScoreSummary':
+        """Folds other into this summary (Chan et al. parallel moments)."""
+        if (other.low, other.high, other.resolution) != (self.low, self.high, self.resolution):
+            raise ValueError("cannot merge score summaries with different ranges or resolutions")
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.bins = [a + b for a, b in zip(self.bins, other.bins)]
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance."""
+        return self.m2 / self.count if self.count else 0.0
+
+    def quantile(self, percentile: float) -> Optional[float]:
+        """Nearest-rank percentile (0-100) at bin resolution; None when empty."""
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for index, bin_count in enumerate(self.bins):
+            seen += bin_count
+            if seen >= rank:
+                return round(self.low + index * self.resolution, 6)
+        return self.high
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        result = {
+            "count": self.count,
+            "mean": round(self.mean, 4),
+            "stdev": round(math.sqrt(self.variance), 4),
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+        for percentile in QUANTILES:
+            result[f"p{percentile}"] = self.quantile(percentile)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "low": self.low, "high": self.high, "resolution": self.resolution,
+            "count": self.count, "mean": self.mean, "m2": self.m2,
+            "min": self.minimum if self.count else None,
+            "max": self.maximum if self.count else None,
+            # Sparse bins - most of the 101 are empty for any one criterion
+            "bins": {str(i): n for i, n in enumerate(self.bins) if n},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoreSummary':
+        summary = cls(data["low"], data["high"], data["resolution"])
+        summary.count = data["count"]
+        summary.mean = data["mean"]
+        summary.m2 = data["m2"]
+        if summary.count:
+            summary.minimum = data["min"]
+            summary.maximum = data["max"]
+        for index, bin_count in data["bins"].items():
+            summary.bins[int(index)] = bin_count
+        return summary
+
+
+class Aggregate:
+    """Criterion score summaries and category counts over a set of results."""
+
+    __slots__ = ('count', 'errors', 'scores', 'thresholds', 'statuses', 'confidences')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.scores = {name: ScoreSummary() for name in SCORE_COLUMNS}
+        self.thresholds: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.confidences: Counter = Counter()
+
+    def add_row(self, row: Dict[str, Any]) -> None:
+        """Adds one result in result_store.result_row form."""
+        self.count += 1
+        if row.get('threshold') is not None:
+            self.thresholds[row['threshold']] += 1
+        if row.get('status') is not None:
+            self.statuses[row['status']] += 1
+        if row.get('aggregate_confidence') is not None:
+            self.confidences[row['aggregate_confidence']] += 1
+        if row.get('error') is not None:
+            self.errors += 1
+        for name, summary in self.scores.items():
+            value = row.get(name)
+            if value is not None:
+                summary.add(value)
+
+    def merge(self, other: 'Aggregate') -> 'Aggregate':
+        self.count += other.count
+        self.errors += other.errors
+        for name, summary in self.scores.items():
+            summary.merge(other.scores[name])
+        self.thresholds.update(other.thresholds)
+        self.statuses.update(other.statuses)
+        self.confidences.update(other.confidences)
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts, per-criterion statistics and category rates."""
+        def rates(counter: Counter) -> Dict[str, float]:
+            return {name: round(n / self.count, 4) for name, n in sorted(counter.items())} if self.count else {}
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "scores": {name: summary.summary() for name, summary in self.scores.items()},
+            "threshold_counts": dict(self.thresholds),
+            "threshold_rates": rates(self.thresholds),
+            "status_counts": dict(self.statuses),
+            "status_rates": rates(self.statuses),
+            "aggregate_confidence_counts": dict(self.confidences),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "scores": {name: summary.to_dict() for name, summary in self.scores.items()},
+            "thresholds": dict(self.thresholds),
+            "statuses": dict(self.statuses),
+            "confidences": dict(self.confidences),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Aggregate':
+        aggregate = cls()
+        aggregate.count = data["count"]
+        aggregate.errors = data["errors"]
+        for name, summary in data["scores"].items():
+            aggregate.scores[name] = ScoreSummary.from_dict(summary)
+        aggregate.thresholds.update(data["thresholds"])
+        aggregate.statuses.update(data["statuses"])
+        aggregate.confidences.update(data["confidences"])
+        return aggregate
+
+
+class QualityAnalytics:
+    """
+    Grouped running and sliding-window aggregates of validation results.
+
+    Args:
+        group_by: run_metadata fields to group by (missing values group as 'unknown')
+        bucket_seconds: Width of one sliding-window bucket
+        window_buckets: Buckets kept per group (window length = product of both;
+                        0 disables the sliding window)
+    """
+
+    def __init__(
+        self,
+        group_by: Tuple[str, ...] = DEFAULT_GROUP_BY,
+        bucket_seconds: int = 60,
+        window_buckets: int = 60
+    ):
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be > 0")
+        self.group_by = tuple(group_by)
+        self.bucket_seconds = bucket_seconds
+        self.window_buckets = window_buckets
+        self.totals: Dict[Tuple[str, ...], Aggregate] = {}
+        self.buckets: Dict[Tuple[str, ...], Dict[int, Aggregate]] = {}
+        # Newest bucket seen; the window ends here, not at the wall clock,
+        # so replayed or delayed results land in the right buckets
+        self.latest_bucket: Optional[int] = None
+
+    def add_record(self, record: Dict[str, Any], timestamp: Optional[float] = None) -> None:
+        """
+        Adds one validation record ({"traceability", "quality", "run_metadata"},
+        as written by gemini-validate or yielded by validate_records).
+
+        timestamp (epoch seconds) defaults to the quality result's validated_at.
+        """
+        self.add_row(result_row(record), timestamp)
+
+    def add(
+        self,
+        traceability: Dict[str, Any],
+        quality: Dict[str, Any],
+        run_metadata: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Adds one pair of validator results."""
+        self.add_row(result_row({"traceability": traceability, "quality": quality}, run_metadata or {}), timestamp)
+
+    def add_row(self, row: Dict[str, Any], timestamp: Optional[float] = None) -> None:
+        """Adds one result in result_store.result_row form."""
+        key = tuple(row.get(field) or 'unknown' for field in self.group_by)
+        total = self.totals.get(key)
+        if total is None:
+            total = self.totals[key] = Aggregate()
+            self.buckets[key] = {}
+        total.add_row(row)
+
+        if not self.window_buckets:
+            return
+        if timestamp is None:
+            validated_at = row.get('validated_at')
+            timestamp = validated_at.timestamp() if isinstance(validated_at, datetime) else time.time()
+        bucket = int(timestamp // self.bucket_seconds)
+        if self.latest_bucket is None or bucket > self.latest_bucket:
+            self.latest_bucket = bucket
+            self._evict()
+        if bucket <= self.latest_bucket - self.window_buckets:
+            return  # Older than the window
+        buckets = self.buckets[key]
+        aggregate = buckets.get(bucket)
+        if aggregate is None:
+            aggregate = buckets[bucket] = Aggregate()
+        aggregate.add_row(row)
+
+    def _evict(self) -> None:
+        oldest = self.latest_bucket - self.window_buckets
+        for buckets in self.buckets.values():
+            for bucket in [b for b in buckets if b <= oldest]:
+                del buckets[bucket]
+
+    def merge(self, other: 'QualityAnalytics') -> 'QualityAnalytics':
+        """Folds other (same group_by and bucket width) into this instance."""
+        if other.group_by != self.group_by or other.bucket_seconds != self.bucket_seconds:
+            raise ValueError("cannot merge analytics with different group_by or bucket_seconds")
+        for key, total in other.totals.items():
+            if key not in self.totals:
+                self.totals[key] = Aggregate()
+                self.buckets[key] = {}
+            self.totals[key].merge(total)
+            buckets = self.buckets[key]
+            for bucket, aggregate in other.buckets[key].items():
+                buckets.setdefault(bucket, Aggregate()).merge(aggregate)
+        if other.latest_bucket is not None and (self.latest_bucket is None or other.latest_bucket > self.latest_bucket):
+            self.latest_bucket = other.latest_bucket
+        if self.latest_bucket is not None:
+            self._evict()
+        return self
+
+    @classmethod
+    def merged(cls, parts: Iterable['QualityAnalytics']) -> 'QualityAnalytics':
+        """Merges several instances (e.g. one per worker or shard) into a new one."""
+        parts = list(parts)
+        if not parts:
+            return cls()
+        result = cls(parts[0].group_by, parts[0].bucket_seconds, parts[0].window_buckets)
+        for part in parts:
+            result.merge(part)
+        return result
+
+    def groups(self) -> List[Tuple[str, ...]]:
+        return sorted(self.totals)
+
+    def aggregate(
+        self,
+        group: Optional[Tuple[str, ...]] = None,
+        window_seconds: Optional[float] = None
+    ) -> Aggregate:
+        """
+        Merged Aggregate of one group (None = all groups), over everything or
+        only the last window_seconds (rounded up to whole buckets).
+
+        Raises:
+            ValueError: If window_seconds is given but no window is kept (window_buckets=0)
+        """
+        if window_seconds is not None and not self.window_buckets:
+            raise ValueError("window_seconds requires a sliding window (window_buckets is 0)")
+        keys = [group] if group is not None else list(self.totals)
+        result = Aggregate()
+        for key in keys:
+            if key not in self.totals:
+                continue
+            if window_seconds is None:
+                result.merge(self.totals[key])
+                continue
+            first = self.latest_bucket - math.ceil(window_seconds / self.bucket_seconds) + 1
+            for bucket, aggregate in self.buckets[key].items():
+                if bucket >= first:
+                    result.merge(aggregate)
+        return result
+
+    def summary(self, window_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Per-group summaries keyed by the group values joined with '/', plus 'all'."""
+        result = {'/'.join(key): self.aggregate(key, window_seconds).summary() for key in self.groups()}
+        result['all'] = self.aggregate(None, window_seconds).summary()
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot (see from_dict / merge)."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "group_by": list(self.group_by),
+            "bucket_seconds": self.bucket_seconds,
+            "window_buckets": self.window_buckets,
+            "latest_bucket": self.latest_bucket,
+            "groups": [
+                {
+                    "key": list(key),
+                    "total": self.totals[key].to_dict(),
+                    "buckets": {str(b): a.to_dict() for b, a in sorted(self.buckets[key].items())},
+                }
+                for key in self.groups()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QualityAnalytics':
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported analytics snapshot version: {data.get('version')}")
+        analytics = cls(tuple(data["group_by"]), data["bucket_seconds"], data["window_buckets"])
+        analytics.latest_bucket = data["latest_bucket"]
+        for group in data["groups"]:
+            key = tuple(group["key"])
+            analytics.totals[key] = Aggregate.from_dict(group["total"])
+            analytics.buckets[key] = {int(b): Aggregate.from_dict(a) for b, a in group["buckets"].items()}
+        return analytics
+
+    def save(self, path: str) -> None:
+        """Writes a snapshot atomically (a crash leaves the previous snapshot intact)."""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'QualityAnalytics':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        merged = QualityAnalytics.merged(QualityAnalytics.load(path) for path in sys.argv[1:])
+        print(json.dumps(merged.summary(), indent=2))
+        sys.exit(0)
+
+    from synthetic_outputs import generate_corpus, _TOPICS
+
+    from combined_validator import validate_all
+    from result_store import run_metadata_of
+
+    shards = []
+    start_time = time.time()
+    for shard, preset in enumerate(('tier2_standard_report', 'tier3_fast_summary', 'tier1_deep_dive')):
+        analytics = QualityAnalytics(bucket_seconds=60, window_buckets=30)
+        for i, output in enumerate(generate_corpus(preset, count=300, seed=shard)):
+            results = validate_all(output, total_dimensions=len(_TOPICS))
+            results["run_metadata"] = run_metadata_of(output)
+            # Spread the shard's results over the last hour
+            analytics.add_record(results, timestamp=start_time - 3600 + i * 12)
+        shards.append(QualityAnalytics.from_dict(json.loads(json.dumps(analytics.to_dict()))))
+
+    fleet = QualityAnalytics.merged(shards)
+    for name, summary in fleet.summary().items():
+        average = summary["scores"]["average"]
+        print(f"{name:40s} n={summary['count']:4d} average mean={average['mean']:.2f} "
+              f"p50={average['p50']} p90={average['p90']} thresholds={summary['threshold_rates']}")
+    window = fleet.aggregate(window_seconds=600).summary()
+    print(f"Last 10 minutes: n={window['count']} status rates={window['status_rates']}")
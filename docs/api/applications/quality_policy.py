@@ -0,0 +1,485 @@
+"""
+Declarative Quality Policies for Gemini Research Prompt v4.8.1
+
+The Production / Marginal / Insufficient cutoffs (_determine_threshold), the
+H/M confidence aggregation (_compute_aggregate_confidence) and the
+2-points-per-unresolved-conflict contradictions rule are if-chains in the
+validators. A policy spec states them as data, in the spirit of the
+chatgpt_v1.3.0_pack QUALITY_GATES_LIBRARY:
+
+    name: strict
+    thresholds:                      # checked in order, first match wins
+      - name: Production
+        min_average: 8.5
+        min_each: 7.5                # every applicable criterion (optional)
+        action: Approve for use in templates/documentation.
+        claudeworkflow_action: Add to Decision Log
+      - name: Marginal
+        min_average: 7.0
+      - name: Insufficient           # last entry: no conditions (fallback)
+    confidence:
+      order: [H, M, L]               # strongest first
+      aggregation: strongest         # or weakest
+      policy_levels: [H, M]          # aggregates that meet the policy
+    contradictions:
+      base: 10
+      points_per_unresolved: 2
+      floor: 0
+
+Specs are dicts, JSON files or YAML files (YAML needs PyYAML). Omitted
+sections fall back to DEFAULT_POLICY_SPEC, which reproduces the validators
+exactly. compile_policy turns a spec into a CompiledPolicy once:
+
+- thresholds: cutoff arrays checked with NumPy comparisons
+- confidence: a 16-entry table from the bitmask of levels present among the
+  supporting findings (H, M, L, other) to the aggregate; confidences outside
+  the order count as its weakest level, as the if-chain's else branch does
+- contradictions: a score table indexed by the unresolved-conflict count
+
+ScoredBatch holds the policy-independent inputs of a batch: criterion
+scores, unresolved conflicts, confidence bitmasks and traceability errors.
+evaluate_policies scores it once and applies any number of compiled policies
+as array operations, with no re-scoring.
+
+Requires NumPy for batches; CompiledPolicy's scalar methods do not.
+
+Usage:
+    from quality_policy import DEFAULT_POLICY_SPEC, ScoredBatch, compile_policy, evaluate_policies, load_policy
+
+    policies = [compile_policy(DEFAULT_POLICY_SPEC), load_policy('policies/strict.yaml')]
+    batch = ScoredBatch.from_outputs(gemini_outputs, total_dimensions=10)
+    results = evaluate_policies(batch, policies)
+    results['strict']['threshold']          # int8 codes into policies[1].categories
+
+    policy = compile_policy({'thresholds': [...]})
+    policy.determine_threshold(7.4)         # {'threshold': ..., 'action': ..., ...}
+
+    # Per document, the validators take the same compiled policy
+    validate_research_quality(gemini_output, 10, policy=policy)
+    validate_traceability(gemini_output, policy=policy)
+"""
+
+import json
+import math
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for batch evaluation
+    np = None
+
+try:
+    import yaml
+except ImportError:  # Optional - JSON specs work without it
+    yaml = None
+
+from quality_validator import _determine_threshold
+from traceability_validator import _resolve_support
+
+
+CONFIDENCE_LEVELS = ('H', 'M', 'L')
+OTHER_CONFIDENCE_BIT = 1 << len(CONFIDENCE_LEVELS)
+_CONFIDENCE_BITS = {level: 1 << i for i, level in enumerate(CONFIDENCE_LEVELS)}
+_MASKS = 1 << (len(CONFIDENCE_LEVELS) + 1)
+
+AGGREGATIONS = ('strongest', 'weakest')
+
+# Traceability status codes in evaluation results
+STATUS_NAMES = ('VERIFIED', 'SPECULATIVE', 'ERROR')
+
+
+def _threshold_entry(name: str, min_average: Optional[float]) -> Dict[str, Any]:
+    """Spec entry for one of the built-in categories, with _determine_threshold's action texts."""
+    actions = _determine_threshold(min_average if min_average is not None else -math.inf)
+    entry = {"name": name, "action": actions["action"], "claudeworkflow_action": actions["claudeworkflow_action"]}
+    if min_average is not None:
+        entry["min_average"] = min_average
+    return entry
+
+
+DEFAULT_POLICY_SPEC: Dict[str, Any] = {
+    "name": "default",
+    "thresholds": [
+        _threshold_entry("Production", 8.0),
+        _threshold_entry("Marginal", 7.0),
+        _threshold_entry("Insufficient", None),
+    ],
+    "confidence": {"order": ["H", "M", "L"], "aggregation": "strongest", "policy_levels": ["H", "M"]},
+    "contradictions": {"base": 10.0, "points_per_unresolved": 2.0, "floor": 0.0},
+}
+
+
+class CompiledPolicy:
+    """
+    Lookup-table form of a policy spec (build with compile_policy).
+
+    Attributes:
+        name: Policy name
+        categories: Threshold names, in evaluation order
+        threshold_table: _determine_threshold-shaped dict per category
+        min_average / min_each: Per category condition (-inf when absent)
+        confidence_labels: Aggregate labels (the order, then 'None')
+        aggregate_table: Confidence bitmask → index into confidence_labels
+        meets_table: Confidence bitmask → whether the aggregate meets the policy
+        contradiction_table: Unresolved count → score, up to the floor
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.name = str(spec.get("name", "policy"))
+        self._compile_thresholds(spec.get("thresholds", DEFAULT_POLICY_SPEC["thresholds"]))
+        self._compile_confidence({**DEFAULT_POLICY_SPEC["confidence"], **spec.get("confidence", {})})
+        self._compile_contradictions({**DEFAULT_POLICY_SPEC["contradictions"], **spec.get("contradictions", {})})
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"policy {self.name!r}: {message}")
+
+    def _compile_thresholds(self, thresholds: Any) -> None:
+        if not isinstance(thresholds, list) or not thresholds:
+            raise self._error("thresholds must be a non-empty list")
+        self.categories: List[str] = []
+        self.threshold_table: List[Dict[str, str]] = []
+        min_average: List[float] = []
+        min_each: List[float] = []
+        for position, entry in enumerate(thresholds):
+            if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+                raise self._error(f"thresholds[{position}] must be an object with a name")
+            for key in ("min_average", "min_each"):
+                if key in entry and not isinstance(entry[key], (int, float)):
+                    raise self._error(f"thresholds[{position}].{key} must be a number")
+            last = position == len(thresholds) - 1
+            if last and ("min_average" in entry or "min_each" in entry):
+                raise self._error("the last threshold is the fallback and takes no conditions")
+            if not last and "min_average" not in entry and "min_each" not in entry:
+                raise self._error(f"thresholds[{position}] needs min_average or min_each (only the last entry is unconditional)")
+            self.categories.append(entry["name"])
+            self.threshold_table.append({
+                "threshold": entry["name"],
+                "action": entry.get("action", ""),
+                "claudeworkflow_action": entry.get("claudeworkflow_action", ""),
+            })
+            min_average.append(float(entry.get("min_average", -math.inf)))
+            min_each.append(float(entry.get("min_each", -math.inf)))
+        self.min_average = tuple(min_average)
+        self.min_each = tuple(min_each)
+        self.uses_min_each = any(value > -math.inf for value in min_each)
+
+    def _compile_confidence(self, confidence: Dict[str, Any]) -> None:
+        order = confidence["order"]
+        if not order or not all(level in CONFIDENCE_LEVELS for level in order) or len(set(order)) != len(order):
+            raise self._error(f"confidence.order must list distinct levels from {list(CONFIDENCE_LEVELS)}")
+        if confidence["aggregation"] not in AGGREGATIONS:
+            raise self._error(f"confidence.aggregation must be one of {list(AGGREGATIONS)}")
+        unknown = set(confidence["policy_levels"]) - set(order)
+        if unknown:
+            raise self._error(f"confidence.policy_levels not in order: {sorted(unknown)}")
+
+        self.confidence_labels = tuple(order) + ("None",)
+        weakest = len(order) - 1
+        self.aggregate_table: List[int] = []
+        for mask in range(_MASKS):
+            present = set()
+            for level, bit in _CONFIDENCE_BITS.items():
+                if mask & bit:
+                    # Levels the policy does not rank fall through to the weakest
+                    present.add(order.index(level) if level in order else weakest)
+            if mask & OTHER_CONFIDENCE_BIT:
+                present.add(weakest)
+            if not present:
+                self.aggregate_table.append(len(order))
+            else:
+                self.aggregate_table.append(min(present) if confidence["aggregation"] == "strongest" else max(present))
+        self.policy_levels = frozenset(confidence["policy_levels"])
+        self.meets_table = [self.confidence_labels[code] in self.policy_levels for code in self.aggregate_table]
+
+    def _compile_contradictions(self, rule: Dict[str, Any]) -> None:
+        for key in ("base", "points_per_unresolved", "floor"):
+            if not isinstance(rule[key], (int, float)):
+                raise self._error(f"contradictions.{key} must be a number")
+        base, points, floor = float(rule["base"]), float(rule["points_per_unresolved"]), float(rule["floor"])
+        if points < 0 or floor > base:
+            raise self._error("contradictions needs points_per_unresolved >= 0 and floor <= base")
+        self.no_conflicts_score = base
+        # Scores until the floor is reached; higher counts use the last entry
+        steps = int(math.ceil((base - floor) / points)) if points else 0
+        self.contradiction_table = tuple(max(base - count * points, floor) for count in range(steps + 1))
+
+    # Scalar evaluation
+
+    def threshold_code(self, average: float, min_criterion: float = math.inf) -> int:
+        """Index into categories for an unrounded average (and lowest applicable criterion)."""
+        for code in range(len(self.categories) - 1):
+            if average >= self.min_average[code] and min_criterion >= self.min_each[code]:
+                return code
+        return len(self.categories) - 1
+
+    def determine_threshold(self, average: float, min_criterion: float = math.inf) -> Dict[str, str]:
+        """Policy counterpart of quality_validator._determine_threshold."""
+        return self.threshold_table[self.threshold_code(average, min_criterion)]
+
+    def aggregate_confidence(self, confidences: Iterable[Any]) -> str:
+        """Policy counterpart of traceability_validator._compute_aggregate_confidence."""
+        return self.confidence_labels[self.aggregate_table[confidence_mask(confidences)]]
+
+    def meets_policy(self, aggregate: str) -> bool:
+        """Whether an aggregate confidence satisfies the policy."""
+        return aggregate in self.policy_levels
+
+    def contradictions_score(self, unresolved: int, total: int) -> float:
+        """Policy counterpart of the contradictions rule (total = number of disagreements)."""
+        if not total:
+            return self.no_conflicts_score
+        return self.contradiction_table[min(unresolved, len(self.contradiction_table) - 1)]
+
+    # Batch evaluation
+
+    def evaluate(self, batch: 'ScoredBatch') -> Dict[str, 'np.ndarray']:
+        """
+        Applies the policy to a ScoredBatch.
+
+        Returns:
+            Dictionary of arrays, one row per output: contradictions, average
+            (float64, NaN where quality validation failed), threshold (int8
+            code into categories), aggregate_confidence (int8 code into
+            confidence_labels), meets_policy (bool) and traceability_status
+            (int8 code into STATUS_NAMES)
+        """
+        contradiction_table = np.asarray(self.contradiction_table)
+        contradictions = np.where(
+            batch.disagreement_present,
+            contradiction_table[np.minimum(batch.unresolved, len(contradiction_table) - 1)],
+            self.no_conflicts_score
+        )
+
+        # Same summation order as _average_score
+        total = batch.coverage + batch.evidence + contradictions
+        if batch.freshness_applicable:
+            average = (total + batch.freshness) / 4
+        else:
+            average = total / 3
+
+        fallback = len(self.categories) - 1
+        threshold = np.full(len(batch), fallback, dtype=np.int8)
+        if self.uses_min_each:
+            lowest = np.minimum(np.minimum(batch.coverage, batch.evidence), contradictions)
+            if batch.freshness_applicable:
+                lowest = np.minimum(lowest, batch.freshness)
+        for code in reversed(range(fallback)):
+            matches = average >= self.min_average[code]
+            if self.min_each[code] > -math.inf:
+                matches &= lowest >= self.min_each[code]
+            threshold[matches] = code
+        threshold[~batch.quality_ok] = fallback
+
+        aggregate = np.asarray(self.aggregate_table, dtype=np.int8)[batch.confidence_mask]
+        meets_policy = np.asarray(self.meets_table, dtype=bool)[batch.confidence_mask]
+        status = np.where(meets_policy, 0, 1).astype(np.int8)
+        status[batch.traceability_error] = 2
+
+        return {
+            "contradictions": np.where(batch.quality_ok, contradictions, np.nan),
+            "average": np.where(batch.quality_ok, average, np.nan),
+            "threshold": threshold,
+            "aggregate_confidence": aggregate,
+            "meets_policy": meets_policy,
+            "traceability_status": status,
+        }
+
+    def names(self, evaluation: Dict[str, 'np.ndarray']) -> Dict[str, List[str]]:
+        """Threshold, aggregate confidence and status codes of evaluate() as names."""
+        return {
+            "threshold": [self.categories[code] for code in evaluation["threshold"].tolist()],
+            "aggregate_confidence": [self.confidence_labels[code] for code in evaluation["aggregate_confidence"].tolist()],
+            "traceability_status": [STATUS_NAMES[code] for code in evaluation["traceability_status"].tolist()],
+        }
+
+
+def confidence_mask(confidences: Iterable[Any]) -> int:
+    """Bitmask of the confidence levels present (H, M, L, anything else)."""
+    mask = 0
+    for confidence in confidences:
+        mask |= _CONFIDENCE_BITS.get(confidence, OTHER_CONFIDENCE_BIT) if isinstance(confidence, str) else OTHER_CONFIDENCE_BIT
+    return mask
+
+
+def compile_policy(spec: Union[Dict[str, Any], CompiledPolicy]) -> CompiledPolicy:
+    """Compiles a policy spec dict (already compiled policies pass through)."""
+    if isinstance(spec, CompiledPolicy):
+        return spec
+    if not isinstance(spec, dict):
+        raise ValueError("policy spec must be an object")
+    return CompiledPolicy(spec)
+
+
+def load_policy(path: str) -> CompiledPolicy:
+    """Loads and compiles a .json, .yaml or .yml policy spec."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise ImportError("YAML policy specs require PyYAML (pip install pyyaml)")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    return compile_policy(spec)
+
+
+DEFAULT_POLICY = compile_policy(DEFAULT_POLICY_SPEC)
+
+
+class ScoredBatch:
+    """
+    Policy-independent scoring inputs of a batch of outputs.
+
+    Arrays have one row per output: coverage, evidence, freshness (NaN when
+    not applicable), unresolved (conflict count), disagreement_present and
+    quality_ok (False where validate_research_quality would return an error
+    result), confidence_mask (see confidence_mask) and traceability_error
+    (structural traceability errors, which no policy changes).
+    """
+
+    def __init__(
+        self,
+        coverage: 'np.ndarray',
+        evidence: 'np.ndarray',
+        freshness: 'np.ndarray',
+        unresolved: 'np.ndarray',
+        disagreement_present: 'np.ndarray',
+        quality_ok: 'np.ndarray',
+        confidence_mask: 'np.ndarray',
+        traceability_error: 'np.ndarray',
+        freshness_applicable: bool = True
+    ):
+        self.coverage = coverage
+        self.evidence = evidence
+        self.freshness = freshness
+        self.unresolved = unresolved
+        self.disagreement_present = disagreement_present
+        self.quality_ok = quality_ok
+        self.confidence_mask = confidence_mask
+        self.traceability_error = traceability_error
+        self.freshness_applicable = freshness_applicable
+
+    def __len__(self) -> int:
+        return len(self.coverage)
+
+    @classmethod
+    def from_outputs(
+        cls,
+        outputs: Sequence[Dict[str, Any]],
+        total_dimensions: Union[int, Sequence[int]],
+        freshness_applicable: bool = True,
+        freshness_policy: Optional[Any] = None
+    ) -> 'ScoredBatch':
+        """Scores outputs once (columnar quality + traceability support masks)."""
+        if np is None:
+            raise ImportError("quality_policy batches require NumPy (pip install numpy)")
+        from columnar_quality import DOC_OK, QualityColumns
+
+        outputs = list(outputs)
+        columns = QualityColumns.from_outputs(
+            outputs, total_dimensions, freshness_applicable, freshness_policy=freshness_policy
+        )
+        scores = columns.scores()
+
+        masks = []
+        errors = []
+        for gemini_output in outputs:
+            # Findings are indexed only when there are supporting ids, as in
+            # validate_traceability; outputs it raises on count as errors
+            try:
+                support = _resolve_support(gemini_output)
+            except Exception:
+                support = {"error": "unresolvable support", "supporting_findings": None}
+            errors.append(support["error"] is not None or support["status"] == "ERROR")
+            masks.append(confidence_mask(f.get('confidence') for f in support["supporting_findings"] or ()))
+
+        return cls(
+            coverage=scores["coverage"],
+            evidence=scores["evidence"],
+            freshness=scores["freshness"],
+            unresolved=columns.disagreement_unresolved,
+            disagreement_present=columns.disagreement_present,
+            quality_ok=columns.doc_status == DOC_OK,
+            confidence_mask=np.asarray(masks, dtype=np.int8),
+            traceability_error=np.asarray(errors, dtype=bool),
+            freshness_applicable=freshness_applicable,
+        )
+
+
+def evaluate_policies(
+    batch: ScoredBatch,
+    policies: Iterable[Union[Dict[str, Any], CompiledPolicy]]
+) -> Dict[str, Dict[str, 'np.ndarray']]:
+    """Applies each policy to the same scored batch; keyed by policy name."""
+    results = {}
+    for policy in policies:
+        policy = compile_policy(policy)
+        if policy.name in results:
+            raise ValueError(f"duplicate policy name: {policy.name!r}")
+        results[policy.name] = policy.evaluate(batch)
+    return results
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+    from collections import Counter
+
+    from synthetic_outputs import generate_corpus, _TOPICS
+
+    from quality_validator import validate_research_quality
+    from traceability_validator import validate_traceability
+
+    corpus = (generate_corpus('tier2_standard_report', 1000, seed=3)
+              + generate_corpus('tier3_fast_summary', 1000, seed=4))
+
+    strict = compile_policy({
+        "name": "strict",
+        "thresholds": [
+            {"name": "Production", "min_average": 8.5, "min_each": 7.5},
+            {"name": "Marginal", "min_average": 7.0},
+            {"name": "Insufficient"},
+        ],
+        "confidence": {"policy_levels": ["H"]},
+        "contradictions": {"points_per_unresolved": 3},
+    })
+    lenient = compile_policy({
+        "name": "lenient",
+        "thresholds": [
+            {"name": "Production", "min_average": 7.5},
+            {"name": "Marginal", "min_average": 6.0},
+            {"name": "Insufficient"},
+        ],
+        "confidence": {"policy_levels": ["H", "M", "L"]},
+    })
+
+    start = time.perf_counter()
+    batch = ScoredBatch.from_outputs(corpus, total_dimensions=len(_TOPICS))
+    scored = time.perf_counter() - start
+    start = time.perf_counter()
+    results = evaluate_policies(batch, [DEFAULT_POLICY, strict, lenient])
+    evaluated = time.perf_counter() - start
+    print(f"{len(corpus)} outputs scored in {scored * 1e3:.0f} ms, 3 policies applied in {evaluated * 1e3:.1f} ms")
+
+    # The default policy reproduces the validators, and every policy matches
+    # the validators run with policy=
+    default = DEFAULT_POLICY.names(results["default"])
+    mismatches = sum(
+        validate_research_quality(o, len(_TOPICS))['threshold'] != default["threshold"][i]
+        or validate_traceability(o)['status'] != default["traceability_status"][i]
+        for i, o in enumerate(corpus)
+    )
+    print(f"Default policy mismatches vs validators: {mismatches}")
+    for policy in (strict, lenient):
+        names = policy.names(results[policy.name])
+        mismatches = sum(
+            validate_research_quality(o, len(_TOPICS), policy=policy)['threshold'] != names["threshold"][i]
+            or validate_traceability(o, policy=policy)['status'] != names["traceability_status"][i]
+            for i, o in enumerate(corpus)
+        )
+        print(f"{policy.name} policy mismatches vs validators(policy=): {mismatches}")
+
+    for policy in (DEFAULT_POLICY, strict, lenient):
+        names = policy.names(results[policy.name])
+        print(f"{policy.name:8s} thresholds {dict(Counter(names['threshold']))}  "
+              f"traceability {dict(Counter(names['traceability_status']))}")
@@ -26,23 +26,41 @@ Usage:
 """
 
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime
+
+import instrumentation
+from freshness import DEFAULT_POLICY, DEFAULT_WINDOW_DAYS, FreshnessPolicy
+from records import DATE_INVALID
+
+VALIDATOR_VERSION = "1.0.0"
+
+FRESHNESS_NOT_APPLICABLE = "N/A - Stable topic, freshness not applicable"
 
 
 def validate_research_quality(
     gemini_output: Dict[str, Any],
     total_dimensions: int,
-    freshness_applicable: bool = True
+    freshness_applicable: bool = True,
+    coverage_engine: Optional[Any] = None,
+    freshness_policy: Optional[FreshnessPolicy] = None,
+    policy: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     Validates and scores research output using Quality Framework formulas.
     
     Args:
         gemini_output: JSON output from Gemini Research Prompt v4.8.1
+                      (dict, or records.ResearchOutput)
         total_dimensions: Total number of dimensions the research should address
                          (derived from objective or manual specification)
         freshness_applicable: Whether freshness scoring applies to this topic
                              (False for stable topics like Python syntax)
+        coverage_engine: dimension_coverage.CoverageEngine used to count
+                        dimensions (default: first-3-words heuristic)
+        freshness_policy: freshness.FreshnessPolicy - reference clock, window
+                         and partial-date handling (default: 180 days, now)
+        policy: quality_policy.CompiledPolicy - threshold cutoffs and
+               contradictions rule (default: the built-in rules)
     
     Returns:
         Dictionary containing:
@@ -52,47 +70,122 @@ def validate_research_quality(
         - claudeworkflow_action: Specific action for ClaudeWorkflow
     """
     
+    timer = instrumentation.start('quality')
+    
     # Extract data from Gemini output
     findings = gemini_output.get('key_findings', [])
     sources = gemini_output.get('sources', {})
     
     # Validate input structure
     if not findings:
-        return _create_error_result("No findings in research output")
+        return _create_error_result("No findings in research output", policy)
     
     if not sources:
-        return _create_error_result("No sources in research output")
+        return _create_error_result("No sources in research output", policy)
+    
+    timer.count('findings_processed', len(findings))
     
     # Compute Coverage Score
-    coverage_score, coverage_justification = _compute_coverage(
-        findings, total_dimensions
-    )
+    if coverage_engine is not None:
+        coverage_score, coverage_justification = coverage_engine.compute_coverage(
+            findings, total_dimensions
+        )
+    else:
+        coverage_score, coverage_justification = _compute_coverage(
+            findings, total_dimensions
+        )
+    timer.lap('coverage')
     
     # Compute Evidence Score
     evidence_score, evidence_justification = _compute_evidence(findings)
+    timer.lap('evidence')
     
     # Compute Freshness Score (if applicable)
     if freshness_applicable:
-        freshness_score, freshness_justification = _compute_freshness(sources)
+        freshness_score, freshness_justification = _compute_freshness(sources, freshness_policy)
+        timer.lap('freshness')
     else:
         freshness_score = None
-        freshness_justification = "N/A - Stable topic, freshness not applicable"
+        freshness_justification = FRESHNESS_NOT_APPLICABLE
     
     # Compute Contradictions Score
     disagreements = gemini_output.get('meta', {}).get('disagreements', [])
     contradictions_score, contradictions_justification = _compute_contradictions(
-        disagreements
+        disagreements, policy
     )
-    
-    # Compute Average (excluding None values)
+    timer.lap('contradictions')
+    
+    average_score = threshold_data = None
+    if policy is not None:
+        average_score = _average_score(
+            coverage_score, evidence_score, freshness_score, contradictions_score
+        )
+        scores = [coverage_score, evidence_score, contradictions_score]
+        if freshness_score is not None:
+            scores.append(freshness_score)
+        threshold_data = policy.determine_threshold(average_score, min(scores))
+    
+    result = _build_result(
+        gemini_output,
+        (coverage_score, coverage_justification),
+        (evidence_score, evidence_justification),
+        (freshness_score, freshness_justification),
+        (contradictions_score, contradictions_justification),
+        total_dimensions,
+        freshness_applicable,
+        average_score=average_score,
+        threshold_data=threshold_data
+    )
+    timer.lap('result')
+    return timer.attach(result)
+
+
+def _average_score(
+    coverage_score: float,
+    evidence_score: float,
+    freshness_score: Optional[float],
+    contradictions_score: float
+) -> float:
+    """Average of the criterion scores, excluding freshness when not applicable."""
     scores = [coverage_score, evidence_score, contradictions_score]
     if freshness_score is not None:
         scores.append(freshness_score)
     
-    average_score = sum(scores) / len(scores)
+    return sum(scores) / len(scores)
+
+
+def _build_result(
+    gemini_output: Dict[str, Any],
+    coverage: tuple,
+    evidence: tuple,
+    freshness: tuple,
+    contradictions: tuple,
+    total_dimensions: int,
+    freshness_applicable: bool,
+    average_score: Optional[float] = None,
+    threshold_data: Optional[Dict[str, str]] = None,
+    validated_at: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Assembles the quality result dict from (score, justification) pairs.
+    
+    Callers that already computed the average, threshold or timestamp
+    (e.g. batch paths) pass them in; otherwise they are derived here.
+    """
+    coverage_score, coverage_justification = coverage
+    evidence_score, evidence_justification = evidence
+    freshness_score, freshness_justification = freshness
+    contradictions_score, contradictions_justification = contradictions
+    
+    # Compute Average (excluding None values)
+    if average_score is None:
+        average_score = _average_score(
+            coverage_score, evidence_score, freshness_score, contradictions_score
+        )
     
     # Determine Threshold and Actions
-    threshold_data = _determine_threshold(average_score)
+    if threshold_data is None:
+        threshold_data = _determine_threshold(average_score)
     
     return {
         "quality_assessment": {
@@ -118,9 +211,9 @@ def validate_research_quality(
         "recommended_action": threshold_data['action'],
         "claudeworkflow_action": threshold_data['claudeworkflow_action'],
         "validation_metadata": {
-            "validator_version": "1.0.0",
+            "validator_version": VALIDATOR_VERSION,
             "prompt_version": gemini_output.get('meta', {}).get('run_metadata', {}).get('prompt_version', 'unknown'),
-            "validated_at": datetime.now().isoformat(),
+            "validated_at": validated_at or datetime.now().isoformat(),
             "total_dimensions_used": total_dimensions,
             "freshness_applicable": freshness_applicable
         }
@@ -137,6 +230,11 @@ def _compute_coverage(findings: List[Dict], total_dimensions: int) -> tuple:
     if total_dimensions <= 0:
         return 0.0, "Error: total_dimensions must be > 0"
     
+    return _coverage_from_count(_dimension_count(findings), total_dimensions)
+
+
+def _dimension_count(findings: List[Dict]) -> int:
+    """Number of unique dimension indicators (first 3 words) in findings."""
     # Extract dimension indicators from findings
     # Heuristic: first 2-3 words typically indicate the dimension/topic
     dimensions_found = set()
@@ -144,15 +242,19 @@ def _compute_coverage(findings: List[Dict], total_dimensions: int) -> tuple:
     for finding in findings:
         text = finding.get('text', '')
         # Extract first 3 words as dimension indicator
-        words = text.split()[:3]
+        words = text.split(None, 3)[:3]
         dimension_key = ' '.join(words).lower()
         dimensions_found.add(dimension_key)
     
-    dimensions_addressed = len(dimensions_found)
-    score = (dimensions_addressed / total_dimensions) * 10
+    return len(dimensions_found)
+
+
+def _coverage_from_count(dimensions_addressed: int, total_dimensions: int) -> tuple:
+    """Scores coverage from an already-counted number of dimensions."""
+    if total_dimensions <= 0:
+        return 0.0, "Error: total_dimensions must be > 0"
     
-    # Cap at 10
-    score = min(score, 10.0)
+    score = _coverage_score(dimensions_addressed, total_dimensions)
     
     justification = f"{dimensions_addressed}/{total_dimensions} dimensions addressed"
     if score >= 9.0:
@@ -165,6 +267,15 @@ def _compute_coverage(findings: List[Dict], total_dimensions: int) -> tuple:
     return score, justification
 
 
+def _coverage_score(dimensions_addressed: int, total_dimensions: int) -> float:
+    """Coverage score without the justification (0 when total_dimensions <= 0)."""
+    if total_dimensions <= 0:
+        return 0.0
+    
+    # Cap at 10
+    return min((dimensions_addressed / total_dimensions) * 10, 10.0)
+
+
 def _compute_evidence(findings: List[Dict]) -> tuple:
     """
     Evidence = (findings_with_H_or_M_confidence / total_findings) × 10
@@ -172,16 +283,32 @@ def _compute_evidence(findings: List[Dict]) -> tuple:
     if not findings:
         return 0.0, "No findings to assess"
     
-    hm_findings = [f for f in findings if f.get('confidence') in ['H', 'M']]
-    total_findings = len(findings)
-    
-    score = (len(hm_findings) / total_findings) * 10
-    
-    h_count = len([f for f in findings if f.get('confidence') == 'H'])
-    m_count = len([f for f in findings if f.get('confidence') == 'M'])
-    l_count = len([f for f in findings if f.get('confidence') == 'L'])
+    h_count, m_count, l_count = _confidence_counts(findings)
+    return _evidence_from_counts(h_count, m_count, l_count, len(findings))
+
+
+def _confidence_counts(findings: List[Dict]) -> tuple:
+    """(H, M, L) finding counts."""
+    # Single pass over findings - counts every confidence level at once
+    h_count = m_count = l_count = 0
+    for finding in findings:
+        confidence = finding.get('confidence')
+        if confidence == 'H':
+            h_count += 1
+        elif confidence == 'M':
+            m_count += 1
+        elif confidence == 'L':
+            l_count += 1
+    
+    return h_count, m_count, l_count
+
+
+def _evidence_from_counts(h_count: int, m_count: int, l_count: int, total_findings: int) -> tuple:
+    """Scores evidence from already-counted H/M/L findings."""
+    hm_count = h_count + m_count
+    score = _evidence_score(h_count, m_count, total_findings)
     
-    justification = f"{len(hm_findings)}/{total_findings} findings with H/M confidence "
+    justification = f"{hm_count}/{total_findings} findings with H/M confidence "
     justification += f"(H:{h_count}, M:{m_count}, L:{l_count})"
     
     if score >= 8.0:
@@ -194,38 +321,60 @@ def _compute_evidence(findings: List[Dict]) -> tuple:
     return score, justification
 
 
-def _compute_freshness(sources: Dict[str, Any]) -> tuple:
+def _evidence_score(h_count: int, m_count: int, total_findings: int) -> float:
+    """Evidence score without the justification."""
+    return ((h_count + m_count) / total_findings) * 10
+
+
+def _compute_freshness(sources: Dict[str, Any], policy: Optional[FreshnessPolicy] = None) -> tuple:
     """
     Freshness = (sources ≤ 180 days / total_sources) × 10
+    
+    The reference time, window and partial-date handling come from policy
+    (default: freshness.DEFAULT_POLICY - 180 days on the process-wide clock).
     """
     if not sources:
         return 0.0, "No sources to assess"
     
-    cutoff_date = datetime.now() - timedelta(days=180)
+    policy = policy or DEFAULT_POLICY
+    recent_count, total_count, date_parse_errors = _freshness_counts(sources, policy)
+    return _freshness_from_counts(recent_count, total_count, date_parse_errors, policy.window_days)
+
+
+def _freshness_counts(sources: Dict[str, Any], policy: FreshnessPolicy) -> tuple:
+    """(recent, total, date parse error) source counts under policy."""
+    first_recent_ordinal = policy.first_recent_ordinal()
     recent_count = 0
     total_count = len(sources)
     date_parse_errors = 0
     
     for source_id, source_data in sources.items():
-        date_str = source_data.get('date', '')
-        if not date_str:
-            continue
-        
-        try:
-            # Parse YYYY-MM-DD format
-            source_date = datetime.strptime(date_str, '%Y-%m-%d')
-            if source_date >= cutoff_date:
-                recent_count += 1
-        except ValueError:
+        # Compact (or source_index-interned) records carry a pre-parsed date;
+        # date strings go through the memoized fixed-format parser
+        ordinal = policy.source_ordinal(source_data)
+        if ordinal >= first_recent_ordinal:
+            recent_count += 1
+        elif ordinal == DATE_INVALID:
             date_parse_errors += 1
-            continue
     
+    instrumentation.count('sources_parsed', total_count)
+    instrumentation.count('date_parse_errors', date_parse_errors)
+    return recent_count, total_count, date_parse_errors
+
+
+def _freshness_from_counts(
+    recent_count: int,
+    total_count: int,
+    date_parse_errors: int,
+    window_days: int = DEFAULT_WINDOW_DAYS
+) -> tuple:
+    """Scores freshness from already-counted recent sources."""
     if total_count == 0:
         return 0.0, "No sources with valid dates"
     
-    score = (recent_count / total_count) * 10
+    score = _freshness_score(recent_count, total_count)
     
-    justification = f"{recent_count}/{total_count} sources ≤ 180 days"
+    justification = f"{recent_count}/{total_count} sources ≤ {window_days} days"
     if date_parse_errors > 0:
         justification += f" ({date_parse_errors} date parse errors)"
     
@@ -239,22 +388,45 @@ def _compute_freshness(sources: Dict[str, Any]) -> tuple:
     return score, justification
 
 
-def _compute_contradictions(disagreements: List[Dict]) -> tuple:
+def _freshness_score(recent_count: int, total_count: int) -> float:
+    """Freshness score without the justification."""
+    if total_count == 0:
+        return 0.0
+    return (recent_count / total_count) * 10
+
+
+def _compute_contradictions(disagreements: List[Dict], policy: Optional[Any] = None) -> tuple:
     """
     Contradictions = 10 - (unresolved_conflicts × 2)
     
-    Unresolved = disagreements with final_stance='uncertain'
+    Unresolved = disagreements with final_stance='uncertain'. A
+    quality_policy.CompiledPolicy replaces the rule.
     """
     if not disagreements:
-        return 10.0, "No contradictions found (0 conflicts)"
+        return _contradictions_from_counts(0, 0, policy)
     
-    unresolved = [d for d in disagreements if d.get('final_stance') == 'uncertain']
-    unresolved_count = len(unresolved)
+    return _contradictions_from_counts(_unresolved_count(disagreements), len(disagreements), policy)
+
+
+def _unresolved_count(disagreements: List[Dict]) -> int:
+    """Number of disagreements with final_stance='uncertain'."""
+    return sum(1 for d in disagreements if d.get('final_stance') == 'uncertain')
+
+
+def _contradictions_from_counts(
+    unresolved_count: int,
+    total_disagreements: int,
+    policy: Optional[Any] = None
+) -> tuple:
+    """Scores contradictions from already-counted unresolved disagreements."""
+    if policy is not None:
+        score = policy.contradictions_score(unresolved_count, total_disagreements)
+    else:
+        score = _contradictions_score(unresolved_count, total_disagreements)
     
-    score = 10 - (unresolved_count * 2)
-    score = max(score, 0.0)  # Floor at 0
+    if total_disagreements == 0:
+        return score, "No contradictions found (0 conflicts)"
     
-    total_disagreements = len(disagreements)
     resolved_count = total_disagreements - unresolved_count
     
     justification = f"{unresolved_count} unresolved conflicts "
@@ -270,6 +442,13 @@ def _compute_contradictions(disagreements: List[Dict]) -> tuple:
     return score, justification
 
 
+def _contradictions_score(unresolved_count: int, total_disagreements: int) -> float:
+    """Contradictions score without the justification."""
+    if total_disagreements == 0:
+        return 10.0
+    return max(10 - (unresolved_count * 2), 0.0)  # Floor at 0
+
+
 def _determine_threshold(average_score: float) -> Dict[str, str]:
     """
     Determines threshold category and associated actions based on average score.
@@ -294,8 +473,13 @@ def _determine_threshold(average_score: float) -> Dict[str, str]:
         }
 
 
-def _create_error_result(error_message: str) -> Dict[str, Any]:
-    """Creates error result structure when validation cannot proceed."""
+def _create_error_result(error_message: str, policy: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Creates error result structure when validation cannot proceed.
+    
+    With a quality_policy.CompiledPolicy the threshold is the policy's
+    fallback category instead of Insufficient.
+    """
     return {
         "quality_assessment": {
             "coverage": {"score": 0, "justification": error_message},
@@ -304,11 +488,11 @@ def _create_error_result(error_message: str) -> Dict[str, Any]:
             "contradictions": {"score": 0, "justification": error_message},
             "average": 0.0
         },
-        "threshold": "Insufficient",
+        "threshold": policy.categories[-1] if policy is not None else "Insufficient",
         "recommended_action": f"Fix validation error: {error_message}",
         "claudeworkflow_action": "Cannot use - validation failed",
         "validation_metadata": {
-            "validator_version": "1.0.0",
+            "validator_version": VALIDATOR_VERSION,
             "validated_at": datetime.now().isoformat(),
             "error": error_message
         }
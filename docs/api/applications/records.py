@@ -0,0 +1,445 @@
+"""
+Compact Record Model for Gemini Research Prompt v4.8.1 Outputs
+
+Typed __slots__ representation of the OUTPUT schema documented in
+v4.8.1_api_prompt.md. Compared with the plain JSON dicts, records store
+confidence as a small int enum, source dates as proordinal day numbers and
+repeated strings (source ids, publisher types, stances) interned, so millions
+of findings and sources fit in a fraction of the memory.
+
+Records also answer the read-only dict protocol (record['text'],
+record.get('confidence')) with values in the original JSON form, so
+validate_traceability, validate_research_quality and the other validators
+accept either form without changes.
+
+Usage:
+    from records import ResearchOutput
+
+    output = ResearchOutput.from_dict(gemini_output)   # compact form
+    quality_results = validate_research_quality(output, total_dimensions=10)
+
+    output.to_dict()  # back to the JSON dict form
+"""
+
+import sys
+from enum import IntEnum
+from datetime import date, datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+
+class Confidence(IntEnum):
+    """Finding / disagreement confidence (H/M/L), ordered strongest first."""
+    H = 0
+    M = 1
+    L = 2
+
+    @classmethod
+    def parse(cls, value: Any) -> Optional['Confidence']:
+        """Maps 'H' / 'M' / 'L' to the enum; anything else to None."""
+        return _CONFIDENCE_BY_LETTER.get(value) if isinstance(value, str) else None
+
+
+_CONFIDENCE_BY_LETTER = {c.name: c for c in Confidence}
+
+# Source.date_ordinal values that are not real dates
+DATE_MISSING = 0
+DATE_INVALID = -1
+
+_MISSING = object()
+
+# parse_date_ordinal memo (cleared when full)
+_DATE_MEMO: Dict[Any, int] = {}
+_MAX_DATE_MEMO = 65536
+
+
+def parse_date_ordinal(date_str: Any) -> int:
+    """
+    Converts a source date string to a proleptic Gregorian ordinal.
+
+    Returns:
+        Day ordinal, DATE_MISSING for empty/absent dates, or DATE_INVALID
+        if the string is not YYYY-MM-DD (same rule as _compute_freshness)
+    """
+    if not date_str:
+        return DATE_MISSING
+
+    # Sources reuse a small set of dates - memo hits skip parsing entirely
+    ordinal = _DATE_MEMO.get(date_str)
+    if ordinal is not None:
+        return ordinal
+
+    if (len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-'
+            and date_str.isascii() and date_str[:4].isdigit() and date_str[5:7].isdigit()
+            and date_str[8:].isdigit()):
+        # Canonical YYYY-MM-DD: slice instead of strptime's regex matching
+        try:
+            ordinal = date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:])).toordinal()
+        except ValueError:
+            ordinal = DATE_INVALID
+    else:
+        # Anything else strptime accepts (e.g. '2025-1-5') stays valid
+        try:
+            ordinal = datetime.strptime(date_str, '%Y-%m-%d').toordinal()
+        except ValueError:
+            ordinal = DATE_INVALID
+
+    if len(_DATE_MEMO) >= _MAX_DATE_MEMO:
+        _DATE_MEMO.clear()
+    _DATE_MEMO[date_str] = ordinal
+    return ordinal
+
+
+def _parse_confidence(entry: Dict[str, Any]) -> Tuple[Optional[Confidence], Any]:
+    """
+    (Confidence, raw value) of an entry's confidence field. Only values that
+    are not H/M/L keep their raw form (including None), so the dict protocol
+    returns exactly what the JSON held; the raw value is _MISSING otherwise.
+    """
+    value = entry.get('confidence', _MISSING)
+    confidence = Confidence.parse(value)
+    return confidence, (value if confidence is None else _MISSING)
+
+
+def _intern(value: Any) -> Any:
+    """Interns strings so repeated ids and enum-like values share storage."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_ids(ids: Any) -> Optional[Tuple]:
+    """Converts a list of source ids to an interned tuple (None if absent)."""
+    if ids is None:
+        return None
+    return tuple(_intern(i) for i in ids)
+
+
+class _Record:
+    """
+    Read-only dict protocol shared by all records.
+
+    Subclasses list their JSON field names in _FIELDS and implement
+    _field(name), returning the JSON-form value or _MISSING.
+    """
+
+    __slots__ = ()
+    _FIELDS: Tuple[str, ...] = ()
+
+    def _field(self, name: str) -> Any:
+        value = getattr(self, name)
+        return _MISSING if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELDS:
+            value = self._field(key)
+            if value is not _MISSING:
+                return value
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELDS:
+            value = self._field(key)
+            if value is not _MISSING:
+                return value
+        return default
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._FIELDS and self._field(key) is not _MISSING
+
+    def keys(self) -> List[str]:
+        return [key for key in self._FIELDS if self._field(key) is not _MISSING]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the record back to its JSON dict form."""
+        return {key: _to_builtin(value) for key, value in self.items()}
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, _Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ', '.join(
+            f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__ if getattr(self, slot) is not _MISSING
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class Finding(_Record):
+    """One key_findings entry."""
+
+    __slots__ = ('id', 'text', 'source_ids', 'confidence', 'raw_confidence')
+    _FIELDS = ('id', 'text', 'source_ids', 'confidence')
+
+    def __init__(
+        self,
+        id: Any,
+        text: Optional[str] = None,
+        source_ids: Optional[Tuple[str, ...]] = None,
+        confidence: Optional[Confidence] = None,
+        raw_confidence: Any = _MISSING
+    ):
+        self.id = id
+        self.text = text
+        self.source_ids = source_ids
+        self.confidence = confidence
+        self.raw_confidence = raw_confidence
+
+    @classmethod
+    def from_dict(cls, finding: Dict[str, Any]) -> 'Finding':
+        confidence, raw_confidence = _parse_confidence(finding)
+        return cls(
+            id=finding.get('id'),
+            text=finding.get('text'),
+            source_ids=_intern_ids(finding.get('source_ids')),
+            confidence=confidence,
+            raw_confidence=raw_confidence
+        )
+
+    def _field(self, name: str) -> Any:
+        if name == 'confidence':
+            return self.raw_confidence if self.confidence is None else self.confidence.name
+        if name == 'source_ids':
+            return _MISSING if self.source_ids is None else list(self.source_ids)
+        return super()._field(name)
+
+
+class Source(_Record):
+    """One sources entry (the source id is the key in ResearchOutput.sources)."""
+
+    __slots__ = (
+        'publisher', 'publisher_type', 'is_primary', 'independent', 'title',
+        'date_ordinal', 'raw_date', 'url', 'modality', 'alt', 'page',
+    )
+    _FIELDS = (
+        'publisher', 'publisher_type', 'is_primary', 'independent', 'title',
+        'date', 'url', 'modality', 'alt', 'page',
+    )
+
+    def __init__(
+        self,
+        publisher: Optional[str] = None,
+        publisher_type: Optional[str] = None,
+        is_primary: Optional[bool] = None,
+        independent: Optional[bool] = None,
+        title: Optional[str] = None,
+        date_ordinal: int = DATE_MISSING,
+        raw_date: Optional[str] = None,
+        url: Optional[str] = None,
+        modality: Optional[str] = None,
+        alt: Optional[str] = None,
+        page: Any = None
+    ):
+        self.publisher = publisher
+        self.publisher_type = publisher_type
+        self.is_primary = is_primary
+        self.independent = independent
+        self.title = title
+        self.date_ordinal = date_ordinal
+        self.raw_date = raw_date
+        self.url = url
+        self.modality = modality
+        self.alt = alt
+        self.page = page
+
+    @classmethod
+    def from_dict(cls, source: Dict[str, Any]) -> 'Source':
+        date_str = source.get('date')
+        date_ordinal = parse_date_ordinal(date_str)
+        return cls(
+            publisher=_intern(source.get('publisher')),
+            publisher_type=_intern(source.get('publisher_type')),
+            is_primary=source.get('is_primary'),
+            independent=source.get('independent'),
+            title=source.get('title'),
+            date_ordinal=date_ordinal,
+            # Only unparseable (or present-but-empty) dates keep their raw text
+            raw_date=date_str if date_ordinal <= DATE_MISSING else None,
+            url=source.get('url'),
+            modality=_intern(source.get('modality')),
+            alt=source.get('alt'),
+            page=source.get('page')
+        )
+
+    @property
+    def date(self) -> Optional[date]:
+        """Source date, or None if missing or unparseable."""
+        return date.fromordinal(self.date_ordinal) if self.date_ordinal > 0 else None
+
+    def _field(self, name: str) -> Any:
+        if name == 'date':
+            if self.date_ordinal > 0:
+                return date.fromordinal(self.date_ordinal).isoformat()
+            return _MISSING if self.raw_date is None else self.raw_date
+        return super()._field(name)
+
+
+class Disagreement(_Record):
+    """One meta.disagreements entry."""
+
+    __slots__ = ('claim', 'sources_for', 'sources_against', 'final_stance', 'confidence', 'rationale', 'raw_confidence')
+    _FIELDS = __slots__[:-1]
+
+    def __init__(
+        self,
+        claim: Optional[str] = None,
+        sources_for: Optional[Tuple[str, ...]] = None,
+        sources_against: Optional[Tuple[str, ...]] = None,
+        final_stance: Optional[str] = None,
+        confidence: Optional[Confidence] = None,
+        rationale: Optional[str] = None,
+        raw_confidence: Any = _MISSING
+    ):
+        self.claim = claim
+        self.sources_for = sources_for
+        self.sources_against = sources_against
+        self.final_stance = final_stance
+        self.confidence = confidence
+        self.rationale = rationale
+        self.raw_confidence = raw_confidence
+
+    @classmethod
+    def from_dict(cls, disagreement: Dict[str, Any]) -> 'Disagreement':
+        confidence, raw_confidence = _parse_confidence(disagreement)
+        return cls(
+            claim=disagreement.get('claim'),
+            sources_for=_intern_ids(disagreement.get('sources_for')),
+            sources_against=_intern_ids(disagreement.get('sources_against')),
+            final_stance=_intern(disagreement.get('final_stance')),
+            confidence=confidence,
+            rationale=disagreement.get('rationale'),
+            raw_confidence=raw_confidence
+        )
+
+    def _field(self, name: str) -> Any:
+        if name == 'confidence':
+            return self.raw_confidence if self.confidence is None else self.confidence.name
+        if name in ('sources_for', 'sources_against'):
+            value = getattr(self, name)
+            return _MISSING if value is None else list(value)
+        return super()._field(name)
+
+
+class Meta(_Record):
+    """
+    The meta object. traceability_data and run_metadata are small and kept
+    as dicts; thinking_summary and calibration_note are not retained.
+    """
+
+    __slots__ = ('disagreements', 'traceability_data', 'run_metadata')
+    _FIELDS = __slots__
+
+    def __init__(
+        self,
+        disagreements: Optional[List[Disagreement]] = None,
+        traceability_data: Optional[Dict[str, Any]] = None,
+        run_metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.disagreements = disagreements
+        self.traceability_data = traceability_data
+        self.run_metadata = run_metadata
+
+    @classmethod
+    def from_dict(cls, meta: Dict[str, Any]) -> 'Meta':
+        disagreements = meta.get('disagreements')
+        return cls(
+            disagreements=None if disagreements is None else [Disagreement.from_dict(d) for d in disagreements],
+            traceability_data=meta.get('traceability_data'),
+            run_metadata=meta.get('run_metadata')
+        )
+
+
+class ResearchOutput(_Record):
+    """A complete Gemini output; patterns are not retained."""
+
+    __slots__ = ('executive_summary', 'key_findings', 'sources', 'meta')
+    _FIELDS = __slots__
+
+    def __init__(
+        self,
+        executive_summary: Optional[List[str]] = None,
+        key_findings: Optional[List[Finding]] = None,
+        sources: Optional[Dict[str, Source]] = None,
+        meta: Optional[Meta] = None
+    ):
+        self.executive_summary = executive_summary
+        self.key_findings = key_findings
+        self.sources = sources
+        self.meta = meta
+
+    @classmethod
+    def from_dict(cls, gemini_output: Dict[str, Any]) -> 'ResearchOutput':
+        """Converts a Gemini output dict (JSON form) to the compact record form."""
+        findings = gemini_output.get('key_findings')
+        sources = gemini_output.get('sources')
+        meta = gemini_output.get('meta')
+        return cls(
+            executive_summary=gemini_output.get('executive_summary'),
+            key_findings=None if findings is None else [Finding.from_dict(f) for f in findings],
+            sources=None if sources is None else {
+                _intern(source_id): Source.from_dict(source) for source_id, source in sources.items()
+            },
+            meta=None if meta is None else Meta.from_dict(meta)
+        )
+
+
+def _to_builtin(value: Any) -> Any:
+    """Recursively converts records (and containers of records) to JSON form."""
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_builtin(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_builtin(v) for k, v in value.items()}
+    return value
+
+
+# Example usage
+if __name__ == "__main__":
+    import json
+    import tracemalloc
+
+    from combined_validator import validate_all
+
+    example_output = {
+        "executive_summary": ["1. Desktop and Code use separate memory systems [1, 2]"],
+        "key_findings": [
+            {"id": i, "text": f"Finding number {i} about memory systems", "source_ids": ["1", "2"], "confidence": "HML"[i % 3]}
+            for i in range(1, 21)
+        ],
+        "sources": {
+            str(i): {"publisher": "Anthropic", "publisher_type": "official", "is_primary": True,
+                     "independent": True, "title": f"Doc {i}", "date": "2025-01-15", "url": f"https://example.com/{i}"}
+            for i in range(1, 9)
+        },
+        "meta": {
+            "disagreements": [{"claim": "Memory sharing possible", "sources_for": ["1"], "sources_against": ["2"],
+                               "final_stance": "against", "confidence": "H", "rationale": "Docs"}],
+            "traceability_data": {"answer_claim": "Desktop and Code use separate memory systems", "supporting_finding_ids": [1, 2]},
+            "run_metadata": {"prompt_version": "4.8.1"}
+        }
+    }
+
+    tracemalloc.start()
+    as_dicts = [json.loads(json.dumps(example_output)) for _ in range(1000)]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    del as_dicts
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    as_records = [ResearchOutput.from_dict(json.loads(json.dumps(example_output))) for _ in range(1000)]
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    dict_results = validate_all(example_output, total_dimensions=5)
+    record_results = validate_all(as_records[0], total_dimensions=5)
+
+    print("Compact Record Model:")
+    print(f"1000 outputs as dicts:   {dict_bytes / 1e6:.2f} MB")
+    print(f"1000 outputs as records: {record_bytes / 1e6:.2f} MB")
+    print(f"Round trip equal: {as_records[0].to_dict() == example_output}")
+    print(f"Same threshold: {dict_results['quality']['threshold'] == record_results['quality']['threshold']}")
+    print(f"Same status: {dict_results['traceability']['status'] == record_results['traceability']['status']}")
@@ -0,0 +1,278 @@
+"""
+Validation Result Cache for Gemini Research Prompt v4.8.1
+
+Content-addressed cache in front of validate_traceability,
+validate_research_quality and validate_all. Results are keyed by a SHA-256 of
+the canonicalized output (only the fields the validators read), the validator
+parameters and the validator_version stamped in validation_metadata, so an
+upgraded validator never serves stale results.
+
+Two tiers:
+- Memory: LRU bounded by entry count
+- Disk: SQLite file bounded by total size, least recently used rows evicted
+
+Freshness depends on the current date (sources ≤ 180 days old). Quality keys
+include the first day that currently counts as recent, so cached freshness
+scores expire automatically as the 180-day window moves.
+
+Cached results are returned exactly as first computed, including their
+original validated_at timestamp.
+
+Usage:
+    from result_cache import ResultCache
+
+    cache = ResultCache(max_entries=10000, path='validation_cache.sqlite', max_bytes=512 * 2**20)
+    results = cache.validate_all(gemini_output, total_dimensions=10)
+    print(cache.stats())
+"""
+
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Any
+
+from combined_validator import validate_all
+import instrumentation
+from fast_decode import _project
+from freshness import DEFAULT_POLICY
+from quality_validator import (
+    VALIDATOR_VERSION as QUALITY_VALIDATOR_VERSION,
+    validate_research_quality,
+)
+from records import _Record
+from traceability_validator import VALIDATOR_VERSION as TRACEABILITY_VALIDATOR_VERSION, validate_traceability
+
+
+class ResultCache:
+    """
+    Two-tier (memory LRU + SQLite) cache of validation results.
+
+    Args:
+        max_entries: Maximum results kept in the memory tier (0 disables it)
+        path: SQLite file for the disk tier (None disables it)
+        max_bytes: Maximum total size of cached results on disk
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        path: Optional[str] = None,
+        max_bytes: int = 256 * 2**20
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._db = None
+        self._disk_bytes = 0
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+            self._db.commit()
+            # Running total of the size column, kept up to date by _store and
+            # eviction so inserts never re-sum the table
+            self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def validate_traceability(self, gemini_output: Dict[str, Any]) -> Dict[str, Any]:
+        """Cached validate_traceability."""
+        key = _cache_key('traceability', gemini_output, {}, TRACEABILITY_VALIDATOR_VERSION)
+        return self._get_or_compute(key, lambda: validate_traceability(gemini_output))
+
+    def validate_research_quality(
+        self,
+        gemini_output: Dict[str, Any],
+        total_dimensions: int,
+        freshness_applicable: bool = True
+    ) -> Dict[str, Any]:
+        """Cached validate_research_quality."""
+        params = _quality_params(total_dimensions, freshness_applicable)
+        key = _cache_key('quality', gemini_output, params, QUALITY_VALIDATOR_VERSION)
+        return self._get_or_compute(
+            key,
+            lambda: validate_research_quality(gemini_output, total_dimensions, freshness_applicable)
+        )
+
+    def validate_all(
+        self,
+        gemini_output: Dict[str, Any],
+        total_dimensions: int,
+        freshness_applicable: bool = True
+    ) -> Dict[str, Any]:
+        """Cached validate_all (traceability and quality cached as one entry)."""
+        params = _quality_params(total_dimensions, freshness_applicable)
+        version = f"{TRACEABILITY_VALIDATOR_VERSION}+{QUALITY_VALIDATOR_VERSION}"
+        key = _cache_key('all', gemini_output, params, version)
+        return self._get_or_compute(
+            key,
+            lambda: validate_all(gemini_output, total_dimensions, freshness_applicable)
+        )
+
+    def clear(self) -> None:
+        """Drops every cached result from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+                self._disk_bytes = 0
+
+    def close(self) -> None:
+        """Closes the disk tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dictionary containing memory_hits, disk_hits, misses, evictions,
+            memory_entries and disk_bytes
+        """
+        with self._lock:
+            return {**self._stats, "memory_entries": len(self._memory), "disk_bytes": self._disk_bytes}
+
+    def _get_or_compute(self, key: str, compute) -> Dict[str, Any]:
+        """Looks the key up in memory then disk; computes and stores on a miss."""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                instrumentation.count('cache_hits')
+                return copy.deepcopy(result)
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self._stats["disk_hits"] += 1
+                    instrumentation.count('cache_hits')
+                    result = json.loads(row[0])
+                    self._remember(key, result)
+                    return copy.deepcopy(result)
+
+            self._stats["misses"] += 1
+            instrumentation.count('cache_misses')
+
+        result = compute()
+
+        with self._lock:
+            self._remember(key, copy.deepcopy(result))
+            if self._db is not None:
+                self._store(key, result)
+
+        return result
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        """Adds a result to the memory tier, evicting the least recently used."""
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _store(self, key: str, result: Dict[str, Any]) -> None:
+        """Writes a result to the disk tier and evicts until under max_bytes."""
+        value = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        replaced = self._db.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, value, len(value), time.time())
+        )
+        total = self._disk_bytes + len(value) - (replaced[0] if replaced is not None else 0)
+
+        while total > self.max_bytes:
+            oldest = self._db.execute(
+                "SELECT key, size FROM results ORDER BY last_access LIMIT 256"
+            ).fetchall()
+            if not oldest:
+                break
+            for old_key, size in oldest:
+                self._db.execute("DELETE FROM results WHERE key = ?", (old_key,))
+                self._stats["evictions"] += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+        self._db.commit()
+        self._disk_bytes = total
+
+
+def _quality_params(total_dimensions: int, freshness_applicable: bool) -> Dict[str, Any]:
+    """Quality parameters that affect the result, including the freshness window."""
+    params = {"total_dimensions": total_dimensions, "freshness_applicable": freshness_applicable}
+    if freshness_applicable:
+        # Sources are compared against a moving 180-day cutoff; the set of
+        # dates counted as recent only changes when this ordinal changes
+        params["first_recent_ordinal"] = DEFAULT_POLICY.first_recent_ordinal()
+    return params
+
+
+def _cache_key(kind: str, gemini_output: Any, params: Dict[str, Any], validator_version: str) -> str:
+    """SHA-256 over the canonical JSON of the validated fields plus parameters."""
+    if isinstance(gemini_output, _Record):
+        gemini_output = gemini_output.to_dict()
+
+    canonical = json.dumps(
+        [kind, validator_version, params, _project(gemini_output)],
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+# Example usage
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    example_output = {
+        "executive_summary": ["1. Desktop and Code use separate memory systems [1]"],
+        "key_findings": [
+            {"id": 1, "text": "Desktop Memory uses automatic chat synthesis", "source_ids": ["1"], "confidence": "H"},
+            {"id": 2, "text": "Code Memory uses CLAUDE.md file system", "source_ids": ["1"], "confidence": "M"}
+        ],
+        "sources": {"1": {"date": datetime.now().strftime('%Y-%m-%d'), "publisher": "Anthropic"}},
+        "meta": {
+            "traceability_data": {"answer_claim": "Desktop and Code use separate memory systems", "supporting_finding_ids": [1]},
+            "run_metadata": {"prompt_version": "4.8.1"}
+        }
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(max_entries=100, path=os.path.join(tmp, 'cache.sqlite'))
+
+        start = time.perf_counter()
+        first = cache.validate_all(example_output, total_dimensions=2)
+        miss_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            cache.validate_all(example_output, total_dimensions=2)
+        hit_time = (time.perf_counter() - start) / 1000
+
+        print("Result Cache:")
+        print(f"Miss: {miss_time * 1e6:.0f} µs, hit: {hit_time * 1e6:.0f} µs")
+        print(f"Threshold: {first['quality']['threshold']}")
+        print(f"Stats: {cache.stats()}")
+        cache.close()
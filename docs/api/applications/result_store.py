@@ -0,0 +1,497 @@
+"""
+Columnar Result Store for Gemini Research Prompt v4.8.1
+
+Validation results are nested dicts written one JSON line at a time, so a
+question like "which runs last month were Marginal with freshness < 5" means
+re-reading (or re-validating) the whole archive. ResultStore keeps the fields
+dashboards filter and aggregate on in Parquet, one row per validated output:
+
+- key, validated_at
+- prompt_version, correlation_id, preset_used (from meta.run_metadata)
+- coverage, evidence, freshness, contradictions, average (quality scores;
+  null when quality validation itself errored - its zeros are placeholders)
+- threshold, status, aggregate_confidence, total_dimensions, error
+
+A store is a directory of Parquet files. Each ResultStoreWriter appends
+files, buffering rows into row groups of row_group_size; a file is written
+under a hidden name and renamed when the writer commits or closes, so readers
+never see a partial file. commit() publishes everything appended so far and
+starts a new file on the next append; a crash loses only rows appended since
+the last commit (remove_orphans cleans up the unpublished file it leaves).
+
+Queries go through pyarrow.dataset: only the requested columns are read, and
+filters are pushed down to row-group statistics, so row groups that cannot
+match (e.g. validated before a cutoff) are skipped without being decoded.
+
+Filters are a dict of column → condition: a value (equality), a list or set
+(membership), None (is null), or an (operator, value) tuple with one of
+==, !=, <, <=, >, >=.
+
+Requires pyarrow.
+
+Usage:
+    from result_store import ResultStore, ResultStoreWriter
+
+    with ResultStoreWriter('results/') as writer:
+        for item in validate_batch(paths, total_dimensions=10):
+            writer.append(item)
+
+    store = ResultStore('results/')
+    store.rows(where={'threshold': 'Marginal', 'freshness': ('<', 5),
+                      'validated_at': ('>=', datetime(2025, 5, 1))})
+    store.threshold_distribution(by='prompt_version')
+    store.score_distribution('average', where={'preset_used': 'tier1_deep_dive'})
+
+    python result_store.py results.jsonl results/   # ingest gemini-validate output
+"""
+
+import glob
+import operator
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Set
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed to write and query stores
+    pa = None
+
+
+RUN_METADATA_FIELDS = ('prompt_version', 'correlation_id', 'preset_used')
+
+SCORE_COLUMNS = ('coverage', 'evidence', 'freshness', 'contradictions', 'average')
+
+COLUMNS = (
+    'key', 'validated_at', *RUN_METADATA_FIELDS, *SCORE_COLUMNS,
+    'threshold', 'status', 'aggregate_confidence', 'total_dimensions', 'error'
+)
+
+_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("result_store requires pyarrow (pip install pyarrow)")
+
+
+def _schema() -> 'pa.Schema':
+    _require_pyarrow()
+    return pa.schema(
+        [
+            ('key', pa.string()),
+            ('validated_at', pa.timestamp('us')),
+        ]
+        + [(name, pa.string()) for name in RUN_METADATA_FIELDS]
+        + [(name, pa.float64()) for name in SCORE_COLUMNS]
+        + [
+            ('threshold', pa.string()),
+            ('status', pa.string()),
+            ('aggregate_confidence', pa.string()),
+            ('total_dimensions', pa.int32()),
+            ('error', pa.string()),
+        ]
+    )
+
+
+def run_metadata_of(gemini_output: Any) -> Dict[str, Any]:
+    """prompt_version / correlation_id / preset_used from an output's meta.run_metadata."""
+    meta = gemini_output.get('meta') if isinstance(gemini_output, dict) else None
+    run_metadata = meta.get('run_metadata') if isinstance(meta, dict) else None
+    if not isinstance(run_metadata, dict):
+        return {}
+    return {name: run_metadata[name] for name in RUN_METADATA_FIELDS if name in run_metadata}
+
+
+def result_row(record: Dict[str, Any], run_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Flattens one validation record into a store row.
+
+    Args:
+        record: Dictionary containing traceability and quality results, as
+                yielded by validate_batch / validate_records or written by
+                gemini-validate (key and run_metadata are used if present)
+        run_metadata: Overrides record['run_metadata'] (see run_metadata_of)
+    """
+    quality = record.get('quality') or {}
+    assessment = quality.get('quality_assessment') or {}
+    traceability = record.get('traceability') or {}
+    support = (traceability.get('traceability') or {}).get('support') or {}
+    quality_metadata = quality.get('validation_metadata') or {}
+    traceability_metadata = traceability.get('validation_metadata') or {}
+    if run_metadata is None:
+        run_metadata = record.get('run_metadata') or {}
+
+    validated_at = quality_metadata.get('validated_at')
+    key = record.get('key', record.get('input'))
+    total_dimensions = quality_metadata.get('total_dimensions_used')
+
+    row = {
+        'key': _text(key),
+        'validated_at': datetime.fromisoformat(validated_at) if validated_at else None,
+        'prompt_version': _text(run_metadata.get('prompt_version', quality_metadata.get('prompt_version'))),
+        'correlation_id': _text(run_metadata.get('correlation_id')),
+        'preset_used': _text(run_metadata.get('preset_used')),
+    }
+    quality_error = quality_metadata.get('error')
+    for name in SCORE_COLUMNS:
+        score = assessment.get(name) if not quality_error else None
+        if isinstance(score, dict):
+            score = score.get('score')
+        row[name] = float(score) if score is not None else None
+    row.update({
+        'threshold': _text(quality.get('threshold')),
+        'status': _text(traceability.get('status')),
+        'aggregate_confidence': _text(support.get('aggregate_confidence')),
+        'total_dimensions': total_dimensions if isinstance(total_dimensions, int) else None,
+        'error': _text(quality_error or traceability_metadata.get('error')),
+    })
+    return row
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class ResultStoreWriter:
+    """
+    Appends validation records to a store as new Parquet files (one per commit).
+
+    Args:
+        path: Store directory (created if missing)
+        row_group_size: Rows buffered per row group
+        compression: Parquet compression codec
+    """
+
+    def __init__(self, path: str, row_group_size: int = 65536, compression: str = 'zstd'):
+        _require_pyarrow()
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be >= 1")
+        os.makedirs(path, exist_ok=True)
+
+        self.directory = path
+        self.schema = _schema()
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.path: Optional[str] = None
+        self.paths: List[str] = []
+        self._temporary: Optional[str] = None
+        self._writer: Optional['pq.ParquetWriter'] = None
+        self._closed = False
+        self._columns: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+        self._buffered = 0
+        self.rows_written = 0
+
+    def __enter__(self) -> 'ResultStoreWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def append(self, record: Dict[str, Any], run_metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Adds one validation record (see result_row)."""
+        self.append_row(result_row(record, run_metadata))
+
+    def append_row(self, row: Dict[str, Any]) -> None:
+        """Adds one already-flattened row."""
+        if self._closed:
+            raise ValueError("ResultStoreWriter is closed")
+        for name, values in self._columns.items():
+            values.append(row.get(name))
+        self._buffered += 1
+        if self._buffered >= self.row_group_size:
+            self.flush()
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.append(record)
+
+    def flush(self) -> None:
+        """Writes buffered rows as a row group."""
+        if not self._buffered:
+            return
+        if self._writer is None:
+            name = f"part-{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+            self.path = os.path.join(self.directory, name)
+            # Readers only list part-*.parquet, so the file is invisible until commit()
+            self._temporary = os.path.join(self.directory, '.' + name + '.tmp')
+            self._writer = pq.ParquetWriter(self._temporary, self.schema, compression=self.compression)
+        table = pa.Table.from_pydict(self._columns, schema=self.schema)
+        self._writer.write_table(table, row_group_size=self._buffered)
+        self.rows_written += self._buffered
+        self._columns = {name: [] for name in COLUMNS}
+        self._buffered = 0
+
+    def commit(self) -> None:
+        """Publishes every row added so far as a complete file; later rows go to a new file."""
+        self.flush()
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        os.replace(self._temporary, self.path)
+        self.paths.append(self.path)
+
+    def close(self) -> None:
+        """Commits the remaining rows (nothing is published if there are none)."""
+        if self._closed:
+            return
+        self.commit()
+        self._closed = True
+
+
+class ResultStore:
+    """
+    Read side of a store directory.
+
+    Args:
+        path: Store directory written by ResultStoreWriter
+    """
+
+    def __init__(self, path: str):
+        _require_pyarrow()
+        self.path = path
+
+    def files(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.path, 'part-*.parquet')))
+
+    def keys(self) -> Set[str]:
+        """Keys of every stored row."""
+        if not self.files():
+            return set()
+        return set(self.table(['key']).column('key').to_pylist())
+
+    def remove_orphans(self) -> List[str]:
+        """
+        Deletes unpublished files left behind by writers that crashed.
+
+        Only call this while no ResultStoreWriter is writing to the store -
+        an active writer's unpublished file looks the same.
+        """
+        orphans = glob.glob(os.path.join(self.path, '.part-*.parquet.tmp'))
+        for orphan in orphans:
+            os.remove(orphan)
+        return orphans
+
+    def dataset(self) -> 'ds.Dataset':
+        """The store as a pyarrow dataset (re-listed on every call, so new files are picked up)."""
+        return ds.dataset(self.files(), schema=_schema(), format='parquet')
+
+    def table(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> 'pa.Table':
+        """Reads the requested columns of the rows matching where."""
+        if columns is not None:
+            _check_columns(columns)
+        return self.dataset().to_table(columns=list(columns) if columns else None, filter=_filter(where))
+
+    def rows(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """table() as a list of row dicts."""
+        return self.table(columns, where).to_pylist()
+
+    def count(self, where: Optional[Dict[str, Any]] = None) -> int:
+        return self.dataset().count_rows(filter=_filter(where))
+
+    def threshold_distribution(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        by: Optional[str] = None
+    ) -> Dict[Any, Any]:
+        """
+        Rows per quality threshold.
+
+        Returns:
+            {threshold: count}, or {group value: {threshold: count}} when by
+            names a column (e.g. 'prompt_version' or 'preset_used')
+        """
+        keys = [by, 'threshold'] if by else ['threshold']
+        _check_columns(keys)
+        counts = self.table(keys, where).group_by(keys).aggregate([([], 'count_all')]).to_pylist()
+
+        if not by:
+            return {row['threshold']: row['count_all'] for row in sorted(counts, key=_threshold_order)}
+        grouped: Dict[Any, Dict[str, int]] = {}
+        for row in sorted(counts, key=_threshold_order):
+            grouped.setdefault(row[by], {})[row['threshold']] = row['count_all']
+        return dict(sorted(grouped.items(), key=lambda item: (item[0] is None, str(item[0]))))
+
+    def score_distribution(
+        self,
+        score: str = 'average',
+        where: Optional[Dict[str, Any]] = None,
+        by: Optional[str] = None,
+        bins: int = 10
+    ) -> Dict[Any, Any]:
+        """
+        Summary statistics and histogram of one score column.
+
+        Null scores (freshness when not applicable, quality errors) are left out.
+
+        Returns:
+            Dictionary containing count, mean, min, max, p50, p90, p99 and
+            histogram (counts for bins equal-width bins over 0-10; 10.0 falls
+            in the last bin), or {group value: that dictionary} when by is given
+        """
+        if score not in SCORE_COLUMNS:
+            raise ValueError(f"Unknown score column: {score} (expected one of {SCORE_COLUMNS})")
+        if bins < 1:
+            raise ValueError("bins must be >= 1")
+        if not by:
+            return _summarize(self.table([score], where).column(score), bins)
+
+        _check_columns([by])
+        table = self.table([by, score], where)
+        groups = table.column(by)
+        return {
+            value: _summarize(table.filter(_group_mask(groups, value)).column(score), bins)
+            for value in sorted(pc.unique(groups).to_pylist(), key=lambda value: (value is None, str(value)))
+        }
+
+
+def _summarize(scores: 'pa.ChunkedArray', bins: int) -> Dict[str, Any]:
+    scores = pc.drop_null(scores)
+    count = len(scores)
+    if not count:
+        return {"count": 0, "mean": None, "min": None, "max": None,
+                "p50": None, "p90": None, "p99": None, "histogram": [0] * bins}
+
+    p50, p90, p99 = pc.quantile(scores, q=[0.5, 0.9, 0.99]).to_pylist()
+    positions = pc.cast(pc.floor(pc.multiply(scores, bins / 10.0)), pa.int64())
+    positions = pc.min_element_wise(pc.max_element_wise(positions, 0), bins - 1)
+    histogram = [0] * bins
+    for entry in pc.value_counts(positions).to_pylist():
+        histogram[entry['values']] = entry['counts']
+
+    extremes = pc.min_max(scores).as_py()
+    return {
+        "count": count,
+        "mean": round(pc.mean(scores).as_py(), 4),
+        "min": extremes['min'],
+        "max": extremes['max'],
+        "p50": p50,
+        "p90": p90,
+        "p99": p99,
+        "histogram": histogram,
+    }
+
+
+def _group_mask(groups: 'pa.ChunkedArray', value: Any) -> 'pa.ChunkedArray':
+    if value is None:
+        return pc.is_null(groups)
+    return pc.fill_null(pc.equal(groups, value), False)
+
+
+# Dashboards list thresholds best-first
+_THRESHOLDS = ('Production', 'Marginal', 'Insufficient')
+
+
+def _threshold_order(row: Dict[str, Any]) -> tuple:
+    threshold = row['threshold']
+    return (_THRESHOLDS.index(threshold) if threshold in _THRESHOLDS else len(_THRESHOLDS), str(threshold))
+
+
+def _check_columns(columns: Sequence[str]) -> None:
+    unknown = [name for name in columns if name not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown} (expected any of {COLUMNS})")
+
+
+def _filter(where: Optional[Dict[str, Any]]) -> Optional['ds.Expression']:
+    """Compiles a where dict into a dataset filter expression (None = all rows)."""
+    if not where:
+        return None
+    _check_columns(list(where))
+
+    expression = None
+    for column, condition in where.items():
+        field = ds.field(column)
+        if isinstance(condition, tuple):
+            op, value = condition
+            if op not in _OPERATORS:
+                raise ValueError(f"Unknown operator for {column}: {op} (expected one of {tuple(_OPERATORS)})")
+            term = _OPERATORS[op](field, value)
+        elif isinstance(condition, (list, set, frozenset)):
+            term = field.isin(list(condition))
+        elif condition is None:
+            term = field.is_null()
+        else:
+            term = field == condition
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def ingest_jsonl(results_path: str, store_path: str, row_group_size: int = 65536) -> int:
+    """
+    Loads validation results JSONL (gemini-validate or validate_jsonl output) into a store.
+
+    Returns:
+        Number of rows written (unreadable lines are skipped)
+    """
+    from stream_validator import iter_jsonl
+
+    with ResultStoreWriter(store_path, row_group_size) as writer:
+        for _, record in iter_jsonl(results_path):
+            if isinstance(record, dict):
+                writer.append(record)
+    return writer.rows_written
+
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+    from datetime import timedelta
+
+    if len(sys.argv) == 3:
+        print(f"{ingest_jsonl(sys.argv[1], sys.argv[2])} rows written to {sys.argv[2]}")
+        sys.exit(0)
+
+    from batch_validator import validate_batch
+    from synthetic_outputs import generate_corpus, PRESETS
+
+    corpus = [
+        output
+        for seed, preset in enumerate(PRESETS) if preset != 'pathological'
+        for output in generate_corpus(preset, count=300, seed=seed)
+    ]
+
+    with tempfile.TemporaryDirectory() as store_path:
+        start = time.perf_counter()
+        with ResultStoreWriter(store_path, row_group_size=256) as writer:
+            for output, item in zip(corpus, validate_batch(corpus, total_dimensions=10, workers=0)):
+                writer.append(item, run_metadata_of(output))
+        elapsed = time.perf_counter() - start
+
+        store = ResultStore(store_path)
+        month_ago = datetime.now() - timedelta(days=30)
+        marginal = store.rows(
+            columns=['correlation_id', 'preset_used', 'freshness', 'average'],
+            where={'threshold': 'Marginal', 'freshness': ('<', 5), 'validated_at': ('>=', month_ago)}
+        )
+
+        print("Columnar Result Store:")
+        print(f"Wrote {store.count()} rows in {elapsed:.2f}s "
+              f"({os.path.getsize(store.files()[0]) / 1024:.0f} KiB)")
+        print(f"Marginal with freshness < 5 in the last 30 days: {len(marginal)}")
+        for preset, thresholds in store.threshold_distribution(by='preset_used').items():
+            print(f"  {preset:24s} {thresholds}")
+        summary = store.score_distribution('average')
+        print(f"Average score: mean {summary['mean']}, p50 {summary['p50']}, p90 {summary['p90']}")
+        print(f"Histogram: {summary['histogram']}")
@@ -0,0 +1,304 @@
+"""
+Cross-Document Source Index for Gemini Research Prompt v4.8.1
+
+Each output's sources map is validated on its own, so the same publisher /
+URL / title reappears under different local ids in thousands of outputs, and
+each copy's date is parsed again. SourceIndex interns source entries across
+a corpus: every distinct source is stored once as a records.Source (date
+pre-parsed to an ordinal, is_primary / independent flags typed), and each
+output's sources map points its local ids at the shared records.
+
+Sources are identified by normalized URL, or by a fingerprint of publisher
+and title when there is no URL. Copies of one source whose fields differ
+(e.g. a different date) are kept as separate variants, so interning never
+changes a validation result.
+
+Interned outputs go straight to the validators: _compute_freshness and
+combined_validator.build_index read the pre-parsed date ordinals, and
+traceability's source-existence check looks local ids up in the interned map.
+
+The index can be persisted to SQLite and reopened for the next corpus run.
+
+Usage:
+    from source_index import SourceIndex
+
+    index = SourceIndex(path='sources.sqlite')
+    for gemini_output in corpus:
+        output = index.index_output(gemini_output)
+        quality_results = validate_research_quality(output, total_dimensions=10)
+    index.close()
+
+    print(index.stats())   # {'sources': 1843, 'references': 96410, ...}
+    index.lookup(url='https://docs.anthropic.com/memory/')
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from records import ResearchOutput, Source, _intern
+
+
+# Query parameters that never change which document a URL points to
+_TRACKING_PARAMS = ('utm_', 'ref', 'fbclid', 'gclid')
+
+_DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+# Rows are committed to disk in batches of this many new sources
+_COMMIT_EVERY = 1000
+
+
+class SourceIndex:
+    """
+    Corpus-wide interning table of source records.
+
+    Args:
+        path: SQLite file to load from and persist to (None = memory only)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._records: Dict[Tuple[Optional[str], Tuple], Source] = {}
+        self._by_identity: Dict[str, List[Source]] = {}
+        self._url_keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stats = {"references": 0, "hits": 0, "unhashable": 0}
+        self._pending = 0
+
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sources ("
+                " identity TEXT,"
+                " fields TEXT NOT NULL,"
+                " date_ordinal INTEGER NOT NULL,"
+                " PRIMARY KEY (identity, fields))"
+            )
+            self._db.commit()
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def intern(self, source: Dict[str, Any]) -> Source:
+        """
+        Returns the shared record for a source entry, adding it on first sight.
+
+        Args:
+            source: One sources entry (JSON dict or records.Source)
+        """
+        fields = tuple(source.get(name) for name in Source._FIELDS)
+        try:
+            hash(fields)
+        except TypeError:
+            # Nested values (lists, dicts) - compact but not shared
+            self._stats["unhashable"] += 1
+            return source if isinstance(source, Source) else Source.from_dict(source)
+
+        with self._lock:
+            self._stats["references"] += 1
+            identity = self._identity(fields)
+            record = self._records.get((identity, fields))
+            if record is not None:
+                self._stats["hits"] += 1
+                return record
+
+            record = source if isinstance(source, Source) else Source.from_dict(source)
+            self._add(identity, fields, record)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO sources (identity, fields, date_ordinal) VALUES (?, ?, ?)",
+                    (identity, json.dumps(fields, ensure_ascii=False), record.date_ordinal)
+                )
+                self._pending += 1
+                if self._pending >= _COMMIT_EVERY:
+                    self._db.commit()
+                    self._pending = 0
+            return record
+
+    def intern_sources(self, sources: Dict[str, Any]) -> Dict[str, Source]:
+        """Maps each local source id to its shared record."""
+        return {_intern(source_id): self.intern(source) for source_id, source in sources.items()}
+
+    def index_output(self, gemini_output: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns gemini_output with its sources map interned.
+
+        Dict outputs are shallow-copied (the input is not modified);
+        records.ResearchOutput inputs give a ResearchOutput.
+        """
+        sources = gemini_output.get('sources')
+        if not sources:
+            return gemini_output
+
+        interned = self.intern_sources(sources)
+        if isinstance(gemini_output, ResearchOutput):
+            return ResearchOutput(
+                executive_summary=gemini_output.executive_summary,
+                key_findings=gemini_output.key_findings,
+                sources=interned,
+                meta=gemini_output.meta
+            )
+        return {**gemini_output, 'sources': interned}
+
+    def index_corpus(self, outputs: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Lazily interns the sources of each output in a corpus."""
+        for gemini_output in outputs:
+            yield self.index_output(gemini_output)
+
+    def lookup(
+        self,
+        url: Optional[str] = None,
+        title: Optional[str] = None,
+        publisher: Optional[str] = None
+    ) -> List[Source]:
+        """Every variant of the source with this URL (or, without a URL, publisher and title)."""
+        with self._lock:
+            if url:
+                identity = self._url_key(url)
+            elif title:
+                identity = title_fingerprint(publisher, title)
+            else:
+                return []
+            return list(self._by_identity.get(identity, ()))
+
+    def flush(self) -> None:
+        """Commits sources added since the last commit."""
+        with self._lock:
+            if self._db is not None and self._pending:
+                self._db.commit()
+                self._pending = 0
+
+    def close(self) -> None:
+        """Commits and closes the SQLite file (the in-memory index stays usable)."""
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dictionary containing sources (distinct records), identities,
+            references (entries interned), hits (references that reused a
+            record) and unhashable (entries that could not be shared)
+        """
+        with self._lock:
+            return {
+                "sources": len(self._records),
+                "identities": len(self._by_identity),
+                **self._stats,
+            }
+
+    def _identity(self, fields: Tuple) -> Optional[str]:
+        """Identity key from the url / title / publisher in Source._FIELDS order."""
+        record = dict(zip(Source._FIELDS, fields))
+        url = record['url']
+        if url and isinstance(url, str):
+            return self._url_key(url)
+        title = record['title']
+        if title and isinstance(title, str):
+            return title_fingerprint(record['publisher'], title)
+        return None
+
+    def _url_key(self, url: str) -> str:
+        """Memoized normalize_url (the same URLs recur across the corpus)."""
+        key = self._url_keys.get(url)
+        if key is None:
+            key = self._url_keys[url] = 'url:' + normalize_url(url)
+        return key
+
+    def _add(self, identity: Optional[str], fields: Tuple, record: Source) -> None:
+        self._records[(identity, fields)] = record
+        if identity is not None:
+            self._by_identity.setdefault(identity, []).append(record)
+
+    def _load(self) -> None:
+        """Rebuilds the in-memory index from SQLite without re-parsing dates."""
+        for identity, fields_json, date_ordinal in self._db.execute(
+            "SELECT identity, fields, date_ordinal FROM sources"
+        ):
+            fields = tuple(json.loads(fields_json))
+            source = dict(zip(Source._FIELDS, fields))
+            record = Source(
+                publisher=_intern(source['publisher']),
+                publisher_type=_intern(source['publisher_type']),
+                is_primary=source['is_primary'],
+                independent=source['independent'],
+                title=source['title'],
+                date_ordinal=date_ordinal,
+                raw_date=source['date'] if date_ordinal <= 0 else None,
+                url=source['url'],
+                modality=_intern(source['modality']),
+                alt=source['alt'],
+                page=source['page']
+            )
+            self._add(identity, fields, record)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a source URL for identity comparisons.
+
+    Drops the scheme, "www.", default ports, fragments, trailing slashes and
+    tracking query parameters; lowercases the host; sorts the query.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:  # Non-numeric port - keep the host only
+        port = None
+    if port is not None and str(port) != _DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(_TRACKING_PARAMS)
+    )
+    normalized = host + (parts.path.rstrip('/') or '')
+    if query:
+        normalized += '?' + urlencode(query)
+    return normalized
+
+
+def title_fingerprint(publisher: Optional[str], title: str) -> str:
+    """Identity key for URL-less sources: lowercased alphanumeric words of publisher and title."""
+    def words(text: Optional[str]) -> str:
+        if not isinstance(text, str):
+            return ''
+        return ' '.join(''.join(c if c.isalnum() else ' ' for c in text.lower()).split())
+    return f"title:{words(publisher)}|{words(title)}"
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    from quality_validator import validate_research_quality
+    from synthetic_outputs import generate_corpus
+
+    # Archive runs re-validate the same outputs; the second pass reuses every source
+    corpus = generate_corpus('tier2_standard_report', count=2000, seed=5)
+    index = SourceIndex()
+
+    for run in (1, 2):
+        start = time.perf_counter()
+        interned_corpus = list(index.index_corpus(corpus))
+        print(f"Run {run}: interned {len(corpus)} outputs in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    mismatches = sum(
+        1 for original, interned in zip(corpus, interned_corpus)
+        if validate_research_quality(original, 10)['quality_assessment']
+        != validate_research_quality(interned, 10)['quality_assessment']
+    )
+
+    print("Source Index:")
+    print(f"Stats: {index.stats()}")
+    print(f"Result mismatches vs. uninterned: {mismatches}")
@@ -0,0 +1,187 @@
+"""
+Streaming JSONL Validator for Gemini Research Prompt v4.8.1
+
+Reads Gemini outputs stored one JSON object per line (JSONL / NDJSON,
+optionally gzip-compressed), validates each record with validate_traceability
+and validate_research_quality, and writes the results back as JSONL while the
+input is still being read.
+
+Only one record is held in memory at a time, so multi-GB orchestrator logs can
+be re-scored without loading them first. A malformed line - invalid JSON, or
+a JSON object the validators cannot score - produces an ERROR record and the
+stream carries on.
+
+Usage:
+    from stream_validator import validate_jsonl
+
+    summary = validate_jsonl(
+        'gemini_outputs.jsonl.gz',
+        'validation_results.jsonl',
+        total_dimensions=10
+    )
+    print(f"{summary['records']} records, {summary['errors']} unreadable lines")
+"""
+
+import gzip
+import json
+import sys
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, Any, IO, Tuple
+
+from batch_validator import validate_document, _create_error_results
+from fast_decode import GZIP_MAGIC, decode_output
+from freshness import DEFAULT_POLICY, FreshnessPolicy
+
+
+def iter_jsonl(
+    path: str,
+    decoder: Callable[[bytes], Any] = json.loads
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Lazily reads a JSONL file, one record at a time.
+
+    Args:
+        path: Path to a .jsonl file (gzip detected from the file header),
+              or '-' for stdin
+        decoder: Decodes one raw line (e.g. fast_decode.decode_output to keep
+                 only the fields the validators read)
+
+    Yields:
+        (line_number, record) tuples. Lines that are not valid JSON yield
+        the ValueError raised while decoding instead of a record, so the
+        caller decides how to report them. Blank lines are skipped.
+    """
+    with _open_input(path) as f:
+        for line_number, raw_line in enumerate(f, start=1):
+            if not raw_line.strip():
+                continue
+            try:
+                yield line_number, decoder(raw_line)
+            except ValueError as e:
+                yield line_number, e
+
+
+def validate_records(
+    records: Iterable[Tuple[int, Any]],
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    freshness_policy: Optional[FreshnessPolicy] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validates (line_number, record) pairs as produced by iter_jsonl.
+
+    The freshness reference time is frozen when iteration starts, so a
+    long-running stream scores every record against the same cutoff.
+
+    Yields:
+        Dictionary per record containing:
+        - line: Line number of the record in the input
+        - traceability: Result of validate_traceability
+        - quality: Result of validate_research_quality
+    """
+    policy = (freshness_policy or DEFAULT_POLICY).frozen()
+    for line_number, record in records:
+        if isinstance(record, ValueError):
+            results = _create_error_results(f"Malformed JSON on line {line_number}: {record}")
+        elif not isinstance(record, dict):
+            results = _create_error_results(f"Line {line_number} is not a JSON object")
+        else:
+            try:
+                results = validate_document(record, total_dimensions, freshness_applicable, policy)
+            except Exception as e:
+                # Valid JSON but not a usable output (e.g. meta: null); keep streaming
+                results = _create_error_results(f"Line {line_number} could not be validated: {type(e).__name__}: {e}")
+
+        yield {"line": line_number, **results}
+
+
+def validate_jsonl(
+    input_path: str,
+    output_path: str,
+    total_dimensions: int,
+    freshness_applicable: bool = True,
+    freshness_policy: Optional[FreshnessPolicy] = None
+) -> Dict[str, int]:
+    """
+    Validates every record of a JSONL file and writes results as JSONL.
+
+    Results are written as soon as each record is validated, so output
+    appears incrementally and a partial file is usable if the run stops.
+
+    Args:
+        input_path: Input .jsonl / .jsonl.gz file, or '-' for stdin
+        output_path: Output .jsonl file (.gz suffix writes gzip), or '-' for stdout
+        total_dimensions: Passed through to validate_research_quality
+        freshness_applicable: Passed through to validate_research_quality
+        freshness_policy: Passed through to validate_records
+
+    Returns:
+        Dictionary containing:
+        - records: Number of records written
+        - errors: Number of lines that could not be decoded
+    """
+    counts = {"records": 0, "errors": 0}
+
+    def _counted(records: Iterable[Tuple[int, Any]]) -> Iterator[Tuple[int, Any]]:
+        for line_number, record in records:
+            if isinstance(record, ValueError):
+                counts["errors"] += 1
+            yield line_number, record
+
+    with _open_output(output_path) as out:
+        records = _counted(iter_jsonl(input_path, decoder=decode_output))
+        for result in validate_records(records, total_dimensions, freshness_applicable, freshness_policy):
+            out.write(json.dumps(result, ensure_ascii=False))
+            out.write('\n')
+            counts["records"] += 1
+
+    return counts
+
+
+@contextmanager
+def _open_input(path: str) -> Iterator[IO[bytes]]:
+    """Opens a JSONL input for binary line iteration, transparently gunzipping."""
+    if path == '-':
+        stream = sys.stdin.buffer
+        owned = False
+    else:
+        stream = open(path, 'rb')
+        owned = True
+
+    try:
+        if stream.peek(2)[:2] == GZIP_MAGIC:
+            with gzip.GzipFile(fileobj=stream, mode='rb') as gz:
+                yield gz
+        else:
+            yield stream
+    finally:
+        if owned:
+            stream.close()
+
+
+@contextmanager
+def _open_output(path: str, mode: str = 'w') -> Iterator[IO[str]]:
+    """Opens a JSONL output for text writing ('w') or appending ('a'), gzip-compressing on .gz suffix."""
+    if path == '-':
+        yield sys.stdout
+        sys.stdout.flush()
+    elif path.endswith('.gz'):
+        with gzip.open(path, mode + 't', encoding='utf-8') as f:
+            yield f
+    else:
+        with open(path, mode, encoding='utf-8') as f:
+            yield f
+
+
+# Example usage
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python stream_validator.py INPUT.jsonl[.gz] OUTPUT.jsonl [total_dimensions]")
+        sys.exit(2)
+
+    dimensions = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    summary = validate_jsonl(sys.argv[1], sys.argv[2], total_dimensions=dimensions)
+
+    print("Streaming Validation Results:", file=sys.stderr)
+    print(f"Records written: {summary['records']}", file=sys.stderr)
+    print(f"Malformed lines: {summary['errors']}", file=sys.stderr)
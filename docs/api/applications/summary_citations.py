@@ -0,0 +1,190 @@
+"""
+Summary Citation Extractor for Gemini Research Prompt v4.8.1
+
+executive_summary entries follow "N. text [id, id]." (items without sources
+omit the brackets). Splitting on the first '[' loses the citation list and
+cuts any text that itself contains brackets ("Use the [beta] flag [3]."),
+and checking startswith('1.') also strips the "1." of "1.5 million ...".
+
+parse_summary_item tokenizes one entry in a single left-to-right pass plus a
+short backward scan over the line ending, without regular expressions and
+without building intermediate substrings:
+
+- item number: leading digits followed by '.' (and not by another digit)
+- citations: the final bracketed group, optionally followed by punctuation;
+  ids are comma-separated and whitespace-trimmed
+- text: everything between the two, whitespace-trimmed, as offsets into the
+  original string (item.text(line) slices it when needed); brackets inside
+  the text are kept
+
+Only the citation ids are materialized as strings.
+
+Usage:
+    from summary_citations import parse_summary_item, parse_summary, parse_summaries
+
+    line = "1. Use the [beta] flag [1, 3]."
+    item = parse_summary_item(line)
+    item.number, item.text(line), item.citations   # 1, 'Use the [beta] flag', ('1', '3')
+
+    items = parse_summary(gemini_output['executive_summary'])
+    per_output = parse_summaries(gemini_outputs)
+"""
+
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+
+# Characters allowed after the citation group ("... [1, 2].")
+_TRAILING = frozenset('.;:,!?')
+
+
+class SummaryItem(NamedTuple):
+    """
+    One tokenized executive_summary entry. Offsets index the original string;
+    citation_start / citation_end span the bracketed group ('[' to ']'
+    inclusive), or are -1 when there is none.
+    """
+    number: Optional[int]
+    text_start: int
+    text_end: int
+    citations: Tuple[str, ...]
+    citation_start: int
+    citation_end: int
+
+    def text(self, line: str) -> str:
+        """The item text (without number and citations) of the line this item was parsed from."""
+        return line[self.text_start:self.text_end]
+
+
+_EMPTY = SummaryItem(None, 0, 0, (), -1, -1)
+
+
+def parse_summary_item(line: Any) -> SummaryItem:
+    """
+    Tokenizes one executive_summary entry.
+
+    Non-string entries give an item with no number, empty text and no citations.
+    """
+    if not isinstance(line, str):
+        return _EMPTY
+    end = len(line)
+
+    # Leading whitespace and item number
+    position = 0
+    while position < end and line[position].isspace():
+        position += 1
+    number = None
+    digits_end = position
+    while digits_end < end and '0' <= line[digits_end] <= '9':
+        digits_end += 1
+    if (digits_end > position and digits_end < end and line[digits_end] == '.'
+            and not (digits_end + 1 < end and '0' <= line[digits_end + 1] <= '9')):
+        number = int(line[position:digits_end])
+        position = digits_end + 1
+        while position < end and line[position].isspace():
+            position += 1
+    text_start = position
+
+    # Line ending: skip whitespace and trailing punctuation back to a ']'
+    tail = end
+    while tail > text_start and (line[tail - 1].isspace() or line[tail - 1] in _TRAILING):
+        tail -= 1
+
+    citations: Tuple[str, ...] = ()
+    citation_start = citation_end = -1
+    text_end = end
+    if tail > text_start and line[tail - 1] == ']':
+        open_bracket = line.rfind('[', text_start, tail - 1)
+        if open_bracket >= 0:
+            citation_start, citation_end = open_bracket, tail
+            citations = _split_ids(line, open_bracket + 1, tail - 1)
+            text_end = open_bracket
+
+    while text_end > text_start and line[text_end - 1].isspace():
+        text_end -= 1
+    return SummaryItem(number, text_start, text_end, citations, citation_start, citation_end)
+
+
+def _split_ids(line: str, start: int, end: int) -> Tuple[str, ...]:
+    """Comma-separated ids in line[start:end], trimmed, empty entries dropped."""
+    ids = []
+    while start <= end:
+        comma = line.find(',', start, end)
+        if comma < 0:
+            comma = end
+        id_start, id_end = start, comma
+        while id_start < id_end and line[id_start].isspace():
+            id_start += 1
+        while id_end > id_start and line[id_end - 1].isspace():
+            id_end -= 1
+        if id_end > id_start:
+            ids.append(line[id_start:id_end])
+        start = comma + 1
+    return tuple(ids)
+
+
+def parse_summary(executive_summary: Sequence[Any]) -> List[SummaryItem]:
+    """Tokenizes every entry of one executive_summary."""
+    return [parse_summary_item(line) for line in executive_summary]
+
+
+def parse_summaries(outputs: Iterable[Any]) -> List[List[SummaryItem]]:
+    """parse_summary for the executive_summary of each output (missing or malformed → [])."""
+    results = []
+    for gemini_output in outputs:
+        summary = gemini_output.get('executive_summary') if isinstance(gemini_output, dict) else None
+        results.append(parse_summary(summary) if isinstance(summary, list) else [])
+    return results
+
+
+def summary_text(line: Any) -> str:
+    """
+    Text of an executive_summary entry without its item number and citations.
+
+    Same result as parse_summary_item(line).text(line), but text-only: the
+    citation ids are never split out, which keeps it cheap enough for the
+    validate_traceability hot path.
+    """
+    if not isinstance(line, str):
+        return ''
+    text = line.lstrip()
+
+    # Item number: leading ASCII digits, then '.' not followed by a digit
+    dot = text.find('.')
+    if (dot > 0 and text[:dot].isascii() and text[:dot].isdigit()
+            and not (dot + 1 < len(text) and '0' <= text[dot + 1] <= '9')):
+        text = text[dot + 1:].lstrip()
+
+    # Final bracketed citation group, optionally followed by punctuation
+    tail = len(text)
+    while tail > 0 and (text[tail - 1].isspace() or text[tail - 1] in _TRAILING):
+        tail -= 1
+    if tail > 0 and text[tail - 1] == ']':
+        open_bracket = text.rfind('[', 0, tail - 1)
+        if open_bracket >= 0:
+            return text[:open_bracket].rstrip()
+    return text.rstrip()
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    from synthetic_outputs import generate_corpus
+
+    for line in (
+        "1. Desktop Memory synthesizes chats automatically [1, 2].",
+        "2. Use the [beta] memory flag before enabling sync [3].",
+        "3. 1.5 million users have Code Memory enabled [4,5]",
+        "5. No significant risks identified.",
+    ):
+        item = parse_summary_item(line)
+        print(f"{item.number!s:>4}  {item.text(line)!r:58} {item.citations}")
+
+    corpus = generate_corpus('tier1_deep_dive', count=2000, seed=6)
+    start = time.perf_counter()
+    parsed = parse_summaries(corpus)
+    elapsed = time.perf_counter() - start
+    lines = sum(len(items) for items in parsed)
+    citations = sum(len(item.citations) for items in parsed for item in items)
+    print(f"{lines} summary lines, {citations} citations in {elapsed * 1e3:.1f} ms "
+          f"({elapsed / lines * 1e6:.2f} µs/line)")
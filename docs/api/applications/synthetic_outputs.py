@@ -0,0 +1,252 @@
+"""
+Synthetic Gemini Output Generator for Gemini Research Prompt v4.8.1
+
+Generates realistic outputs matching the OUTPUT schema of v4.8.1_api_prompt.md
+at each preset's documented scale, for benchmarking and load testing the
+validators without a live Gemini service.
+
+Presets (findings / sources from the prompt's "Expected Output"):
+- tier1_deep_dive: 15-25 findings, 8+ sources, extended thinking summary
+- tier2_standard_report: 10-15 findings, 5+ sources
+- tier3_fast_summary: 3-8 findings, few sources
+- multimodal_analysis: tier2 scale with image/pdf sources
+- pathological: 10,000 findings, 2,000 sources, very long executive_summary entries
+
+Generation is deterministic for a given seed.
+
+Usage:
+    from synthetic_outputs import generate_output, generate_corpus
+
+    output = generate_output('tier1_deep_dive', seed=42)
+    corpus = generate_corpus('tier2_standard_report', count=1000, seed=7)
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Any
+
+
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "tier1_deep_dive": {
+        "findings": (15, 25), "sources": (8, 14), "disagreements": (1, 4),
+        "summary_words": (12, 30), "thinking_summary_chars": 6000,
+        "modalities": ["text", "pdf"], "thinking_budget": "extended",
+    },
+    "tier2_standard_report": {
+        "findings": (10, 15), "sources": (5, 9), "disagreements": (0, 3),
+        "summary_words": (10, 24), "thinking_summary_chars": 0,
+        "modalities": ["text", "pdf"], "thinking_budget": "standard",
+    },
+    "tier3_fast_summary": {
+        "findings": (3, 8), "sources": (2, 5), "disagreements": (0, 1),
+        "summary_words": (8, 18), "thinking_summary_chars": 0,
+        "modalities": ["text"], "thinking_budget": "standard",
+    },
+    "multimodal_analysis": {
+        "findings": (10, 18), "sources": (5, 10), "disagreements": (0, 3),
+        "summary_words": (10, 24), "thinking_summary_chars": 4000,
+        "modalities": ["image", "pdf", "text"], "thinking_budget": "extended",
+    },
+    "pathological": {
+        "findings": (10000, 10000), "sources": (2000, 2000), "disagreements": (200, 200),
+        "summary_words": (2000, 4000), "thinking_summary_chars": 200000,
+        "modalities": ["text", "pdf", "image", "audio"], "thinking_budget": "extended",
+    },
+}
+
+_TOPICS = [
+    "Desktop Memory", "Code Memory", "Git handoff", "Session state", "Context window",
+    "Tool permissions", "Checkpoint recovery", "Prompt caching", "Agent SDK", "Search grounding",
+    "Token budget", "Multimodal input", "Persona routing", "Quality gates", "Decision log",
+]
+_VERBS = ["uses", "requires", "supports", "limits", "integrates with", "replaces", "depends on", "exposes"]
+_OBJECTS = [
+    "automatic chat synthesis", "CLAUDE.md file hierarchy", "manual coordination", "24-hour update cycles",
+    "structured commit messages", "per-project configuration", "explicit user approval", "incremental indexing",
+    "cross-platform handoff protocols", "schema-validated JSON output", "long-context retrieval",
+]
+_PUBLISHERS = [
+    ("Anthropic", "official"), ("Anthropic Docs", "official"), ("Google AI", "vendor_primary"),
+    ("GitHub", "vendor_primary"), ("arXiv", "peer_reviewed"), ("ACM", "peer_reviewed"),
+    ("Medium", "secondary"), ("Stack Overflow", "secondary"), ("ClaudeWorkflow", "secondary"),
+]
+_STANCES = ["for", "against", "uncertain"]
+
+
+def generate_output(
+    preset: str = "tier2_standard_report",
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+    now: Optional[datetime] = None,
+    correlation_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Generates one synthetic Gemini output.
+
+    Args:
+        preset: One of PRESETS
+        seed: Seed for a private random generator (ignored if rng is given)
+        rng: Random generator to draw from (for generating corpora)
+        now: Reference time for source dates and timestamps (default datetime.now())
+        correlation_id: run_metadata.correlation_id (generated if omitted)
+
+    Returns:
+        Dictionary matching the v4.8.1 OUTPUT schema
+    """
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown preset: {preset} (expected one of {sorted(PRESETS)})")
+    spec = PRESETS[preset]
+    rng = rng or random.Random(seed)
+    now = now or datetime.now()
+
+    # Sources - mostly recent, some older than the 180-day freshness window
+    source_count = rng.randint(*spec["sources"])
+    sources: Dict[str, Any] = {}
+    for i in range(1, source_count + 1):
+        publisher, publisher_type = rng.choice(_PUBLISHERS)
+        modality = rng.choice(spec["modalities"])
+        age_days = int(rng.triangular(0, 720, 60))
+        source = {
+            "publisher": publisher,
+            "publisher_type": publisher_type,
+            "is_primary": publisher_type in ("official", "vendor_primary", "peer_reviewed"),
+            "independent": rng.random() < 0.8,
+            "title": f"{rng.choice(_TOPICS)} {rng.choice(['guide', 'specification', 'analysis', 'release notes'])}",
+            "date": (now - timedelta(days=age_days)).strftime('%Y-%m-%d'),
+            "url": f"https://example.com/{publisher.lower().replace(' ', '-')}/{i}",
+            "modality": modality,
+        }
+        if modality == "image":
+            source["alt"] = "Architecture diagram of the memory subsystem"
+        if modality == "pdf":
+            source["page"] = f"p. {rng.randint(1, 80)}"
+        sources[str(i)] = source
+    source_ids = list(sources)
+
+    # Findings - confidence follows the prompt's policy on primary/independent sources
+    finding_count = rng.randint(*spec["findings"])
+    findings: List[Dict[str, Any]] = []
+    for finding_id in range(1, finding_count + 1):
+        cited = rng.sample(source_ids, k=min(len(source_ids), rng.choice([1, 1, 2, 2, 3])))
+        strong = sum(1 for sid in cited if sources[sid]["is_primary"] and sources[sid]["independent"])
+        if strong >= 2:
+            confidence = "H"
+        elif strong == 1 or len(cited) > 1:
+            confidence = "M"
+        else:
+            confidence = "L"
+        findings.append({
+            "id": finding_id,
+            "text": f"{rng.choice(_TOPICS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}",
+            "source_ids": cited,
+            "confidence": confidence,
+        })
+
+    # Executive summary - exactly 8 items; items 1-4 cite sources
+    supporting = rng.sample(findings, k=min(len(findings), rng.randint(1, 3)))
+    answer_claim = _sentence(rng, spec["summary_words"])
+    answer_sources = sorted({sid for f in supporting for sid in f["source_ids"]}, key=int)
+    executive_summary = [f"1. {answer_claim} [{', '.join(answer_sources)}]."]
+    for item in range(2, 5):
+        cited = rng.sample(source_ids, k=min(len(source_ids), 2))
+        executive_summary.append(f"{item}. {_sentence(rng, spec['summary_words'])} [{', '.join(cited)}].")
+    for item in range(5, 9):
+        executive_summary.append(f"{item}. {_sentence(rng, spec['summary_words'])}.")
+
+    disagreements = []
+    for _ in range(rng.randint(*spec["disagreements"])):
+        disagreements.append({
+            "claim": f"{rng.choice(_TOPICS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}",
+            "sources_for": rng.sample(source_ids, k=1),
+            "sources_against": rng.sample(source_ids, k=1),
+            "final_stance": rng.choice(_STANCES),
+            "confidence": rng.choice("HML"),
+            "rationale": "Primary documentation outweighs secondary reports.",
+        })
+
+    started = now - timedelta(minutes=rng.randint(2, 15))
+    return {
+        "executive_summary": executive_summary,
+        "key_findings": findings,
+        "patterns": [
+            {
+                "structure": "Desktop → Code Handoff Protocol",
+                "steps": ["1. Desktop: Update SESSION.md", "2. Desktop: Git commit", "3. Code: Read SESSION.md"],
+                "example": "After planning session, Desktop commits then Code implements",
+            }
+            for _ in range(rng.randint(1, 3))
+        ],
+        "sources": sources,
+        "meta": {
+            "thinking_summary": "x" * spec["thinking_summary_chars"] if spec["thinking_summary_chars"] else "brief plan",
+            "disagreements": disagreements,
+            "traceability_data": {
+                "answer_claim": answer_claim,
+                "supporting_finding_ids": [f["id"] for f in supporting],
+            },
+            "calibration_note": "Synthetic output for benchmarking.",
+            "run_metadata": {
+                "prompt_version": "4.8.1",
+                "correlation_id": correlation_id or f"synthetic-{rng.getrandbits(48):012x}",
+                "preset_used": preset,
+                "model": "gemini-2.5-pro",
+                "params": {"temperature": 0.2, "topP": 0.9, "topK": 40, "thinking_budget": spec["thinking_budget"]},
+                "timestamps": {
+                    "started_aest": started.strftime('%Y-%m-%dT%H:%M'),
+                    "finished_aest": now.strftime('%Y-%m-%dT%H:%M'),
+                },
+                "token_usage": {
+                    "input": rng.randint(5000, 400000),
+                    "output": rng.randint(8000, 15000),
+                    "thoughts": rng.randint(2000, 16000),
+                },
+            },
+        },
+    }
+
+
+def generate_corpus(
+    preset: str = "tier2_standard_report",
+    count: int = 100,
+    seed: int = 0,
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Generates count outputs of one preset from a single seed."""
+    return list(iter_corpus(preset, count, seed, now))
+
+
+def iter_corpus(
+    preset: str = "tier2_standard_report",
+    count: int = 100,
+    seed: int = 0,
+    now: Optional[datetime] = None
+) -> Iterator[Dict[str, Any]]:
+    """Lazily generates count outputs of one preset (for corpora too large to hold)."""
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    for _ in range(count):
+        yield generate_output(preset, rng=rng, now=now)
+
+
+def _sentence(rng: random.Random, word_range: tuple) -> str:
+    """A summary sentence of roughly the given word count."""
+    words = []
+    target = rng.randint(*word_range)
+    while len(words) < target:
+        words.extend(f"{rng.choice(_TOPICS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}".split())
+    return ' '.join(words[:target])
+
+
+# Example usage
+if __name__ == "__main__":
+    import json
+
+    from combined_validator import validate_all
+
+    print("Synthetic Gemini Outputs:")
+    for name in PRESETS:
+        output = generate_output(name, seed=1)
+        results = validate_all(output, total_dimensions=len(_TOPICS))
+        print(f"  {name:22s} findings={len(output['key_findings']):5d} sources={len(output['sources']):4d} "
+              f"bytes={len(json.dumps(output)):9,d} threshold={results['quality']['threshold']:12s} "
+              f"traceability={results['traceability']['status']}")
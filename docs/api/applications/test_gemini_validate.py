@@ -0,0 +1,46 @@
+"""
+Poison-document regression test for gemini_validate.
+
+A document a validator raises on (here: a supporting finding without 'text')
+must get an error record rather than abort the run, and --resume must move
+past it.
+
+Usage:
+    python -m pytest test_gemini_validate.py
+"""
+
+import json
+
+import pytest
+
+from gemini_validate import run
+from synthetic_outputs import generate_corpus
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_poison_document_is_recorded_and_resume_moves_past_it(tmp_path, workers):
+    corpus = generate_corpus('tier1_deep_dive', count=5, seed=1)
+    poison = corpus[2]
+    supporting_id = poison['meta']['traceability_data']['supporting_finding_ids'][0]
+    for finding in poison['key_findings']:
+        if finding['id'] == supporting_id:
+            del finding['text']
+
+    inputs = tmp_path / "runs.jsonl"
+    inputs.write_text(''.join(json.dumps(output) + '\n' for output in corpus), encoding='utf-8')
+    output = tmp_path / "out.jsonl"
+
+    summary = run([str(inputs)], str(output), 10, workers=workers, progress=None)
+    records = {record['key']: record for record in map(json.loads, output.read_text(encoding='utf-8').splitlines())}
+
+    assert summary["validated"] == 5
+    assert len(records) == 5
+    bad = records[f"{inputs}:3"]
+    assert bad["error"].startswith("Validation failed: KeyError")
+    assert bad["traceability"]["status"] == "ERROR"
+    assert bad["quality"]["threshold"] == "Insufficient"
+    assert all("error" not in record for key, record in records.items() if key != f"{inputs}:3")
+
+    resumed = run([str(inputs)], str(output), 10, workers=workers, resume=True, progress=None)
+    assert resumed["validated"] == 0
+    assert resumed["skipped"] == 5
@@ -0,0 +1,464 @@
+"""
+Traceability Graph for Gemini Research Prompt v4.8.1
+
+validate_traceability only checks executive_summary[0] against
+meta.traceability_data.supporting_finding_ids. This module verifies the
+whole output: every summary item's "[source_id(s)]" citations, the answer's
+supporting findings, every finding's source_ids and every disagreement's
+sources_for / sources_against.
+
+The output is turned once into a claim → finding → source graph held in
+adjacency arrays (CSR offsets + targets, nodes numbered by position):
+
+- summary item → cited sources
+- finding → sources
+- disagreement → sources for / against
+- source → citing findings (reverse of finding → sources)
+
+A summary item is supported by the findings that cite the same sources
+(claim → source ← finding). The report is produced in one traversal that
+touches each edge a constant number of times - per-source best confidence
+and finding counts are computed first and summary items aggregate over their
+cited sources - so the cost stays linear in the size of the output even for
+large tier1 reports.
+
+Summary item status:
+- SUPPORTED: citations exist and are cited by an H or M finding
+- WEAK: cited sources are only backed by L findings
+- UNSUPPORTED: no finding cites any of the item's sources
+- BROKEN: a citation is not in sources
+- UNCITED: no citations (expected for risks / next steps, items 5-8)
+
+Usage:
+    from traceability_graph import TraceabilityGraph, validate_full_traceability
+
+    report = validate_full_traceability(gemini_output)
+    print(report['status'], report['unsupported_items'], report['orphan_sources'])
+
+    graph = TraceabilityGraph.from_output(gemini_output)
+    graph.supporting_findings(2)   # finding ids backing summary item 3
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Tuple
+
+import instrumentation
+from summary_citations import parse_summary_item
+from traceability_validator import _compute_aggregate_confidence, _get_metadata
+
+
+# Finding confidence codes; UNRATED covers anything that is not H/M/L
+CONFIDENCE_CODES = {'H': 0, 'M': 1, 'L': 2}
+UNRATED = 3
+_CONFIDENCE_LETTERS = ('H', 'M', 'L', 'None')
+
+MISSING = -1
+
+
+def _csr(node_count: int, sources: Sequence[int], targets: Sequence[int]) -> Tuple[array, array]:
+    """Adjacency arrays (offsets, targets) from an edge list, in two linear passes."""
+    offsets = array('l', [0]) * (node_count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for node in range(node_count):
+        offsets[node + 1] += offsets[node]
+    position = array('l', offsets[:-1])
+    ordered = array('l', [0]) * len(targets)
+    for source, target in zip(sources, targets):
+        ordered[position[source]] = target
+        position[source] += 1
+    return offsets, ordered
+
+
+class TraceabilityGraph:
+    """
+    Claim → finding → source graph of one Gemini output.
+
+    Build with TraceabilityGraph.from_output(). Nodes are positions:
+    summary items in executive_summary order, findings in key_findings order,
+    sources in sources order. MISSING (-1) marks references to ids that do
+    not exist.
+    """
+
+    def __init__(self):
+        self.item_numbers: List[Optional[int]] = []
+        self.item_texts: List[str] = []
+        self.item_citations: List[Tuple[str, ...]] = []
+        self.item_offsets = array('l', [0])
+        self.item_sources = array('l')
+
+        self.finding_ids: List[Any] = []
+        self.finding_confidence = array('b')
+        self.finding_offsets = array('l', [0])
+        self.finding_sources = array('l')
+        self.finding_source_ids: List[Any] = []
+
+        self.source_ids: List[str] = []
+        self.source_index: Dict[str, int] = {}
+        self.source_finding_offsets = array('l', [0])
+        self.source_findings = array('l')
+
+        self.answer_finding_ids: List[Any] = []
+        self.answer_findings = array('l')
+
+        self.disagreements: List[Dict[str, Any]] = []
+        self.disagreement_offsets = array('l', [0])
+        self.disagreement_sources = array('l')
+        self.disagreement_sides = array('b')  # 0 = sources_for, 1 = sources_against
+        self.disagreement_source_ids: List[str] = []
+
+    @classmethod
+    def from_output(cls, gemini_output: Dict[str, Any]) -> 'TraceabilityGraph':
+        """
+        Builds the graph (linear in the number of items, findings, sources and references).
+
+        Raises:
+            ValueError: executive_summary, key_findings or sources is missing or malformed
+        """
+        summary = gemini_output.get('executive_summary')
+        findings = gemini_output.get('key_findings')
+        sources = gemini_output.get('sources')
+        if not isinstance(summary, list):
+            raise ValueError("executive_summary must be a list")
+        if not isinstance(findings, list):
+            raise ValueError("key_findings must be a list")
+        if not isinstance(sources, dict):
+            raise ValueError("sources must be an object")
+        meta = gemini_output.get('meta', {})
+        meta = meta if isinstance(meta, dict) else {}
+
+        graph = cls()
+        for position, source_id in enumerate(sources):
+            graph.source_ids.append(source_id)
+            graph.source_index[source_id] = position
+        source_index = graph.source_index
+
+        for item in summary:
+            parsed = parse_summary_item(item)
+            graph.item_numbers.append(parsed.number)
+            graph.item_texts.append(parsed.text(item) if isinstance(item, str) else '')
+            graph.item_citations.append(parsed.citations)
+            for source_id in parsed.citations:
+                graph.item_sources.append(source_index.get(source_id, MISSING))
+            graph.item_offsets.append(len(graph.item_sources))
+
+        finding_index: Dict[Any, int] = {}
+        edge_sources = array('l')
+        edge_findings = array('l')
+        for position, finding in enumerate(findings):
+            finding = finding if isinstance(finding, dict) else {}
+            finding_id = finding.get('id')
+            graph.finding_ids.append(finding_id)
+            if _hashable(finding_id):
+                finding_index[finding_id] = position
+            confidence = finding.get('confidence')
+            graph.finding_confidence.append(
+                CONFIDENCE_CODES.get(confidence, UNRATED) if isinstance(confidence, str) else UNRATED
+            )
+            source_ids = finding.get('source_ids', [])
+            for source_id in (source_ids if isinstance(source_ids, list) else ()):
+                target = source_index.get(source_id, MISSING) if _hashable(source_id) else MISSING
+                graph.finding_sources.append(target)
+                graph.finding_source_ids.append(source_id)
+                if target != MISSING:
+                    edge_sources.append(target)
+                    edge_findings.append(position)
+            graph.finding_offsets.append(len(graph.finding_sources))
+
+        graph.source_finding_offsets, graph.source_findings = _csr(len(graph.source_ids), edge_sources, edge_findings)
+
+        traceability_data = meta.get('traceability_data', {})
+        traceability_data = traceability_data if isinstance(traceability_data, dict) else {}
+        supporting_ids = traceability_data.get('supporting_finding_ids', [])
+        for finding_id in (supporting_ids if isinstance(supporting_ids, list) else ()):
+            graph.answer_finding_ids.append(finding_id)
+            graph.answer_findings.append(finding_index.get(finding_id, MISSING) if _hashable(finding_id) else MISSING)
+
+        disagreements = meta.get('disagreements', [])
+        for disagreement in (disagreements if isinstance(disagreements, list) else ()):
+            disagreement = disagreement if isinstance(disagreement, dict) else {}
+            graph.disagreements.append(disagreement)
+            for side, key in enumerate(('sources_for', 'sources_against')):
+                source_ids = disagreement.get(key, [])
+                for source_id in (source_ids if isinstance(source_ids, list) else ()):
+                    target = source_index.get(source_id, MISSING) if _hashable(source_id) else MISSING
+                    graph.disagreement_sources.append(target)
+                    graph.disagreement_sides.append(side)
+                    graph.disagreement_source_ids.append(source_id)
+            graph.disagreement_offsets.append(len(graph.disagreement_sources))
+
+        return graph
+
+    def findings_citing(self, source_id: str) -> List[Any]:
+        """Ids of the findings that cite a source."""
+        source = self.source_index.get(source_id, MISSING)
+        if source == MISSING:
+            return []
+        start, end = self.source_finding_offsets[source], self.source_finding_offsets[source + 1]
+        return [self.finding_ids[finding] for finding in self.source_findings[start:end]]
+
+    def supporting_findings(self, item: int) -> List[Any]:
+        """Ids of the findings that cite any source cited by summary item (position) item."""
+        seen = set()
+        supporting = []
+        for source in self.item_sources[self.item_offsets[item]:self.item_offsets[item + 1]]:
+            if source == MISSING:
+                continue
+            start, end = self.source_finding_offsets[source], self.source_finding_offsets[source + 1]
+            for finding in self.source_findings[start:end]:
+                if finding not in seen:
+                    seen.add(finding)
+                    supporting.append(finding)
+        return [self.finding_ids[finding] for finding in sorted(supporting)]
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Verifies every reference in one traversal.
+
+        Returns:
+            Dictionary containing summary_items (per item: item, text,
+            citations, missing_citations, supporting_findings (count),
+            aggregate_confidence, status), unsupported_items, weak_items,
+            answer (supporting_finding_ids, missing_finding_ids,
+            uncovered_citations, aggregate_confidence), dangling_references,
+            disagreement_issues and orphan_sources
+        """
+        source_count = len(self.source_ids)
+        offsets = self.source_finding_offsets
+        referenced = bytearray(source_count)
+
+        # Per source: strongest confidence among citing findings
+        best_confidence = array('b', [UNRATED + 1]) * source_count
+        confidence = self.finding_confidence
+        for source in range(source_count):
+            start, end = offsets[source], offsets[source + 1]
+            if start != end:
+                referenced[source] = 1
+                best_confidence[source] = min(confidence[finding] for finding in self.source_findings[start:end])
+
+        summary_items = []
+        unsupported_items = []
+        weak_items = []
+        for item, citations in enumerate(self.item_citations):
+            start, end = self.item_offsets[item], self.item_offsets[item + 1]
+            missing = []
+            supporting = 0
+            strongest = UNRATED + 1
+            for citation, source in zip(citations, self.item_sources[start:end]):
+                if source == MISSING:
+                    missing.append(citation)
+                    continue
+                referenced[source] = 1
+                supporting += offsets[source + 1] - offsets[source]
+                strongest = min(strongest, best_confidence[source])
+
+            if not citations:
+                status = "UNCITED"
+            elif missing:
+                status = "BROKEN"
+            elif not supporting:
+                status = "UNSUPPORTED"
+            elif strongest > CONFIDENCE_CODES['M']:
+                status = "WEAK"
+            else:
+                status = "SUPPORTED"
+            number = self.item_numbers[item]
+            label = number if number is not None else item + 1
+            if status in ("BROKEN", "UNSUPPORTED"):
+                unsupported_items.append(label)
+            elif status == "WEAK":
+                weak_items.append(label)
+
+            summary_items.append({
+                "item": label,
+                "text": self.item_texts[item],
+                "citations": list(citations),
+                "missing_citations": missing,
+                # Citing references (a finding citing two of the item's sources counts twice)
+                "supporting_findings": supporting,
+                "aggregate_confidence": _CONFIDENCE_LETTERS[min(strongest, UNRATED)] if supporting else "None",
+                "status": status,
+            })
+
+        dangling = [
+            {"finding_id": self.finding_ids[finding], "source_id": self.finding_source_ids[edge]}
+            for finding in range(len(self.finding_ids))
+            for edge in range(self.finding_offsets[finding], self.finding_offsets[finding + 1])
+            if self.finding_sources[edge] == MISSING
+        ]
+
+        answer = self._answer_report()
+
+        disagreement_issues = []
+        for position, disagreement in enumerate(self.disagreements):
+            start, end = self.disagreement_offsets[position], self.disagreement_offsets[position + 1]
+            sides: Tuple[set, set] = (set(), set())
+            missing = []
+            for edge in range(start, end):
+                source = self.disagreement_sources[edge]
+                if source == MISSING:
+                    missing.append(self.disagreement_source_ids[edge])
+                else:
+                    referenced[source] = 1
+                    sides[self.disagreement_sides[edge]].add(source)
+
+            issues = []
+            if missing:
+                issues.append(f"Sources not found: {missing}")
+            conflicting = [self.source_ids[source] for source in sorted(sides[0] & sides[1])]
+            if conflicting:
+                issues.append(f"Sources on both sides: {conflicting}")
+            stance = disagreement.get('final_stance')
+            if stance == 'for' and not sides[0]:
+                issues.append("final_stance is 'for' but no valid sources_for")
+            elif stance == 'against' and not sides[1]:
+                issues.append("final_stance is 'against' but no valid sources_against")
+            if issues:
+                disagreement_issues.append({
+                    "index": position,
+                    "claim": disagreement.get('claim', ''),
+                    "issues": issues,
+                })
+
+        return {
+            "summary_items": summary_items,
+            "unsupported_items": unsupported_items,
+            "weak_items": weak_items,
+            "answer": answer,
+            "dangling_references": dangling,
+            "disagreement_issues": disagreement_issues,
+            "orphan_sources": [self.source_ids[source] for source in range(source_count) if not referenced[source]],
+        }
+
+    def _answer_report(self) -> Dict[str, Any]:
+        """Checks meta.traceability_data against the graph: supporting findings exist and back item 1's citations."""
+        missing_ids = [
+            finding_id for finding_id, finding in zip(self.answer_finding_ids, self.answer_findings)
+            if finding == MISSING
+        ]
+        supported_sources = set()
+        confidences = []
+        for finding in self.answer_findings:
+            if finding == MISSING:
+                continue
+            confidences.append(_CONFIDENCE_LETTERS[self.finding_confidence[finding]])
+            for source in self.finding_sources[self.finding_offsets[finding]:self.finding_offsets[finding + 1]]:
+                supported_sources.add(source)
+
+        uncovered = []
+        if self.item_citations:
+            start = self.item_offsets[0]
+            for offset, citation in enumerate(self.item_citations[0]):
+                source = self.item_sources[start + offset]
+                if source == MISSING or source not in supported_sources:
+                    uncovered.append(citation)
+
+        return {
+            "supporting_finding_ids": list(self.answer_finding_ids),
+            "missing_finding_ids": missing_ids,
+            # Citations of summary item 1 that no supporting finding cites
+            "uncovered_citations": uncovered,
+            "aggregate_confidence": _compute_aggregate_confidence(confidences),
+        }
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _metadata(gemini_output: Dict[str, Any]) -> Dict[str, str]:
+    """_get_metadata, tolerating a meta / run_metadata that is not an object (as from_output does)."""
+    meta = gemini_output.get('meta', {})
+    run_metadata = meta.get('run_metadata', {}) if isinstance(meta, dict) else {}
+    return _get_metadata({'meta': {'run_metadata': run_metadata if isinstance(run_metadata, dict) else {}}})
+
+
+def validate_full_traceability(gemini_output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Verifies every citation and support relation in a Gemini output.
+
+    Returns:
+        TraceabilityGraph.report() plus:
+        - status: VERIFIED | ISSUES | ERROR
+        - notes: Explanation of the status
+        - validation_metadata
+    """
+    timer = instrumentation.start('graph')
+    try:
+        graph = TraceabilityGraph.from_output(gemini_output)
+    except ValueError as e:
+        return {
+            "status": "ERROR",
+            "notes": f"Validation error: {e}",
+            "validation_metadata": {**_metadata(gemini_output), "error": str(e)},
+        }
+    timer.count('findings_processed', len(graph.finding_ids))
+    timer.lap('build')
+
+    report = graph.report()
+    problems = []
+    if report["unsupported_items"]:
+        problems.append(f"unsupported summary items {report['unsupported_items']}")
+    if report["answer"]["missing_finding_ids"]:
+        problems.append(f"missing supporting findings {report['answer']['missing_finding_ids']}")
+    if report["dangling_references"]:
+        problems.append(f"{len(report['dangling_references'])} finding source reference(s) not in sources")
+    if report["disagreement_issues"]:
+        problems.append(f"{len(report['disagreement_issues'])} disagreement(s) with source issues")
+
+    if problems:
+        status, notes = "ISSUES", "Found " + "; ".join(problems)
+    else:
+        cited = sum(1 for item in report["summary_items"] if item["status"] != "UNCITED")
+        status, notes = "VERIFIED", f"All {cited} cited summary item(s) trace to findings and sources"
+    if report["orphan_sources"]:
+        notes += f" ({len(report['orphan_sources'])} source(s) never referenced)"
+
+    result = {
+        **report,
+        "status": status,
+        "notes": notes,
+        "validation_metadata": _metadata(gemini_output),
+    }
+    timer.lap('report')
+    return timer.attach(result)
+
+
+def validate_full_traceability_batch(outputs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """validate_full_traceability for many outputs."""
+    return [validate_full_traceability(gemini_output) for gemini_output in outputs]
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    from synthetic_outputs import generate_corpus, generate_output
+
+    example = generate_output('tier2_standard_report', seed=11)
+    example['executive_summary'][2] = "3. A takeaway citing a source that does not exist [99]."
+    example['meta']['disagreements'].append({
+        "claim": "Code Memory replaces Desktop Memory",
+        "sources_for": ["1"], "sources_against": ["1"], "final_stance": "for",
+    })
+
+    report = validate_full_traceability(example)
+    print("Traceability Graph:")
+    print(f"Status: {report['status']} - {report['notes']}")
+    for item in report['summary_items']:
+        print(f"  {item['item']}. {item['status']:11s} citations={item['citations']} "
+              f"findings={item['supporting_findings']} confidence={item['aggregate_confidence']}")
+    print(f"Answer: {report['answer']}")
+    print(f"Disagreement issues: {report['disagreement_issues']}")
+    print(f"Orphan sources: {report['orphan_sources']}")
+
+    large = generate_corpus('tier1_deep_dive', count=500, seed=2)
+    start = time.perf_counter()
+    statuses: Dict[str, int] = {}
+    for result in validate_full_traceability_batch(large):
+        statuses[result['status']] = statuses.get(result['status'], 0) + 1
+    print(f"{len(large)} tier1 outputs in {(time.perf_counter() - start) * 1e3:.0f} ms: {statuses}")
@@ -21,16 +21,26 @@ Usage:
         print(f"Warning: {traceability_results['notes']}")
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
+import instrumentation
+from claim_matching import _DEFAULT_MATCHER
+from summary_citations import summary_text
 
-def validate_traceability(gemini_output: Dict[str, Any]) -> Dict[str, Any]:
+
+VALIDATOR_VERSION = "1.0.0"
+
+
+def validate_traceability(gemini_output: Dict[str, Any], policy: Optional[Any] = None) -> Dict[str, Any]:
     """
     Validates that executive_summary[0] is supported by H/M confidence findings.
     
     Args:
         gemini_output: JSON output from Gemini Research Prompt v4.8.1
+                      (dict, or records.ResearchOutput)
+        policy: quality_policy.CompiledPolicy - confidence aggregation and
+               the levels that meet the policy (default: strongest, H or M)
     
     Returns:
         Dictionary containing:
@@ -38,7 +48,63 @@ def validate_traceability(gemini_output: Dict[str, Any]) -> Dict[str, Any]:
         - status: VERIFIED | SPECULATIVE | ERROR
         - notes: Explanation of validation result
     """
+    return _validate_traceability(gemini_output, policy=policy)
+
+
+def _validate_traceability(
+    gemini_output: Dict[str, Any],
+    findings_by_id: Optional[Dict[Any, Dict]] = None,
+    policy: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Implementation of validate_traceability.
+    
+    Callers that already indexed key_findings by id (e.g. IncrementalValidator)
+    pass findings_by_id so the findings are not walked a second time.
+    """
+    timer = instrumentation.start('traceability')
+    
+    support = _resolve_support(gemini_output, findings_by_id, policy)
+    if support['error'] is not None:
+        return _create_error_result(support['error'])
+    
+    # Executive summary item 1 should be the answer
+    answer_claim = support['answer_claim']
+    expected_text = _expected_text(gemini_output['executive_summary'][0])
+    supporting_findings = support['supporting_findings']
+    
+    # Validate supporting findings exist
+    if supporting_findings is None:
+        return _build_result(gemini_output, support, expected_text, None, None)
+    
+    timer.count('findings_processed', len(supporting_findings))
+    timer.lap('extract')
+    
+    claim_match = _calculate_similarity(answer_claim, expected_text)
+    timer.lap('similarity')
+    
+    result = _build_result(
+        gemini_output, support, expected_text, claim_match,
+        _support_breakdown(supporting_findings)
+    )
+    timer.lap('result')
+    return timer.attach(result)
+
+
+def _resolve_support(
+    gemini_output: Dict[str, Any],
+    findings_by_id: Optional[Dict[Any, Dict]] = None,
+    policy: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Resolves traceability_data against the findings and sources.
     
+    Shared by _validate_traceability and lazy_results.validate_traceability_lazy.
+    Returns a dict with 'error' (message, or None) and, when there is no
+    error: answer_claim, finding_ids, supporting_findings (None when no
+    supporting ids were given), source_ids, aggregate_confidence,
+    meets_policy, policy_levels, missing_sources and status.
+    """
     # Extract data
     try:
         executive_summary = gemini_output['executive_summary']
@@ -46,47 +112,35 @@ def validate_traceability(gemini_output: Dict[str, Any]) -> Dict[str, Any]:
         sources = gemini_output['sources']
         traceability_data = gemini_output['meta']['traceability_data']
     except KeyError as e:
-        return _create_error_result(f"Missing required field: {e}")
+        return {"error": f"Missing required field: {e}"}
     
     answer_claim = traceability_data.get('answer_claim', '')
     supporting_finding_ids = traceability_data.get('supporting_finding_ids', [])
     
     # Validate answer claim matches executive_summary[0]
     if not answer_claim:
-        return _create_error_result("No answer_claim in traceability_data")
+        return {"error": "No answer_claim in traceability_data"}
     
     if not executive_summary or len(executive_summary) == 0:
-        return _create_error_result("No executive_summary in output")
-    
-    # Executive summary item 1 should be the answer
-    expected_answer = executive_summary[0]
+        return {"error": "No executive_summary in output"}
     
-    # Extract just the text (without source citations)
-    # Format: "1. Direct answer to question [source_id(s)]"
-    expected_text = expected_answer.split('[')[0].strip()
-    if expected_text.startswith('1.'):
-        expected_text = expected_text[2:].strip()
-    
-    # Validate supporting findings exist
     if not supporting_finding_ids:
         return {
-            "traceability": {
-                "answer_claim": answer_claim,
-                "expected_answer": expected_text,
-                "support": {
-                    "finding_ids": [],
-                    "source_ids": [],
-                    "aggregate_confidence": "None",
-                    "meets_policy": False
-                }
-            },
-            "status": "SPECULATIVE",
-            "notes": "No supporting findings identified for answer claim",
-            "validation_metadata": _get_metadata(gemini_output)
+            "error": None,
+            "answer_claim": answer_claim,
+            "finding_ids": [],
+            "supporting_findings": None,
+            "source_ids": [],
+            "aggregate_confidence": "None",
+            "meets_policy": False,
+            "policy_levels": _policy_levels(policy),
+            "missing_sources": [],
+            "status": "SPECULATIVE"
         }
     
     # Get actual findings
-    findings_by_id = {f['id']: f for f in findings}
+    if findings_by_id is None:
+        findings_by_id = {f['id']: f for f in findings}
     supporting_findings = []
     missing_ids = []
     
@@ -97,9 +151,7 @@ def validate_traceability(gemini_output: Dict[str, Any]) -> Dict[str, Any]:
             missing_ids.append(finding_id)
     
     if missing_ids:
-        return _create_error_result(
-            f"Referenced finding IDs not found in findings: {missing_ids}"
-        )
+        return {"error": f"Referenced finding IDs not found in findings: {missing_ids}"}
     
     # Extract confidences and source IDs
     confidences = [f['confidence'] for f in supporting_findings]
@@ -110,27 +162,61 @@ def validate_traceability(gemini_output: Dict[str, Any]) -> Dict[str, Any]:
     # Deduplicate source IDs
     unique_source_ids = list(set(all_source_ids))
     
-    # Compute aggregate confidence
-    aggregate_confidence = _compute_aggregate_confidence(confidences)
-    
-    # Check policy (requires H or M)
-    meets_policy = aggregate_confidence in ['H', 'M']
-    
-    # Determine status
-    if meets_policy:
-        status = "VERIFIED"
-        notes = f"Answer supported by {len(supporting_findings)} finding(s) with {aggregate_confidence} confidence"
+    # Compute aggregate confidence and check policy (requires H or M by default)
+    if policy is None:
+        aggregate_confidence = _compute_aggregate_confidence(confidences)
+        meets_policy = aggregate_confidence in ['H', 'M']
     else:
-        status = "SPECULATIVE"
-        notes = f"Answer only supported by {aggregate_confidence} confidence finding(s) - needs H or M confidence"
+        aggregate_confidence = policy.aggregate_confidence(confidences)
+        meets_policy = policy.meets_policy(aggregate_confidence)
     
     # Validate source IDs exist
     missing_sources = [sid for sid in unique_source_ids if sid not in sources]
+    
+    # Determine status
     if missing_sources:
         status = "ERROR"
-        notes = f"Referenced source IDs not found: {missing_sources}"
+    elif meets_policy:
+        status = "VERIFIED"
+    else:
+        status = "SPECULATIVE"
     
-    # Build detailed support breakdown
+    return {
+        "error": None,
+        "answer_claim": answer_claim,
+        "finding_ids": supporting_finding_ids,
+        "supporting_findings": supporting_findings,
+        "source_ids": unique_source_ids,
+        "aggregate_confidence": aggregate_confidence,
+        "meets_policy": meets_policy,
+        "policy_levels": _policy_levels(policy),
+        "missing_sources": missing_sources,
+        "status": status
+    }
+
+
+def _policy_levels(policy: Optional[Any]) -> Tuple[str, ...]:
+    """Confidence levels that meet the policy, strongest first."""
+    if policy is None:
+        return ('H', 'M')
+    return tuple(level for level in policy.confidence_labels if level in policy.policy_levels)
+
+
+def _support_notes(support: Dict[str, Any]) -> str:
+    """Explanation of the status of a _resolve_support result."""
+    supporting_findings = support['supporting_findings']
+    if supporting_findings is None:
+        return "No supporting findings identified for answer claim"
+    if support['missing_sources']:
+        return f"Referenced source IDs not found: {support['missing_sources']}"
+    if support['meets_policy']:
+        return f"Answer supported by {len(supporting_findings)} finding(s) with {support['aggregate_confidence']} confidence"
+    return (f"Answer only supported by {support['aggregate_confidence']} confidence finding(s) - "
+            f"needs {' or '.join(support['policy_levels'])} confidence")
+
+
+def _support_breakdown(supporting_findings: List[Dict]) -> List[Dict[str, Any]]:
+    """Per supporting finding: id, truncated text, confidence and sources."""
     support_breakdown = []
     for finding in supporting_findings:
         support_breakdown.append({
@@ -140,26 +226,53 @@ def validate_traceability(gemini_output: Dict[str, Any]) -> Dict[str, Any]:
             "source_ids": finding['source_ids'],
             "source_count": len(finding['source_ids'])
         })
+    return support_breakdown
+
+
+def _build_result(
+    gemini_output: Dict[str, Any],
+    support: Dict[str, Any],
+    expected_text: str,
+    claim_match: Optional[str],
+    support_breakdown: Optional[List[Dict[str, Any]]],
+    notes: Optional[str] = None,
+    validation_metadata: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Assembles the traceability result dict from a _resolve_support result.
     
+    claim_match and support_breakdown are None (and omitted) when no
+    supporting findings were given. Callers that already formatted the notes
+    or metadata (e.g. lazy results) pass them in.
+    """
+    traceability = {"answer_claim": support['answer_claim'], "expected_answer": expected_text}
+    if claim_match is not None:
+        traceability["claim_match"] = claim_match
+    traceability["support"] = {
+        "finding_ids": support['finding_ids'],
+        "source_ids": support['source_ids'],
+        "aggregate_confidence": support['aggregate_confidence'],
+        "meets_policy": support['meets_policy']
+    }
+    if support_breakdown is not None:
+        traceability["support_breakdown"] = support_breakdown
     return {
-        "traceability": {
-            "answer_claim": answer_claim,
-            "expected_answer": expected_text,
-            "claim_match": _calculate_similarity(answer_claim, expected_text),
-            "support": {
-                "finding_ids": supporting_finding_ids,
-                "source_ids": unique_source_ids,
-                "aggregate_confidence": aggregate_confidence,
-                "meets_policy": meets_policy
-            },
-            "support_breakdown": support_breakdown
-        },
-        "status": status,
-        "notes": notes,
-        "validation_metadata": _get_metadata(gemini_output)
+        "traceability": traceability,
+        "status": support['status'],
+        "notes": notes if notes is not None else _support_notes(support),
+        "validation_metadata": validation_metadata or _get_metadata(gemini_output)
     }
 
 
+def _expected_text(expected_answer: str) -> str:
+    """
+    Extracts just the text of executive_summary[0] (without source citations).
+    
+    Format: "1. Direct answer to question [source_id(s)]"
+    """
+    return summary_text(expected_answer)
+
+
 def _compute_aggregate_confidence(confidences: List[str]) -> str:
     """
     Computes aggregate confidence from list of individual confidences.
@@ -185,40 +298,13 @@ def _calculate_similarity(claim: str, expected: str) -> str:
     """
     Simple heuristic to check if claim and expected answer are similar.
     
-    Returns: "match" | "partial" | "mismatch"
-    """
-    claim_lower = claim.lower().strip()
-    expected_lower = expected.lower().strip()
+    Delegates to the shared claim_matching.ClaimMatcher, which caches the
+    tokens of texts it has already seen.
     
-    # Exact match
-    if claim_lower == expected_lower:
-        return "exact_match"
-    
-    # Check if one contains the other
-    if claim_lower in expected_lower or expected_lower in claim_lower:
-        return "partial_match"
-    
-    # Check word overlap
-    claim_words = set(claim_lower.split())
-    expected_words = set(expected_lower.split())
-    
-    # Remove common stop words
-    stop_words = {'a', 'an', 'the', 'is', 'are', 'was', 'were', 'to', 'from', 'in', 'on', 'at', 'for'}
-    claim_words -= stop_words
-    expected_words -= stop_words
-    
-    if not claim_words or not expected_words:
-        return "insufficient_data"
-    
-    overlap = claim_words & expected_words
-    overlap_ratio = len(overlap) / max(len(claim_words), len(expected_words))
-    
-    if overlap_ratio >= 0.7:
-        return "high_overlap"
-    elif overlap_ratio >= 0.4:
-        return "moderate_overlap"
-    else:
-        return "low_overlap"
+    Returns: "exact_match" | "partial_match" | "high_overlap" |
+             "moderate_overlap" | "low_overlap" | "insufficient_data"
+    """
+    return _DEFAULT_MATCHER.label(claim, expected)
 
 
 def _get_metadata(gemini_output: Dict[str, Any]) -> Dict[str, str]:
@@ -226,7 +312,7 @@ def _get_metadata(gemini_output: Dict[str, Any]) -> Dict[str, str]:
     run_metadata = gemini_output.get('meta', {}).get('run_metadata', {})
     
     return {
-        "validator_version": "1.0.0",
+        "validator_version": VALIDATOR_VERSION,
         "prompt_version": run_metadata.get('prompt_version', 'unknown'),
         "validated_at": datetime.now().isoformat()
     }
@@ -250,7 +336,7 @@ def _create_error_result(error_message: str) -> Dict[str, Any]:
         "status": "ERROR",
         "notes": f"Validation error: {error_message}",
         "validation_metadata": {
-            "validator_version": "1.0.0",
+            "validator_version": VALIDATOR_VERSION,
             "validated_at": datetime.now().isoformat(),
             "error": error_message
         }